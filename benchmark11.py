@@ -0,0 +1,184 @@
+import argparse
+import random
+import time
+import tracemalloc
+from collections import deque
+
+from network11 import Person, Message, ShortestPathIndex
+
+
+# --- Record layout benchmark (dict records vs slotted network11 records) ---
+def _make_dict_person(i):
+    return {
+        "name": f"p{i}", "age": 20, "acquaintances": {}, "tags": set(), "money": 0, "socialValue": 0,
+        "messages_received_obj": deque(), "articles_received_ids": deque()
+    }
+
+
+def _make_record_person(i):
+    return Person(f"p{i}", 20)
+
+
+def _make_dict_message(i):
+    return {
+        "id": i, "type": 0, "socialValue": 5, "person1_id": 0, "person2_id": 1, "tag_id": None,
+        "msg_kind": "red_envelope", "emojiId": None, "lucky_money": 10, "articleId": None,
+    }
+
+
+def _make_record_message(i):
+    return Message(i, 0, 5, 0, 1, None, "red_envelope", lucky_money=10)
+
+
+def _measure_memory(factory, count):
+    tracemalloc.start()
+    objs = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return current
+
+
+def _sm_dict(persons, msg, rounds):
+    # Mirrors the per-receiver body of _update_state_sm using dict keys.
+    for _ in range(rounds):
+        for p in persons:
+            p["socialValue"] += msg["socialValue"]
+            if msg["msg_kind"] == "red_envelope":
+                p["money"] += msg["lucky_money"]
+
+
+def _sm_record(persons, msg, rounds):
+    for _ in range(rounds):
+        for p in persons:
+            p.socialValue += msg.socialValue
+            if msg.msg_kind == "red_envelope":
+                p.money += msg.lucky_money
+
+
+def bench_records(count, rounds):
+    print(f"Records: {count} persons/messages, {rounds} update rounds")
+    for label, p_factory, m_factory in (("dict", _make_dict_person, _make_dict_message),
+                                        ("slots", _make_record_person, _make_record_message)):
+        p_mem = _measure_memory(p_factory, count)
+        m_mem = _measure_memory(m_factory, count)
+        print(f"  {label:<6} memory: Person {p_mem / count:7.1f} B/obj | Message {m_mem / count:7.1f} B/obj")
+
+    persons_d = [_make_dict_person(i) for i in range(count)]
+    persons_r = [_make_record_person(i) for i in range(count)]
+    for label, fn, persons, msg in (("dict", _sm_dict, persons_d, _make_dict_message(0)),
+                                    ("slots", _sm_record, persons_r, _make_record_message(0))):
+        start = time.perf_counter()
+        fn(persons, msg, rounds)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<6} sm-style updates: {elapsed:.3f}s ({count * rounds / elapsed / 1e6:.2f} M updates/s)")
+
+
+# --- Shortest path benchmark (plain BFS per query vs ShortestPathIndex) ---
+def _plain_distance(persons, src, dst):
+    # The per-query BFS the oracle used before the index.
+    if src == dst:
+        return 0
+    seen = {src}
+    frontier = [src]
+    depth = 0
+    while frontier:
+        depth += 1
+        nxt = []
+        for u in frontier:
+            for v in persons[u].acquaintances:
+                if v == dst:
+                    return depth
+                if v not in seen:
+                    seen.add(v)
+                    nxt.append(v)
+        frontier = nxt
+    return -1
+
+
+def _build_graph(shape, count, density):
+    persons = {i: Person(f"p{i}", 20) for i in range(count)}
+    if shape in ("chain", "relink"):
+        edges = [(i, i + 1) for i in range(count - 1)]
+    else:
+        edges = [(i, j) for i in range(count) for j in range(i + 1, count) if random.random() < density]
+    for u, v in edges:
+        persons[u].acquaintances[v] = 1
+        persons[v].acquaintances[u] = 1
+    return persons
+
+
+def _qsp_workload(persons, queries, edit_ratio, hot_sources, shape):
+    # Queries mostly come from a small pool of sources, like generator11's qsp/qci mix; edits toggle one edge,
+    # or for "relink" cut one path link and restore it right away (mr to <= 0, then ar), like the qsp_chain profile.
+    ids = list(persons)
+    sources = random.sample(ids, min(hot_sources, len(ids)))
+    ops = []
+    for _ in range(queries):
+        if random.random() < edit_ratio:
+            if shape == "relink":
+                i = random.randrange(1, len(ids))
+                ops.append(("edit", ids[i - 1], ids[i]))
+                ops.append(("edit", ids[i - 1], ids[i]))
+            else:
+                ops.append(("edit", *random.sample(ids, 2)))
+        else:
+            ops.append(("query", random.choice(sources), random.choice(ids)))
+    return ops
+
+
+def _run_qsp_workload(persons, ops, index):
+    results = []
+    for op, u, v in ops:
+        if op == "query":
+            results.append(index.distance(u, v) if index else _plain_distance(persons, u, v))
+        elif v in persons[u].acquaintances:
+            del persons[u].acquaintances[v]
+            del persons[v].acquaintances[u]
+            if index: index.edge_removed(u, v)
+        else:
+            persons[u].acquaintances[v] = 1
+            persons[v].acquaintances[u] = 1
+            if index: index.edge_added(u, v)
+    return results
+
+
+def bench_qsp(count, queries, edit_ratio, density, hot_sources):
+    print(f"Shortest path: {count} persons, {queries} ops ({edit_ratio:.0%} edge toggles), {hot_sources} hot sources")
+    for shape in ("chain", "relink", "dense"):
+        graph_seed = random.random()
+        ops = None
+        results = {}
+        for label in ("bfs", "index"):
+            random.seed(graph_seed)
+            persons = _build_graph(shape, count, density)
+            if ops is None:
+                ops = _qsp_workload(persons, queries, edit_ratio, hot_sources, shape)
+            index = ShortestPathIndex(persons) if label == "index" else None
+            start = time.perf_counter()
+            results[label] = _run_qsp_workload(persons, ops, index)
+            elapsed = time.perf_counter() - start
+            print(f"  {shape:<6} {label:<6} {elapsed:.3f}s ({queries / elapsed:,.0f} ops/s)")
+        if results["bfs"] != results["index"]:
+            print(f"  {shape:<6} MISMATCH between plain BFS and index results!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro benchmarks for the HW11 generator/oracle data structures.")
+    subparsers = parser.add_subparsers(dest="bench", required=True)
+    p_records = subparsers.add_parser("records", help="dict records vs slotted records")
+    p_records.add_argument("-n", "--count", type=int, default=20000)
+    p_records.add_argument("-r", "--rounds", type=int, default=50)
+    p_qsp = subparsers.add_parser("qsp", help="per-query BFS vs cached shortest path index")
+    p_qsp.add_argument("-n", "--count", type=int, default=2000)
+    p_qsp.add_argument("-q", "--queries", type=int, default=5000)
+    p_qsp.add_argument("-e", "--edit-ratio", type=float, default=0.05)
+    p_qsp.add_argument("-d", "--density", type=float, default=0.05, help="edge probability of the dense graph")
+    p_qsp.add_argument("-s", "--hot-sources", type=int, default=32)
+    args = parser.parse_args()
+
+    random.seed(0)
+    if args.bench == "records":
+        bench_records(args.count, args.rounds)
+    elif args.bench == "qsp":
+        bench_qsp(args.count, args.queries, args.edit_ratio, args.density, args.hot_sources)
@@ -4,9 +4,26 @@ import time
 import shutil
 import argparse
 import concurrent.futures
+import errno
 import threading
 import re
-from collections import defaultdict
+import random
+import gzip
+import hashlib
+import json
+import sqlite3
+import sys
+import tempfile
+import math
+import statistics
+from collections import Counter, defaultdict
+try:
+    import fcntl # Reflinks in save_error_case; not available on Windows
+except ImportError:
+    fcntl = None
+
+import oracle11
+import generator11
 
 # --- Configuration --- (Keep existing configuration)
 CODE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,8 +37,41 @@ DATA_GENERATOR_SCRIPT = os.path.join(CODE_DIR, "generator11.py") # <<< 确保这
 STRONG_DATA_FOLDER = os.path.join(BASE_DIR, "strong")
 STANDARD_JAR_PATH = os.path.join(BASE_DIR, "standard.jar") # <<< 标准答案 Jar 路径
 JAR_TIMEOUT = 10 # seconds
+MAX_MISMATCHES_REPORTED = 20 # K: mismatching lines detailed per failing set in diff.json (all are still counted)
+CLUSTER_REPRESENTATIVES = 3 # Failing sets saved in full per (JAR, failure signature); the rest are only referenced (0 = all)
+PROMOTE_FAILURES = True # Copy the first failing input of every cluster into the strong/ regression corpus
+CORPUS_MANIFEST_NAME = "manifest.json" # In STRONG_DATA_FOLDER: hash, origin JAR, failure signature and size per input
+ANSWER_SOURCE = "jar" # "jar" = standard.jar, "oracle" = oracle11.py (pure Python, no JVM start-up),
+                      # "generator" = generator11 writes answer_setN.txt while generating (Phase 1.5 skipped)
+ANSWER_SOURCES = ("jar", "oracle", "generator")
+CROSS_CHECK_FRACTION = 0.1 # With "generator" answers: share of sets re-checked against standard.jar (0 = off)
+FUZZ_SUBFOLDER = "fuzz" # Fuzz sets live in data/, answers/, output/ and errors/ under this subfolder
+FUZZ_DATA_FOLDER = os.path.join(DATA_FOLDER, FUZZ_SUBFOLDER)
+FUZZ_TIME_BUDGET_MINUTES = 60 # Fuzz mode stops after this long...
+FUZZ_MAX_FAILURES = 20 # ...or once this many (JAR, set) runs failed
+FUZZ_REPORT_INTERVAL = 5 # seconds between live throughput lines
+STRESS_PROFILE = None # generator11 --stress profile for every generated set (None = the phased random mix)
+LN_TOPOLOGY = "random" # generator11 --ln-topology for every generated set (graph shape of the initial ln block)
+LN_DENSITY = generator11.LN_ER_DENSITY # Edge probability when LN_TOPOLOGY is "er"
+SCALING_DATA_FOLDER = os.path.join(DATA_FOLDER, "scaling")
+SCALING_SIZES = (500, 1000, 2000, 5000, 10000) # Instructions per set in scaling mode
+SCALING_MAX_LN = 300 # ln N grows with the set size up to this (the generator caps it at the mode's limit)
+SCALING_REPEATS = 2 # Sets per size; the median CPU time is fitted
+SCALING_SLOPE_MARGIN = 0.3 # Flag a JAR whose log-log slope exceeds standard.jar's by more than this
+SCALING_MIN_CPU = 0.05 # Sizes whose median CPU above start-up is below this are shown but not fitted (noise)
+SCALING_TIMEOUT_FACTOR = 3 # Scaling runs may take this many JAR_TIMEOUTs before counting as timed out
 PUBLIC_MAX_INSTRUCTIONS = 10000
 MUTUAL_MAX_INSTRUCTIONS = 3000
+COMPRESS_FILES = False # gzip data/, answers/, output/ and error copies (*.txt.gz); readers accept both forms
+RESULTS_DB_PATH = os.path.join(BASE_DIR, "results.sqlite3") # Verdict history across runs, see results11.py (None = off)
+RESULTS_BATCH_SIZE = 200 # Executions buffered per INSERT transaction
+SCRATCH_DIR = None # e.g. "/dev/shm": data/answers/output/errors and the results db live there during a run
+# Parent used by a bare --scratch: the tmpfs at /dev/shm on Linux; elsewhere (Windows, macOS) the system temp
+# directory, which is usually disk-backed, so pass a RAM disk path explicitly there
+SCRATCH_DEFAULT_PARENT = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SCRATCH_MAX_MB = 4096 # Scratch size cap; past it settled outputs are dropped and no further sets are generated
+SCRATCH_SYNC_INTERVAL = 60 # seconds between syncs of errors and the results db back to BASE_DIR
+KEEP_PASSING_OUTPUTS = True # False: passing stdout is validated in memory and never written to output/
 # NEW: Configuration for data generation retries
 MAX_GEN_RETRIES_PER_INDEX = 1000 # Number of times to retry generating data for a specific index
 RETRY_DELAY_SECONDS = 0     # Optional delay between retry batches
@@ -46,16 +96,46 @@ def get_jar_files():
     return jars
 
 def extract_index_from_filename(filename):
-    match_gen = re.search(r"test_data_(\d+)\.txt$", os.path.basename(filename))
+    match_gen = re.search(r"test_data_(\d+)\.txt(?:\.gz)?$", os.path.basename(filename))
     if match_gen:
         return int(match_gen.group(1))
     return None
 
 
+# --- Compressed Storage ---
+def stored_path(path):
+    # Where a writer puts `path` (a plain .txt name) under the current COMPRESS_FILES setting.
+    return path + ".gz" if COMPRESS_FILES else path
+
+def existing_path(path):
+    # The copy of `path` a reader should open: this run's form first, then the other one.
+    preferred = stored_path(path)
+    if os.path.exists(preferred):
+        return preferred
+    other = path if preferred != path else path + ".gz"
+    return other if os.path.exists(other) else preferred
+
+def open_jar_stdin(input_path):
+    # Binary file for stdin=: the input itself, or the read end of a pipe that a thread fills by
+    # decompressing a .gz input while the JAR reads it (nothing is inflated to disk or into memory).
+    if not input_path.endswith(".gz"):
+        return open(input_path, 'rb')
+    source = gzip.open(input_path, 'rb') # Raises FileNotFoundError here, not in the thread
+    read_fd, write_fd = os.pipe()
+    def pump():
+        try:
+            with source, open(write_fd, 'wb') as sink:
+                shutil.copyfileobj(source, sink, 1 << 16)
+        except OSError:
+            pass # The JAR exited or was killed before reading everything
+    threading.Thread(target=pump, daemon=True).start()
+    return open(read_fd, 'rb')
+
+
 # --- Run Standard Jar and Save Answer Function --- (Keep existing function)
-def run_standard_jar_and_save_answer(input_path, correct_test_set_index):
+def run_standard_jar_and_save_answer(input_path, correct_test_set_index, answer_filepath=None):
     answer_filename = f"answer_set{correct_test_set_index}.txt"
-    answer_filepath = os.path.join(ANSWERS_FOLDER, answer_filename)
+    answer_filepath = answer_filepath or stored_path(os.path.join(ANSWERS_FOLDER, answer_filename))
     standard_jar_exists = os.path.exists(STANDARD_JAR_PATH)
     elapsed_time = None
 
@@ -66,18 +146,16 @@ def run_standard_jar_and_save_answer(input_path, correct_test_set_index):
     start_time = time.time()
     process = None
     try:
-        with open(input_path, 'r', encoding='utf-8', errors='replace') as infile:
-            input_data = infile.read()
-
-        process = subprocess.run(
-            ['java', '-jar', STANDARD_JAR_PATH],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=JAR_TIMEOUT * 2
-        )
+        with open_jar_stdin(input_path) as jar_input:
+            process = subprocess.run(
+                ['java', '-jar', STANDARD_JAR_PATH],
+                stdin=jar_input,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                timeout=JAR_TIMEOUT * 2
+            )
         elapsed_time = time.time() - start_time
 
         if process.returncode != 0 or (process.stderr and not process.stderr.isspace()):
@@ -88,8 +166,8 @@ def run_standard_jar_and_save_answer(input_path, correct_test_set_index):
             # open(answer_filepath, 'w').close()
             return correct_test_set_index, False, None
 
-        os.makedirs(ANSWERS_FOLDER, exist_ok=True)
-        with open(answer_filepath, 'w', encoding='utf-8', errors='replace') as f_ans:
+        os.makedirs(os.path.dirname(answer_filepath), exist_ok=True)
+        with oracle11.open_text(answer_filepath, 'w') as f_ans:
             f_ans.write(process.stdout)
         return correct_test_set_index, True, elapsed_time
 
@@ -107,20 +185,353 @@ def run_standard_jar_and_save_answer(input_path, correct_test_set_index):
         # open(answer_filepath, 'w').close() # Indicate failure
         return correct_test_set_index, False, None
 
+# --- Run Python Oracle and Save Answer Function ---
+def run_oracle_and_save_answer(input_path, correct_test_set_index):
+    """Same contract as run_standard_jar_and_save_answer, but answers come from oracle11."""
+    answer_filename = f"answer_set{correct_test_set_index}.txt"
+    answer_filepath = stored_path(os.path.join(ANSWERS_FOLDER, answer_filename))
+    start_time = time.time()
+    try:
+        os.makedirs(ANSWERS_FOLDER, exist_ok=True)
+        oracle11.run_file(input_path, answer_filepath)
+        return correct_test_set_index, True, time.time() - start_time
+    except FileNotFoundError:
+        print(f"Error: Cannot find input file {input_path} when running oracle.")
+        return correct_test_set_index, False, None
+    except Exception as e:
+        print(f"Error running oracle for {os.path.basename(input_path)}: {e}")
+        return correct_test_set_index, False, None
+
+ANSWER_FUNCTIONS = {"jar": run_standard_jar_and_save_answer, "oracle": run_oracle_and_save_answer}
+ANSWER_SOURCE_LABELS = {"jar": "standard.jar", "oracle": "oracle11.py", "generator": "generator11.py (co-generated)"}
+
+
+# --- Cross-check Co-generated Answer Against standard.jar ---
+def cross_check_answer_with_standard_jar(input_path, correct_test_set_index):
+    """Runs standard.jar on a set whose answer was co-generated and compares the two answers.
+    On disagreement standard.jar wins: its output replaces answer_setN.txt and the oracle's is kept aside."""
+    answer_base = os.path.join(ANSWERS_FOLDER, f"answer_set{correct_test_set_index}.txt")
+    answer_filepath = existing_path(answer_base)
+    jar_answer_path = stored_path(os.path.join(ANSWERS_FOLDER, f"answer_set{correct_test_set_index}.standard.txt"))
+    _, ok, elapsed_time = run_standard_jar_and_save_answer(input_path, correct_test_set_index, jar_answer_path)
+    if not ok:
+        return correct_test_set_index, None, "standard.jar failed, co-generated answer kept"
+    try:
+        if file_output_digest(answer_filepath) == file_output_digest(jar_answer_path): # gzip headers differ, content may not
+            os.remove(jar_answer_path)
+            return correct_test_set_index, True, f"match ({elapsed_time:.3f}s)"
+        with oracle11.open_text(answer_filepath) as f_gen, oracle11.open_text(jar_answer_path) as f_jar:
+            gen_lines, jar_lines = f_gen.read().splitlines(), f_jar.read().splitlines()
+        first_diff = next((i for i, (a, b) in enumerate(zip(gen_lines, jar_lines)) if a != b),
+                          min(len(gen_lines), len(jar_lines)))
+        detail = (f"first difference at output line {first_diff + 1}: "
+                  f"co-generated {gen_lines[first_diff] if first_diff < len(gen_lines) else '<EOF>'!r}, "
+                  f"standard.jar {jar_lines[first_diff] if first_diff < len(jar_lines) else '<EOF>'!r}")
+        cogen_suffix = ".gz" if answer_filepath.endswith(".gz") else ""
+        os.replace(answer_filepath, os.path.join(ANSWERS_FOLDER, f"answer_set{correct_test_set_index}.cogen.txt{cogen_suffix}"))
+        os.replace(jar_answer_path, stored_path(answer_base))
+        return correct_test_set_index, False, detail
+    except Exception as e:
+        return correct_test_set_index, None, f"cross-check error: {e}"
+
+# --- Output Digests (fast path for validate_output) ---
+_answer_digests = {} # answer path -> ((inode, mtime_ns, size), digest); answers can be rewritten between runs
+_answer_digests_lock = threading.Lock()
+
+def output_digest(text):
+    # Digest of the text as validate_output sees it: one entry per line with '\n'/'\r' endings dropped.
+    # Text-mode reads already turned every line ending into '\n', so only a missing final newline needs fixing.
+    digest = hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16)
+    if text and not text.endswith('\n'):
+        digest.update(b'\n')
+    return digest.digest()
+
+def file_output_digest(path):
+    with oracle11.open_text(path) as f:
+        return output_digest(f.read())
+
+def answer_digest(answer_filepath):
+    stat = os.stat(answer_filepath)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _answer_digests_lock:
+        cached = _answer_digests.get(answer_filepath)
+    if cached and cached[0] == key:
+        return cached[1]
+    digest = file_output_digest(answer_filepath)
+    with _answer_digests_lock:
+        _answer_digests[answer_filepath] = (key, digest)
+    return digest
+
+# --- Sidecar Index (exact input command for an output line) ---
+def index_path_for(input_path):
+    # The .idx sidecar is never compressed: describe_output_line seeks into it.
+    return os.path.splitext(input_path.removesuffix(".gz"))[0] + ".idx"
+
+def describe_output_line(input_path, output_line_number, context=2):
+    # Reads the failing record (plus `context` previous ones) straight from the fixed-width .idx written by
+    # generator11 -x. Returns None when the set has no index or the line is past its end (e.g. extra output).
+    index_path = index_path_for(input_path)
+    if not os.path.exists(index_path):
+        return None
+    width = generator11.INDEX_RECORD_WIDTH
+    first = max(1, output_line_number - context)
+    count = output_line_number - first + 1
+    with open(index_path, 'rb') as f_idx:
+        f_idx.seek((first - 1) * width)
+        raw = f_idx.read(count * width)
+    records = [raw[i:i + width].decode('ascii').split() for i in range(0, len(raw), width)]
+    if len(records) < count or any(len(record) != 3 for record in records):
+        return None
+    wanted = {int(record[0]) for record in records}
+    last_wanted = max(wanted)
+    commands = {}
+    with oracle11.open_text(input_path) as f_in:
+        for number, line in enumerate(f_in, 1):
+            if number in wanted:
+                commands[number] = line.strip()
+            if number >= last_wanted:
+                break
+    described = [f"{line_no}: {commands.get(int(line_no), alias)} ({outcome})" for line_no, alias, outcome in records]
+    text = f"Input line {described[-1]}"
+    if len(described) > 1:
+        text += f"; before: {' | '.join(described[:-1])}"
+    return text
+
+# --- Structured Mismatch Reports (diff.json) ---
+EXCEPTION_NAMES = {abbr: name for name, abbr in oracle11.EXCEPTION_ABBREVIATIONS.items()}
+
+def output_line_commands(input_path):
+    # [(input line, alias)] for each output line: from the .idx sidecar when present, otherwise by walking the input.
+    index_path = index_path_for(input_path)
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='ascii') as f_idx:
+            return [(int(parts[0]), parts[1]) for parts in (line.split() for line in f_idx) if len(parts) == 3]
+    commands = []
+    skip_lines = 0
+    with oracle11.open_text(input_path) as f_in:
+        for number, line in enumerate(f_in, 1):
+            if skip_lines:
+                skip_lines -= 1
+                continue
+            parts = line.split()
+            if not parts:
+                continue
+            alias = oracle11.FULL_NAME_TO_ALIAS.get(parts[0], parts[0])
+            commands.append((number, alias))
+            if alias == "ln" and len(parts) > 1 and parts[1].isdigit():
+                skip_lines = max(int(parts[1]), 1) + 2 # ids, names, ages and the N-1 value rows
+    return commands
+
+def output_kind(line):
+    abbr = oracle11.exception_abbreviation(line)
+    return EXCEPTION_NAMES.get(abbr, abbr) if abbr else "normal"
+
+def build_mismatch_diff(input_path, expected_output_lines, actual_output_lines, mismatched_indices):
+    try:
+        commands = output_line_commands(input_path)
+    except Exception:
+        commands = []
+    by_alias = Counter()
+    by_exception = Counter()
+    details = []
+    for i in mismatched_indices:
+        input_line, alias = commands[i] if i < len(commands) else (None, "?")
+        by_alias[alias] += 1
+        by_exception[f"{output_kind(expected_output_lines[i])} -> {output_kind(actual_output_lines[i])}"] += 1
+        if len(details) < MAX_MISMATCHES_REPORTED:
+            details.append({"output_line": i + 1, "input_line": input_line, "alias": alias,
+                            "expected": expected_output_lines[i], "actual": actual_output_lines[i]})
+    return {
+        "expected_lines": len(expected_output_lines), "actual_lines": len(actual_output_lines),
+        "mismatch_count": len(mismatched_indices), "mismatches": details,
+        "by_alias": dict(by_alias.most_common()), "by_exception": dict(by_exception.most_common()),
+    }
+
+# --- Failure Clustering ---
+STACK_EXCEPTION_RE = re.compile(r"([\w$.]+(?:Exception|Error))\b")
+STACK_FRAME_RE = re.compile(r"^\s*at\s+(\S+)", re.MULTILINE)
+_failure_clusters = {} # (jar, signature) -> {"representatives": [set index], "duplicates": [reference]}
+_failure_clusters_lock = threading.Lock()
+
+def output_token(line):
+    # Coarse shape of an output line: exception name, "<int>" for numbers, else the first token.
+    abbr = oracle11.exception_abbreviation(line)
+    if abbr:
+        return EXCEPTION_NAMES.get(abbr, abbr)
+    token = line.split()[0] if line.split() else "<empty>"
+    return "<int>" if re.fullmatch(r"-?\d+", token) else token
+
+def failure_cluster_signature(reason, stderr_content, diff):
+    if diff is not None:
+        if diff["mismatches"]:
+            first = diff["mismatches"][0]
+            return f"VF {first['alias']}: {output_token(first['expected'])} -> {output_token(first['actual'])}"
+        if diff["by_alias"]:
+            return f"VF {next(iter(diff['by_alias']))}"
+        return "VF missing output lines" if diff["actual_lines"] < diff["expected_lines"] else "VF extra output lines"
+    if reason.startswith("RE"):
+        exception = STACK_EXCEPTION_RE.search(stderr_content or "")
+        if exception:
+            frame = STACK_FRAME_RE.search(stderr_content)
+            return f"RE {exception.group(1)}" + (f" at {frame.group(1)}" if frame else "")
+        return reason
+    if reason.startswith("Timeout"):
+        return "Timeout"
+    return reason.split(":", 1)[0]
+
+def register_failure(jar_name, correct_test_set_index, signature, reason, input_path):
+    # 1-based rank among the cluster's representatives (save in full), or 0 when it is only referenced.
+    with _failure_clusters_lock:
+        cluster = _failure_clusters.setdefault((jar_name, signature), {"representatives": [], "duplicates": []})
+        if CLUSTER_REPRESENTATIVES <= 0 or len(cluster["representatives"]) < CLUSTER_REPRESENTATIVES:
+            cluster["representatives"].append(correct_test_set_index)
+            return len(cluster["representatives"])
+        cluster["duplicates"].append({"set": correct_test_set_index, "input": input_path, "reason": reason})
+        return 0
+
+def report_failure_clusters(jar_files, base_error_dir, top=10):
+    # Prints the clusters of every JAR and writes them to errors/<jar>/clusters.json.
+    with _failure_clusters_lock:
+        clusters = {key: dict(value) for key, value in _failure_clusters.items()}
+    for jar_name in jar_files:
+        jar_clusters = sorted(((signature, cluster) for (jar, signature), cluster in clusters.items() if jar == jar_name),
+                              key=lambda item: -(len(item[1]["representatives"]) + len(item[1]["duplicates"])))
+        if not jar_clusters:
+            continue
+        print(f"  {jar_name}: {len(jar_clusters)} failure cluster(s)")
+        for signature, cluster in jar_clusters[:top]:
+            count = len(cluster["representatives"]) + len(cluster["duplicates"])
+            saved = ", ".join(f"set_{index}" for index in cluster["representatives"])
+            print(f"    {count:>5} x {signature} (saved: {saved})")
+        if len(jar_clusters) > top:
+            print(f"    ... {len(jar_clusters) - top} more in clusters.json")
+        jar_error_dir = os.path.join(base_error_dir, os.path.splitext(jar_name)[0])
+        os.makedirs(jar_error_dir, exist_ok=True)
+        with open(os.path.join(jar_error_dir, "clusters.json"), 'w', encoding='utf-8') as f:
+            json.dump([dict(signature=signature, count=len(cluster["representatives"]) + len(cluster["duplicates"]), **cluster)
+                       for signature, cluster in jar_clusters], f, ensure_ascii=False, indent=2)
+
+# --- Regression Corpus (strong/ + manifest.json) ---
+_corpus_lock = threading.Lock()
+corpus_bytes_written = 0 # Bytes this process wrote into strong/ (persistent-storage accounting)
+
+def corpus_manifest_path():
+    return os.path.join(STRONG_DATA_FOLDER, CORPUS_MANIFEST_NAME)
+
+def read_corpus_manifest():
+    # Entries in load order; an entry's position + 1 is its test set index in local mode.
+    try:
+        with open(corpus_manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)["entries"]
+    except FileNotFoundError:
+        return []
+
+def write_corpus_manifest(entries):
+    global corpus_bytes_written
+    temp_path = corpus_manifest_path() + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False, indent=2)
+    corpus_bytes_written += os.path.getsize(temp_path)
+    os.replace(temp_path, corpus_manifest_path())
+
+def add_corpus_entry(entries, known_hashes, text, jar_name, signature, origin, filename=None):
+    # Appends a manifest entry (copying the text into strong/ unless it already is a file there); None for duplicates.
+    global corpus_bytes_written
+    content_hash = output_digest(text).hex()
+    if content_hash in known_hashes:
+        return None
+    if filename is None:
+        filename = f"{content_hash}.txt"
+        with open(os.path.join(STRONG_DATA_FOLDER, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+        corpus_bytes_written += len(text.encode('utf-8'))
+    entry = {"hash": content_hash, "file": filename, "jar": jar_name, "signature": signature, "origin": origin,
+             "lines": text.count("\n") + (0 if text.endswith("\n") or not text else 1), "bytes": len(text.encode('utf-8')),
+             "added": time.strftime("%Y-%m-%d %H:%M:%S")}
+    entries.append(entry)
+    known_hashes.add(content_hash)
+    return entry
+
+def promote_to_corpus(input_path, jar_name, signature, origin):
+    # Adds a failing input to strong/ under its content hash. Returns the manifest entry, or None for a duplicate.
+    with oracle11.open_text(input_path) as f:
+        text = f.read()
+    with _corpus_lock:
+        os.makedirs(STRONG_DATA_FOLDER, exist_ok=True)
+        entries = read_corpus_manifest()
+        entry = add_corpus_entry(entries, {e["hash"] for e in entries}, text, jar_name, signature, origin)
+        if entry is not None:
+            write_corpus_manifest(entries)
+    return entry
+
+def load_regression_corpus():
+    # {test set index: path} in manifest order. Files dropped into strong/ by hand are adopted into the
+    # manifest once (old test_data_N.txt names keep their order), so indices stay stable across runs.
+    with _corpus_lock:
+        entries = read_corpus_manifest()
+        known_hashes = {entry["hash"] for entry in entries}
+        known_files = {entry["file"] for entry in entries}
+        new_files = [f for f in os.listdir(STRONG_DATA_FOLDER)
+                     if f not in known_files and f != CORPUS_MANIFEST_NAME and not f.endswith((".idx", ".tmp"))
+                     and os.path.isfile(os.path.join(STRONG_DATA_FOLDER, f))]
+        new_files.sort(key=lambda f: (extract_index_from_filename(f) is None, extract_index_from_filename(f) or 0, f))
+        for filename in new_files:
+            with open(os.path.join(STRONG_DATA_FOLDER, filename), 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            if add_corpus_entry(entries, known_hashes, text, None, None, "manual", filename) is None:
+                print(f"Warning: {filename} duplicates an input already in the corpus. Skipping it.")
+        if new_files:
+            write_corpus_manifest(entries)
+    corpus = {}
+    for entry in entries:
+        path = os.path.join(STRONG_DATA_FOLDER, entry["file"])
+        if os.path.exists(path):
+            corpus[len(corpus) + 1] = path
+        else:
+            print(f"Warning: {entry['file']} is listed in {CORPUS_MANIFEST_NAME} but missing. Skipping it.")
+    return corpus
+
+def format_failing_commands(failed_commands_per_set, top=5):
+    # "qtvs 12 line(s) in 3 set(s), ..." from the by_alias counts of every failing set of one JAR.
+    lines_by_alias = Counter()
+    sets_by_alias = Counter()
+    for by_alias in failed_commands_per_set:
+        lines_by_alias.update(by_alias)
+        sets_by_alias.update(by_alias.keys())
+    return ", ".join(f"{alias} {count} line(s) in {sets_by_alias[alias]} set(s)"
+                     for alias, count in lines_by_alias.most_common(top))
+
 # --- Validator Function --- (Keep existing function)
-def validate_output(input_path, output_path, correct_test_set_index):
+def validate_output(input_path, output_path, correct_test_set_index, actual_digest=None, actual_text=None,
+                    answers_folder=None):
     """
     Compares the pre-generated standard answer file with the actual output.
     Calculates approximate input line number for errors, accounting for 'ln'.
+    actual_digest (output_digest of the JAR's stdout) skips re-reading the output when it matches.
+    actual_text (the JAR's stdout) replaces reading output_path altogether.
+    answers_folder overrides ANSWERS_FOLDER (fuzz sets).
+    Returns (is_valid, message, diff); diff is the diff.json content for mismatching outputs, else None.
     """
     answer_filename = f"answer_set{correct_test_set_index}.txt"
-    answer_filepath = os.path.join(ANSWERS_FOLDER, answer_filename)
+    answer_filepath = existing_path(os.path.join(answers_folder or ANSWERS_FOLDER, answer_filename))
     input_line_offset = 0 # Default offset if no 'ln'
 
+    # --- Fast path: equal digests mean equal line lists, no need to build them ---
+    try:
+        if actual_digest is None and actual_text is not None:
+            actual_digest = output_digest(actual_text)
+        elif actual_digest is None and os.path.exists(output_path):
+            actual_digest = file_output_digest(output_path)
+        if actual_digest is not None and os.path.exists(answer_filepath) and \
+                answer_digest(answer_filepath) == actual_digest:
+            return True, "Ok", None
+    except Exception:
+        pass # Fall through to the full comparison, which reports errors properly
+
     try:
         # --- Calculate Input Line Offset ---
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='replace') as f_in:
+            with oracle11.open_text(input_path) as f_in:
                 first_line = f_in.readline().strip()
                 if first_line.startswith("ln "):
                     try:
@@ -149,52 +560,122 @@ def validate_output(input_path, output_path, correct_test_set_index):
         # --- Read Expected Answer ---
         if not os.path.exists(answer_filepath):
             # If standard jar failed, we might not have an answer file. Report this differently?
-            return False, f"VF Standard Error: Expected answer file missing ({answer_filename}). Standard JAR likely failed."
-        with open(answer_filepath, 'r', encoding='utf-8', errors='replace') as f_ans:
+            return False, f"VF Standard Error: Expected answer file missing ({answer_filename}). Standard JAR likely failed.", None
+        with oracle11.open_text(answer_filepath) as f_ans:
             # Read all lines, including potentially empty ones if needed for exact comparison
             expected_output_lines = [line.rstrip('\n\r') for line in f_ans] # Keep structure
             # Filter empty lines *after* reading if desired, e.g.:
             # expected_output_lines = [line for line in expected_output_lines if line.strip()]
 
         # --- Read Actual Output ---
-        if not os.path.exists(output_path):
-            return False, "VF Error: Output file missing (likely RE/Timeout)"
-        with open(output_path, 'r', encoding='utf-8', errors='replace') as f_out:
-            actual_output_lines = [line.rstrip('\n\r') for line in f_out]
+        if actual_text is not None:
+            # Same lines a text-mode read of the written file gives (stdout already has universal newlines)
+            actual_output_lines = [line.rstrip('\r') for line in actual_text.split('\n')]
+            if actual_text == "" or actual_text.endswith('\n'):
+                actual_output_lines.pop()
+        elif not os.path.exists(output_path):
+            return False, "VF Error: Output file missing (likely RE/Timeout)", None
+        else:
+            with oracle11.open_text(output_path) as f_out:
+                actual_output_lines = [line.rstrip('\n\r') for line in f_out]
             # actual_output_lines = [line for line in actual_output_lines if line.strip()] # Filter if matching above
 
         # --- Compare ---
         len_expected = len(expected_output_lines)
         len_actual = len(actual_output_lines)
+        mismatched_indices = [i for i, (expected_line, actual_line) in
+                              enumerate(zip(expected_output_lines, actual_output_lines)) if expected_line != actual_line]
+        if len_expected == len_actual and not mismatched_indices:
+            return True, "Ok", None
+        diff = build_mismatch_diff(input_path, expected_output_lines, actual_output_lines, mismatched_indices)
+        more = "" # Summary of the other mismatching lines, details are in diff.json
+        if len(mismatched_indices) > 1:
+            more = f" [{len(mismatched_indices)} mismatched lines: " + \
+                   ", ".join(f"{alias} x{count}" for alias, count in diff["by_alias"].items()) + "]"
 
         if len_expected != len_actual:
             # Provide approx input line for length mismatch based on where it likely diverged
             approx_error_line_index = min(len_expected, len_actual) # 0-based index of first differing/missing line
             approx_input_line = input_line_offset + (approx_error_line_index + 1) # Convert to 1-based and add offset
-            return False, f"VF Error: Mismatched output lines (Expected {len_expected}, Got {len_actual}). Input approx line {approx_input_line}"
-
-        for i in range(len_expected):
-            if expected_output_lines[i] != actual_output_lines[i]:
-                output_error_line = i + 1 # 1-based line number
-                approx_input_line = input_line_offset + output_error_line # Calculate approx input line using CORRECTED offset
-                input_cmd_approx = f"Input approx line {approx_input_line}"
-                # Use repr() to show hidden characters like trailing spaces
-                return False, f"VF Error line {output_error_line}: Expected {repr(expected_output_lines[i])}, Got {repr(actual_output_lines[i])} ({input_cmd_approx})"
+            input_cmd = describe_output_line(input_path, approx_error_line_index + 1) or f"Input approx line {approx_input_line}"
+            return False, f"VF Error: Mismatched output lines (Expected {len_expected}, Got {len_actual}). {input_cmd}{more}", diff
 
-        return True, "Ok"
+        i = mismatched_indices[0]
+        output_error_line = i + 1 # 1-based line number
+        approx_input_line = input_line_offset + output_error_line # Calculate approx input line using CORRECTED offset
+        input_cmd_approx = describe_output_line(input_path, output_error_line) or f"Input approx line {approx_input_line}"
+        # Use repr() to show hidden characters like trailing spaces
+        return False, f"VF Error line {output_error_line}: Expected {repr(expected_output_lines[i])}, Got {repr(actual_output_lines[i])} ({input_cmd_approx}){more}", diff
 
     except FileNotFoundError:
-        return False, f"VF Critical Error: File missing during comparison ({answer_filepath} or {output_path})"
+        return False, f"VF Critical Error: File missing during comparison ({answer_filepath} or {output_path})", None
     except Exception as e:
-        return False, f"VF Critical Error during comparison: {e}"
+        return False, f"VF Critical Error during comparison: {e}", None
 
 # --- Test Execution Function --- (Keep existing function)
-def run_single_test(jar_name, input_path, base_output_dir, base_error_dir, correct_test_set_index):
+MEASURE_POLL_MAX = 0.02 # run_measured polls wait4 from 1 ms up to this interval (seconds)
+
+def _read_stream(stream, chunks):
+    chunks.append(stream.read())
+
+def run_measured(args, stdin, timeout):
+    # subprocess.run(args, stdin=stdin, capture_output=True, text=True, timeout=timeout) that also returns
+    # (CPU seconds, peak RSS in KiB) of the child, or (None, None) where the platform does not report them.
+    # The child is reaped by our own os.wait4 loop, which is what reports its rusage; threads drain the pipes.
+    if not hasattr(os, "wait4"):
+        completed = subprocess.run(args, stdin=stdin, capture_output=True, text=True, encoding='utf-8', errors='replace',
+                                   timeout=timeout)
+        return completed, (None, None)
+    with subprocess.Popen(args, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, encoding='utf-8', errors='replace') as process:
+        stdout_chunks, stderr_chunks = [], []
+        readers = [threading.Thread(target=_read_stream, args=(process.stdout, stdout_chunks), daemon=True),
+                   threading.Thread(target=_read_stream, args=(process.stderr, stderr_chunks), daemon=True)]
+        for reader in readers:
+            reader.start()
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        usage = None
+        try:
+            while True:
+                pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+                if pid:
+                    process.returncode = os.waitstatus_to_exitcode(status) # Popen must not wait for it again
+                    break
+                if time.monotonic() >= deadline:
+                    usage = None
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, MEASURE_POLL_MAX)
+        finally:
+            process.kill() # No-op once reaped; otherwise timed out or interrupted
+            process.wait()
+            for reader in readers:
+                reader.join()
+    if usage is None:
+        raise subprocess.TimeoutExpired(args, timeout, output="".join(stdout_chunks), stderr="".join(stderr_chunks))
+    completed = subprocess.CompletedProcess(args, process.returncode, "".join(stdout_chunks), "".join(stderr_chunks))
+    max_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss # bytes on macOS
+    return completed, (usage.ru_utime + usage.ru_stime, max_rss_kb)
+
+def write_jar_output(jar_name, correct_test_set_index, output_path, text):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Write output even if there are errors, might contain partial info
+    try:
+        with oracle11.open_text(output_path, 'w') as outfile:
+            outfile.write(text)
+    except Exception as write_e:
+        print(f"Warning: Failed to write output for {jar_name}, set {correct_test_set_index}: {write_e}")
+        # Ensure output_path doesn't falsely exist if write failed
+        if os.path.exists(output_path): os.remove(output_path)
+
+def run_single_test(jar_name, input_path, base_output_dir, base_error_dir, correct_test_set_index, answers_folder=None):
+    # answers_folder: where answer_setN.txt lives (None = ANSWERS_FOLDER); fuzz sets keep their own
     jar_path = os.path.join(JARS_DIR, jar_name)
     jar_name_no_ext = os.path.splitext(jar_name)[0]
     jar_output_folder = os.path.join(base_output_dir, jar_name_no_ext)
     output_filename = f"output_set{correct_test_set_index}.txt"
-    output_path = os.path.join(jar_output_folder, output_filename)
+    output_path = stored_path(os.path.join(jar_output_folder, output_filename))
     start_time = time.time()
     process = None
     stdout_content = ""
@@ -202,58 +683,58 @@ def run_single_test(jar_name, input_path, base_output_dir, base_error_dir, corre
     result_type = "Tester Error"
     message = "Initialization Error"
     elapsed_time = 0
+    failed_commands = {} # alias -> mismatched output lines (from the validator's diff)
+    diff = None
+    usage = (None, None) # (CPU seconds, peak RSS KiB) of the JAR process
     try:
         try:
-            with open(input_path, 'r', encoding='utf-8', errors='replace') as infile:
-                input_data = infile.read()
+            jar_input = open_jar_stdin(input_path) # Streamed into the JAR, decompressed on the fly if .gz
         except Exception as e:
             # Raise a more specific error or return a tester error immediately
             result_type = "Tester Error"
             message = f"Input Read Error: {e}"
             elapsed_time = time.time() - start_time
             # Try to save what we can
-            save_error_case(jar_name, input_path, None, str(e), message, base_error_dir, correct_test_set_index)
-            return jar_name, correct_test_set_index, result_type, elapsed_time, message
+            save_error_case(jar_name, input_path, None, str(e), message, base_error_dir, correct_test_set_index,
+                            answers_folder=answers_folder)
+            return (jar_name, correct_test_set_index, result_type, elapsed_time, message, failed_commands,
+                    failure_cluster_signature(message, str(e), None), usage)
 
-        process = subprocess.run(
-            ['java', '-jar', jar_path], input=input_data, capture_output=True,
-            text=True, encoding='utf-8', errors='replace', timeout=JAR_TIMEOUT
-        )
+        with jar_input:
+            process, usage = run_measured(['java', '-jar', jar_path], jar_input, JAR_TIMEOUT)
         end_time = time.time()
         elapsed_time = end_time - start_time
         stdout_content = process.stdout
         stderr_content = process.stderr
 
-        # Create output folder before writing
-        os.makedirs(jar_output_folder, exist_ok=True)
-        # Write output even if there are errors, might contain partial info
-        try:
-            with open(output_path, 'w', encoding='utf-8', errors='replace') as outfile:
-                outfile.write(stdout_content)
-        except Exception as write_e:
-            print(f"Warning: Failed to write output for {jar_name}, set {correct_test_set_index}: {write_e}")
-            # Ensure output_path doesn't falsely exist if write failed
-            if os.path.exists(output_path): os.remove(output_path)
-
-
         # --- Determine Result Type ---
         if process.returncode != 0:
             result_type = "Runtime Error"
             message = f"RE: Exit Code {process.returncode}"
-            save_error_case(jar_name, input_path, output_path, stderr_content, message, base_error_dir, correct_test_set_index)
         # Check stderr more carefully, ignore common Java VM messages
         elif stderr_content and not stderr_content.isspace() and not re.match(r"Picked up _JAVA_OPTIONS:", stderr_content.strip(), re.IGNORECASE):
             result_type = "Runtime Error"
             message = f"RE: Non-empty stderr (check stderr.txt)"
-            save_error_case(jar_name, input_path, output_path, stderr_content, message, base_error_dir, correct_test_set_index)
         else:
-            # Only validate if JAR ran without explicit RE
-            is_valid, validation_message = validate_output(input_path, output_path, correct_test_set_index)
+            # Only validate if JAR ran without explicit RE; stdout is compared in memory, not read back from disk
+            is_valid, validation_message, diff = validate_output(input_path, output_path, correct_test_set_index,
+                                                                 output_digest(stdout_content), actual_text=stdout_content,
+                                                                 answers_folder=answers_folder)
             result_type = "Pass" if is_valid else "Validation Failed"
             message = validation_message # Use detailed message from validator
             if not is_valid:
-                # Pass stderr even if it was empty/ignored previously, might have context
-                save_error_case(jar_name, input_path, output_path, stderr_content, message, base_error_dir, correct_test_set_index)
+                failed_commands = diff["by_alias"] if diff else {}
+
+        # Failing output is always written (save_error_case copies it); passing output only with KEEP_PASSING_OUTPUTS
+        if result_type != "Pass" or KEEP_PASSING_OUTPUTS:
+            write_jar_output(jar_name, correct_test_set_index, output_path, stdout_content)
+        else:
+            try: os.remove(output_path) # Stale file from an earlier run of this set
+            except OSError: pass
+        if result_type != "Pass":
+            # Pass stderr even if it was empty/ignored previously, might have context
+            save_error_case(jar_name, input_path, output_path, stderr_content, message, base_error_dir, correct_test_set_index,
+                            diff=diff, answers_folder=answers_folder)
 
     except subprocess.TimeoutExpired:
         end_time = time.time()
@@ -266,11 +747,12 @@ def run_single_test(jar_name, input_path, base_output_dir, base_error_dir, corre
         captured_stderr = process.stderr if process else ""
         # Try writing partial output
         try:
-            with open(output_path, 'w', encoding='utf-8', errors='replace') as outfile:
+            with oracle11.open_text(output_path, 'w') as outfile:
                 outfile.write(captured_stdout)
         except Exception as write_e:
              print(f"Warning: Failed to write partial output on Timeout for {jar_name}, set {correct_test_set_index}: {write_e}")
-        save_error_case(jar_name, input_path, output_path, captured_stderr, message, base_error_dir, correct_test_set_index)
+        save_error_case(jar_name, input_path, output_path, captured_stderr, message, base_error_dir, correct_test_set_index,
+                        answers_folder=answers_folder)
 
     except Exception as e:
         # Catch other potential errors during subprocess handling
@@ -282,16 +764,30 @@ def run_single_test(jar_name, input_path, base_output_dir, base_error_dir, corre
         os.makedirs(jar_output_folder, exist_ok=True)
         # Create an empty output file marker if it doesn't exist
         if not os.path.exists(output_path):
-            try: open(output_path, 'w').close()
+            try: oracle11.open_text(output_path, 'w').close()
             except Exception: pass
-        save_error_case(jar_name, input_path, output_path, str(e), message, base_error_dir, correct_test_set_index)
+        save_error_case(jar_name, input_path, output_path, str(e), message, base_error_dir, correct_test_set_index,
+                        answers_folder=answers_folder)
+        stderr_content = str(e)
 
-    return jar_name, correct_test_set_index, result_type, elapsed_time, message
+    signature = failure_cluster_signature(message, stderr_content, diff) if result_type != "Pass" else None
+    return jar_name, correct_test_set_index, result_type, elapsed_time, message, failed_commands, signature, usage
 
 # --- Data Generation Task --- (Keep existing function)
-def generate_data_task(test_index, test_mode, num_instr_per_test, data_folder):
-    data_filename = os.path.join(data_folder, f"test_data_{test_index}.txt")
-    generator_cmd = ["python", DATA_GENERATOR_SCRIPT, "-m", test_mode, "-n", str(num_instr_per_test), "-o", data_filename]
+def generate_data_task(test_index, test_mode, num_instr_per_test, data_folder, answer_folder=None, ln_size=None):
+    data_filename = stored_path(os.path.join(data_folder, f"test_data_{test_index}.txt"))
+    generator_cmd = ["python", DATA_GENERATOR_SCRIPT, "-m", test_mode, "-n", str(num_instr_per_test), "-o", data_filename,
+                     "-x", index_path_for(data_filename)]
+    if ln_size is not None:
+        generator_cmd += ["--ln-size", str(ln_size)]
+    if STRESS_PROFILE:
+        generator_cmd += ["--stress", STRESS_PROFILE]
+    if LN_TOPOLOGY != "random":
+        generator_cmd += ["--ln-topology", LN_TOPOLOGY, "--ln-density", str(LN_DENSITY)]
+    answer_filename = None
+    if answer_folder: # Co-generate the expected output in the same pass
+        answer_filename = stored_path(os.path.join(answer_folder, f"answer_set{test_index}.txt"))
+        generator_cmd += ["-a", answer_filename]
     try:
         # Use a timeout for the generator as well? Optional.
         gen_proc = subprocess.run(
@@ -299,7 +795,8 @@ def generate_data_task(test_index, test_mode, num_instr_per_test, data_folder):
             encoding='utf-8', errors='replace', timeout=JAR_TIMEOUT * 3 # Generous timeout for generator
         )
         # NEW: Check if the output file actually exists after successful run
-        if os.path.exists(data_filename) and os.path.getsize(data_filename) > 0:
+        if os.path.exists(data_filename) and os.path.getsize(data_filename) > 0 and \
+                (answer_filename is None or os.path.exists(answer_filename)):
              return test_index, data_filename, "Success", ""
         else:
              error_message = f"Gen Failed set {test_index}: Generator finished but output file is missing or empty."
@@ -334,24 +831,92 @@ def generate_data_task(test_index, test_mode, num_instr_per_test, data_folder):
 
 
 # --- Error Saving Function --- (Keep existing function)
-def save_error_case(jar_name, input_path, output_path, stderr_content, reason, base_error_dir, correct_test_set_index):
-    # (Function unchanged, logic is robust)
+FICLONE = 0x40049409 # Linux ioctl: copy-on-write clone of a whole file (btrfs, XFS, bcachefs)
+_no_reflink_devices = set() # (source st_dev, destination st_dev) pairs where FICLONE is unsupported
+REFLINK_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL} # Anything else (EXDEV, ENOSPC) is per call
+ARTIFACT_REFERENCES = "artifacts.json" # In an error case: files that could be neither reflinked nor hardlinked
+
+def capture_artifact(source, destination):
+    # Puts `source` at `destination` without writing its bytes: reflink, else hardlink. Writers replace
+    # their files (oracle11.open_text) instead of truncating them, so a hardlink keeps this run's content.
+    # Returns "reflink", "hardlink" or None (e.g. another filesystem).
+    try: os.remove(destination)
+    except FileNotFoundError: pass
+    devices = (os.stat(source).st_dev, os.stat(os.path.dirname(destination) or ".").st_dev)
+    if fcntl is not None and devices not in _no_reflink_devices:
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return "reflink"
+        except OSError as e:
+            if e.errno in REFLINK_UNSUPPORTED_ERRNOS:
+                _no_reflink_devices.add(devices)
+            try: os.remove(destination)
+            except FileNotFoundError: pass
+    try:
+        os.link(source, destination)
+        return "hardlink"
+    except OSError:
+        return None
+
+def case_artifact_path(case_dir, name):
+    # `name` (or name.gz) inside an error case, or the file artifacts.json refers to instead.
+    path = existing_path(os.path.join(case_dir, name))
+    if os.path.exists(path):
+        return path
+    try:
+        with open(os.path.join(case_dir, ARTIFACT_REFERENCES), 'r', encoding='utf-8') as f:
+            references = json.load(f)
+    except FileNotFoundError:
+        return path
+    for candidate in (name, name + ".gz"):
+        if candidate in references:
+            return references[candidate]["path"]
+    return path
+
+def save_error_case(jar_name, input_path, output_path, stderr_content, reason, base_error_dir, correct_test_set_index,
+                    diff=None, answers_folder=None):
     jar_name_no_ext = os.path.splitext(jar_name)[0]
     jar_error_dir = os.path.join(base_error_dir, jar_name_no_ext)
     test_case_name = f"set_{correct_test_set_index}"
     error_case_dir = os.path.join(jar_error_dir, test_case_name)
+    signature = failure_cluster_signature(reason, stderr_content, diff)
+    rank = register_failure(jar_name, correct_test_set_index, signature, reason, input_path)
+    if not rank:
+        # Enough copies of this failure already; only clusters.json refers to it. Drop a stale set_N from an earlier run,
+        # also the BASE_DIR copy under a scratch workspace, sync() only ever adds files there.
+        shutil.rmtree(error_case_dir, ignore_errors=True)
+        if persistent_path(error_case_dir) != error_case_dir:
+            shutil.rmtree(persistent_path(error_case_dir), ignore_errors=True)
+        return
+    if rank == 1 and PROMOTE_FAILURES and input_path and os.path.exists(input_path):
+        try:
+            promote_to_corpus(input_path, jar_name, signature, "failure")
+        except Exception as e:
+            print(f"Warning: Failed to add {jar_name} - {test_case_name} to the regression corpus: {e}")
     os.makedirs(error_case_dir, exist_ok=True)
+    references = {} # artifact name -> source file, for captures that could not be linked
+
+    def capture(source, name):
+        if not capture_artifact(source, os.path.join(error_case_dir, name)):
+            stat = os.stat(source)
+            references[name] = {"path": os.path.abspath(source), "bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
     try:
+        try: os.remove(os.path.join(error_case_dir, ARTIFACT_REFERENCES))
+        except FileNotFoundError: pass
         # Input
         if input_path and os.path.exists(input_path):
-            shutil.copy2(input_path, os.path.join(error_case_dir, "input.txt"))
+            capture(input_path, "input.txt.gz" if input_path.endswith(".gz") else "input.txt")
+            if os.path.exists(index_path_for(input_path)):
+                capture(index_path_for(input_path), "input.idx")
         elif input_path:
             with open(os.path.join(error_case_dir, "input_NOT_FOUND.txt"), 'w') as f: f.write(f"Input {input_path} not found.")
         else:
              with open(os.path.join(error_case_dir, "input_PATH_NONE.txt"), 'w') as f: f.write("Input path was None.")
         # Output (handle potentially missing output_path on RE/Timeout before write)
         if output_path and os.path.exists(output_path):
-             shutil.copy2(output_path, os.path.join(error_case_dir, "output.txt"))
+             capture(output_path, "output.txt.gz" if output_path.endswith(".gz") else "output.txt")
         elif output_path: # Path provided but file doesn't exist (likely write failure or early exit)
              with open(os.path.join(error_case_dir, "output_MISSING_OR_WRITE_FAILED.txt"), 'w') as f: f.write("Output file missing or write failed.")
         else: # output_path itself was None (e.g., input read error)
@@ -360,21 +925,556 @@ def save_error_case(jar_name, input_path, output_path, stderr_content, reason, b
         with open(os.path.join(error_case_dir, "stderr.txt"), 'w', encoding='utf-8', errors='replace') as f: f.write(stderr_content or "")
         # Reason
         with open(os.path.join(error_case_dir, "reason.txt"), 'w', encoding='utf-8', errors='replace') as f: f.write(reason)
+        with open(os.path.join(error_case_dir, "cluster.txt"), 'w', encoding='utf-8') as f: f.write(signature + "\n")
+        # Structured diff (validation failures only)
+        if diff is not None:
+            with open(os.path.join(error_case_dir, "diff.json"), 'w', encoding='utf-8') as f:
+                json.dump(dict(diff, jar=jar_name, set=correct_test_set_index), f, ensure_ascii=False, indent=2)
         # Expected Answer
         answer_filename = f"answer_set{correct_test_set_index}.txt"
-        answer_filepath = os.path.join(ANSWERS_FOLDER, answer_filename)
+        answer_filepath = existing_path(os.path.join(answers_folder or ANSWERS_FOLDER, answer_filename))
         if os.path.exists(answer_filepath):
-            shutil.copy2(answer_filepath, os.path.join(error_case_dir, "expected_answer.txt"))
+            capture(answer_filepath, "expected_answer.txt.gz" if answer_filepath.endswith(".gz") else "expected_answer.txt")
         else:
             with open(os.path.join(error_case_dir, "expected_answer_NOT_FOUND.txt"), 'w') as f: f.write(f"Expected answer file {answer_filepath} not found or standard jar failed.")
+        if references: # Valid until the next run regenerates these files
+            with open(os.path.join(error_case_dir, ARTIFACT_REFERENCES), 'w', encoding='utf-8') as f:
+                json.dump(references, f, indent=2)
     except Exception as e:
         print(f"Warning: Failed to save error case {jar_name} - {test_case_name}: {e}")
 
 
+# --- Results Database (SQLite) ---
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started REAL, finished REAL, mode TEXT, answer_source TEXT, executions INTEGER);
+CREATE TABLE IF NOT EXISTS jars (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, hash TEXT NOT NULL, first_seen REAL, UNIQUE (name, hash));
+CREATE TABLE IF NOT EXISTS data_sets (
+    id INTEGER PRIMARY KEY, hash TEXT NOT NULL UNIQUE, lines INTEGER, bytes INTEGER, first_path TEXT);
+CREATE TABLE IF NOT EXISTS signatures (id INTEGER PRIMARY KEY, text TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS executions (
+    run_id INTEGER NOT NULL REFERENCES runs, jar_id INTEGER NOT NULL REFERENCES jars,
+    data_set_id INTEGER REFERENCES data_sets, set_index INTEGER, verdict TEXT NOT NULL,
+    wall REAL, cpu REAL, rss_kb INTEGER, message TEXT, signature_id INTEGER REFERENCES signatures);
+CREATE INDEX IF NOT EXISTS executions_by_run ON executions (run_id, jar_id);
+CREATE INDEX IF NOT EXISTS executions_by_jar ON executions (jar_id, wall);
+"""
+
+class ResultsStore:
+    """Verdicts, timings and failure signatures of one checker run, appended to the SQLite history.
+
+    Only the thread that collects finished futures records, so a single connection is used and
+    executions are inserted RESULTS_BATCH_SIZE per transaction. JARs are keyed by name and content
+    hash and data sets by content hash, so results11.py can line up runs over the same inputs.
+    """
+
+    def __init__(self, path, mode, answer_source):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(RESULTS_SCHEMA)
+        self.run_id = self.connection.execute("INSERT INTO runs (started, mode, answer_source) VALUES (?, ?, ?)",
+                                              (time.time(), mode, answer_source)).lastrowid
+        self.connection.commit()
+        self.executions = 0
+        self._pending = []
+        self._jar_ids = {}
+        self._data_set_ids = {} # input path -> id; a path holds one data set per run
+        self._signature_ids = {}
+
+    def _id(self, cache, key, insert_sql, insert_args, select_sql, select_args):
+        if key not in cache:
+            self.connection.execute(insert_sql, insert_args)
+            cache[key] = self.connection.execute(select_sql, select_args).fetchone()[0]
+        return cache[key]
+
+    def _jar_id(self, jar_name):
+        if jar_name not in self._jar_ids:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(os.path.join(JARS_DIR, jar_name), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            jar_hash = digest.hexdigest()
+            self._id(self._jar_ids, jar_name, "INSERT OR IGNORE INTO jars (name, hash, first_seen) VALUES (?, ?, ?)",
+                     (jar_name, jar_hash, time.time()), "SELECT id FROM jars WHERE name = ? AND hash = ?", (jar_name, jar_hash))
+        return self._jar_ids[jar_name]
+
+    def _data_set_id(self, input_path):
+        if input_path not in self._data_set_ids:
+            with oracle11.open_text(input_path) as f:
+                text = f.read()
+            data_hash = output_digest(text).hex()
+            self._id(self._data_set_ids, input_path,
+                     "INSERT OR IGNORE INTO data_sets (hash, lines, bytes, first_path) VALUES (?, ?, ?, ?)",
+                     (data_hash, text.count("\n"), len(text.encode('utf-8')), os.path.abspath(input_path)),
+                     "SELECT id FROM data_sets WHERE hash = ?", (data_hash,))
+        return self._data_set_ids[input_path]
+
+    def _signature_id(self, signature):
+        if signature is None:
+            return None
+        return self._id(self._signature_ids, signature, "INSERT OR IGNORE INTO signatures (text) VALUES (?)", (signature,),
+                        "SELECT id FROM signatures WHERE text = ?", (signature,))
+
+    def record(self, jar_name, set_index, input_path, result_type, elapsed_time, message, signature, usage):
+        try:
+            data_set_id = self._data_set_id(input_path)
+        except OSError:
+            data_set_id = None # Input already gone; the execution is still counted
+        cpu, rss_kb = usage
+        self._pending.append((self.run_id, self._jar_id(jar_name), data_set_id, set_index, result_type, elapsed_time,
+                              cpu, rss_kb, message, self._signature_id(signature)))
+        if len(self._pending) >= RESULTS_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.connection.executemany("INSERT INTO executions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self.executions += len(self._pending)
+            self._pending.clear()
+        self.connection.commit()
+
+    def close(self):
+        self.flush()
+        self.connection.execute("UPDATE runs SET finished = ?, executions = ? WHERE id = ?",
+                                (time.time(), self.executions, self.run_id))
+        self.connection.commit()
+        self.connection.close()
+
+def open_results_store(mode, answer_source):
+    if not RESULTS_DB_PATH:
+        return None
+    try:
+        return ResultsStore(RESULTS_DB_PATH, mode, answer_source)
+    except sqlite3.Error as e:
+        print(f"Warning: Results database {RESULTS_DB_PATH} unavailable, verdicts will not be recorded: {e}")
+        return None
+
+
+# --- RAM-backed Scratch Workspace ---
+_scratch_workspace = None
+
+class ScratchWorkspace:
+    """Points DATA/ANSWERS/OUTPUT/ERROR folders (fuzz and scaling data included) and the results db at a fresh directory under `parent`
+    (a tmpfs such as /dev/shm). sync() copies errors and the db back to their BASE_DIR locations;
+    close() does a last sync, restores the module paths, prints the accounting and deletes the scratch.
+    """
+
+    def __init__(self, parent, max_mb):
+        global DATA_FOLDER, ANSWERS_FOLDER, OUTPUT_FOLDER, ERROR_FOLDER, FUZZ_DATA_FOLDER, SCALING_DATA_FOLDER
+        global RESULTS_DB_PATH
+        os.makedirs(parent, exist_ok=True)
+        self.root = tempfile.mkdtemp(prefix="hw11-", dir=parent)
+        free_mb = shutil.disk_usage(self.root).free / 2**20
+        self.max_bytes = int(min(max_mb, free_mb * 0.9) * 2**20)
+        self.persistent = {"DATA_FOLDER": DATA_FOLDER, "ANSWERS_FOLDER": ANSWERS_FOLDER, "OUTPUT_FOLDER": OUTPUT_FOLDER,
+                           "ERROR_FOLDER": ERROR_FOLDER, "FUZZ_DATA_FOLDER": FUZZ_DATA_FOLDER,
+                           "SCALING_DATA_FOLDER": SCALING_DATA_FOLDER, "RESULTS_DB_PATH": RESULTS_DB_PATH}
+        DATA_FOLDER = os.path.join(self.root, "data")
+        ANSWERS_FOLDER = os.path.join(self.root, "answers")
+        OUTPUT_FOLDER = os.path.join(self.root, "output")
+        ERROR_FOLDER = os.path.join(self.root, "errors")
+        FUZZ_DATA_FOLDER = os.path.join(DATA_FOLDER, FUZZ_SUBFOLDER)
+        SCALING_DATA_FOLDER = os.path.join(DATA_FOLDER, "scaling")
+        if RESULTS_DB_PATH:
+            RESULTS_DB_PATH = os.path.join(self.root, "results.sqlite3")
+            if os.path.exists(self.persistent["RESULTS_DB_PATH"]): # Keep appending to the history
+                shutil.copy2(self.persistent["RESULTS_DB_PATH"], RESULTS_DB_PATH)
+        self.bytes_synced = Counter() # "errors" / "results db" -> bytes copied back to BASE_DIR
+        self.peak_bytes = 0
+        self.over_cap = False
+        self.last_sync = time.time()
+        print(f"Scratch workspace: {self.root} (cap {self.max_bytes / 2**20:.0f} MiB); "
+              f"errors and the results db are synced back every {SCRATCH_SYNC_INTERVAL}s")
+
+    def usage(self):
+        # Workers create and delete files while this walks, so anything may vanish between listing and stat.
+        total = 0
+        stack = [self.root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except FileNotFoundError:
+                            pass
+            except FileNotFoundError:
+                pass
+        self.peak_bytes = max(self.peak_bytes, total)
+        return total
+
+    def enforce_cap(self):
+        # True while under the cap. Past it settled outputs are dropped first, they are the only part nothing
+        # later needs (error cases hold their own links to failing ones); recent files are left alone, a running
+        # test may still be capturing them.
+        if self.usage() <= self.max_bytes:
+            return True
+        settled = time.time() - 2 * JAR_TIMEOUT
+        for folder, _, files in os.walk(OUTPUT_FOLDER):
+            for name in files:
+                path = os.path.join(folder, name)
+                try:
+                    if os.stat(path).st_mtime < settled:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+        usage = self.usage()
+        if not self.over_cap:
+            self.over_cap = True
+            print(f"Scratch: over the {self.max_bytes / 2**20:.0f} MiB cap, settled outputs dropped "
+                  f"(now {usage / 2**20:.0f} MiB)")
+        return usage <= self.max_bytes
+
+    def sync(self, store=None):
+        self.last_sync = time.time()
+        self.enforce_cap()
+        destination_root = self.persistent["ERROR_FOLDER"]
+        for folder, _, files in os.walk(ERROR_FOLDER):
+            destination_folder = os.path.join(destination_root, os.path.relpath(folder, ERROR_FOLDER))
+            os.makedirs(destination_folder, exist_ok=True)
+            for name in files:
+                source, destination = os.path.join(folder, name), os.path.join(destination_folder, name)
+                try:
+                    stat = os.stat(source)
+                except FileNotFoundError: # Removed by a worker since the listing
+                    continue
+                try:
+                    copied = os.stat(destination)
+                    if copied.st_size == stat.st_size and copied.st_mtime_ns == stat.st_mtime_ns:
+                        continue
+                except FileNotFoundError:
+                    pass
+                try: os.remove(destination) # Never write through a hardlink left by an earlier run
+                except FileNotFoundError: pass
+                try:
+                    shutil.copy2(source, destination)
+                except FileNotFoundError:
+                    continue
+                self.bytes_synced["errors"] += stat.st_size
+        if RESULTS_DB_PATH and os.path.exists(RESULTS_DB_PATH):
+            target = sqlite3.connect(self.persistent["RESULTS_DB_PATH"])
+            if store:
+                store.flush() # backup() waits forever on the connection's own open write transaction
+            source = store.connection if store else sqlite3.connect(RESULTS_DB_PATH)
+            source.backup(target)
+            target.close()
+            if not store:
+                source.close()
+            self.bytes_synced["results db"] += os.path.getsize(self.persistent["RESULTS_DB_PATH"])
+
+    def close(self):
+        self.sync()
+        globals().update(self.persistent)
+        shutil.rmtree(self.root, ignore_errors=True)
+        written = sum(self.bytes_synced.values()) + corpus_bytes_written
+        parts = ", ".join(f"{name} {size / 1024:,.0f} KiB" for name, size in
+                          list(self.bytes_synced.items()) + [("corpus", corpus_bytes_written)])
+        print(f"Persistent storage: {written / 1024:,.0f} KiB written to {BASE_DIR} ({parts}); "
+              f"scratch peak {self.peak_bytes / 1024:,.0f} KiB")
+
+    def persistent_path(self, path):
+        # Longest folder first: FUZZ_DATA_FOLDER and SCALING_DATA_FOLDER sit inside DATA_FOLDER
+        for name in sorted(self.persistent, key=lambda name: -len(globals()[name] or "")):
+            folder = globals()[name]
+            if name != "RESULTS_DB_PATH" and (path == folder or path.startswith(folder + os.sep)):
+                return os.path.normpath(os.path.join(self.persistent[name], os.path.relpath(path, folder)))
+        return path
+
+def persistent_path(path):
+    # Where a file or folder of the workspace ends up once the run is over (the scratch copy is deleted on close).
+    return _scratch_workspace.persistent_path(path) if _scratch_workspace else path
+
+def enter_scratch_workspace(parent, max_mb=SCRATCH_MAX_MB):
+    global _scratch_workspace
+    _scratch_workspace = ScratchWorkspace(parent, max_mb)
+    return _scratch_workspace
+
+def sync_scratch_workspace(store=None):
+    # Periodic sync from the result loops; a no-op without a scratch workspace or before the interval is up.
+    if _scratch_workspace and time.time() - _scratch_workspace.last_sync >= SCRATCH_SYNC_INTERVAL:
+        _scratch_workspace.sync(store)
+
+def scratch_has_room():
+    # Checked as each set is generated; always True without a scratch workspace.
+    return _scratch_workspace is None or _scratch_workspace.enforce_cap()
+
+
+# --- Differential Fuzzing (no standard.jar) ---
+def fuzz_folders():
+    # (answers, output, errors) of fuzz sets: a fuzz/ subfolder of each, so set N never clobbers a normal run's set N
+    return tuple(os.path.join(folder, FUZZ_SUBFOLDER) for folder in (ANSWERS_FOLDER, OUTPUT_FOLDER, ERROR_FOLDER))
+
+
+def generate_fuzz_case(test_index, test_mode, num_instr_per_test):
+    # In-process generation; the expected output comes from the generator's own oracle pass.
+    generator = generator11.DataGenerator(mode=test_mode, num_logical_instructions=num_instr_per_test, emit_answers=True,
+                                          stress_profile=STRESS_PROFILE, ln_topology=LN_TOPOLOGY, ln_density=LN_DENSITY)
+    generator.generate()
+    input_lines, answer_lines = generator.written_lines()
+    data_path = stored_path(os.path.join(FUZZ_DATA_FOLDER, f"test_data_{test_index}.txt"))
+    with oracle11.open_text(data_path, 'w') as f_in:
+        f_in.writelines(line + "\n" for line in input_lines)
+    with oracle11.open_text(stored_path(os.path.join(fuzz_folders()[0], f"answer_set{test_index}.txt")), 'w') as f_ans:
+        f_ans.writelines(answer + "\n" for answer in answer_lines)
+    with oracle11.open_text(index_path_for(data_path), 'w', newline='\n') as f_idx:
+        f_idx.writelines(generator.written_index(len(input_lines)))
+    return data_path, len(input_lines)
+
+
+def discard_passed_fuzz_case(jar_files, test_index, data_path):
+    # Fully passing sets are not kept, otherwise an overnight campaign fills the disk.
+    answers_folder, output_folder, _ = fuzz_folders()
+    paths = [data_path, index_path_for(data_path), stored_path(os.path.join(answers_folder, f"answer_set{test_index}.txt"))]
+    paths += [stored_path(os.path.join(output_folder, os.path.splitext(jar_name)[0], f"output_set{test_index}.txt"))
+              for jar_name in jar_files]
+    for path in paths:
+        try: os.remove(path)
+        except OSError: pass
+
+
+def fuzz_main(test_mode='P', num_instr_per_test=PUBLIC_MAX_INSTRUCTIONS, time_budget_minutes=FUZZ_TIME_BUDGET_MINUTES,
+              max_failures=FUZZ_MAX_FAILURES):
+    jar_files = get_jar_files()
+    setup_directories(jar_files)
+    fuzz_answers_folder, fuzz_output_folder, fuzz_error_folder = fuzz_folders()
+    for folder in (FUZZ_DATA_FOLDER, fuzz_answers_folder, fuzz_error_folder):
+        os.makedirs(folder, exist_ok=True)
+    max_workers = os.cpu_count() or 1
+    max_in_flight = max_workers * 2 # Keep the pool busy without generating far ahead of it
+    deadline = time.time() + time_budget_minutes * 60
+    print(f"\nFuzzing {len(jar_files)} JAR(s) (Mode: {test_mode}, Instr: {num_instr_per_test}) for up to "
+          f"{time_budget_minutes} min or {max_failures} failure(s), {max_workers} worker thread(s). Ctrl+C stops early.")
+
+    _failure_clusters.clear()
+    store = open_results_store(f"Fuzz (Mode: {test_mode}, Instr: {num_instr_per_test})", "generator")
+    stats = defaultdict(Counter) # jar -> result type -> count
+    failed_commands_by_jar = defaultdict(list) # jar -> [by_alias of each failing set]
+    pending_runs = {} # set index -> [data path, instructions, JAR runs left, failed]
+    in_flight = set()
+    sets_generated = sets_completed = failures = 0
+    instructions_run = 0 # Instructions fed to JARs by finished runs
+    generation_time = 0.0
+    start_time = last_report = time.time()
+
+    def report(final=False):
+        elapsed = max(time.time() - start_time, 1e-9)
+        label = "Fuzz Summary" if final else "Fuzz"
+        print(f"[{label} {elapsed:7.0f}s] sets {sets_completed} ({sets_completed / elapsed * 60:.1f}/min) | "
+              f"{instructions_run / elapsed:,.0f} instr/s | generation {generation_time / elapsed:.0%} of wall time | "
+              f"failures {failures}")
+
+    def collect(done_futures):
+        nonlocal sets_completed, failures, instructions_run
+        for future in done_futures:
+            in_flight.discard(future)
+            try:
+                jar_name, test_index, result_type, elapsed, message, failed_commands, signature, usage = future.result()
+            except Exception as e:
+                print(f"Error processing fuzz test future result: {e}")
+                continue
+            stats[jar_name][result_type] += 1
+            if store:
+                store.record(jar_name, test_index, pending_runs[test_index][0], result_type, elapsed, message, signature, usage)
+            if failed_commands:
+                failed_commands_by_jar[jar_name].append(failed_commands)
+            entry = pending_runs[test_index]
+            instructions_run += entry[1]
+            entry[2] -= 1
+            if result_type != "Pass":
+                failures += 1
+                entry[3] = True
+                print(f"  ❌ {jar_name} set {test_index}: {result_type} - {message}")
+            if entry[2] == 0:
+                sets_completed += 1
+                if not entry[3]:
+                    discard_passed_fuzz_case(jar_files, test_index, entry[0])
+                del pending_runs[test_index]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while time.time() < deadline and failures < max_failures:
+                if len(in_flight) >= max_in_flight or (in_flight and not scratch_has_room()):
+                    # Over the scratch cap: let running sets finish, passing ones free their files
+                    done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+                elif not scratch_has_room():
+                    print("Fuzz: scratch workspace is still over its cap with nothing running, stopping.")
+                    break
+                else:
+                    sets_generated += 1
+                    gen_start = time.time()
+                    try:
+                        data_path, instruction_count = generate_fuzz_case(sets_generated, test_mode, num_instr_per_test)
+                    except Exception as e:
+                        print(f"Fuzz: generation failed for set {sets_generated}: {e}")
+                        continue
+                    finally:
+                        generation_time += time.time() - gen_start
+                    pending_runs[sets_generated] = [data_path, instruction_count, len(jar_files), False]
+                    for jar_name in jar_files:
+                        in_flight.add(executor.submit(run_single_test, jar_name, data_path, fuzz_output_folder,
+                                                      fuzz_error_folder, sets_generated, fuzz_answers_folder))
+                    collect([future for future in list(in_flight) if future.done()])
+                if time.time() - last_report >= FUZZ_REPORT_INTERVAL:
+                    report()
+                    last_report = time.time()
+                sync_scratch_workspace(store)
+        except KeyboardInterrupt:
+            print("\nFuzz: interrupted, waiting for running tests to finish...")
+        collect(concurrent.futures.wait(in_flight).done)
+    if store:
+        store.close()
+
+    print("\n--- Fuzzing Summary ---")
+    report(final=True)
+    for jar_name in jar_files:
+        jar_stats = stats[jar_name]
+        ran = sum(jar_stats.values())
+        summary_line = f"  {jar_name}: Ran {ran} | ✅ Pass: {jar_stats['Pass']}"
+        for result_type in ("Validation Failed", "Runtime Error", "Timeout", "Tester Error"):
+            if jar_stats[result_type]:
+                summary_line += f" | {result_type}: {jar_stats[result_type]}"
+        print(summary_line)
+        if failed_commands_by_jar[jar_name]:
+            print(f"    Most failing commands: {format_failing_commands(failed_commands_by_jar[jar_name])}")
+    if failures:
+        print("\n--- Failure Clusters ---")
+        report_failure_clusters(jar_files, fuzz_error_folder)
+        if _scratch_workspace:
+            print(f"  Failing cases synced to: {os.path.join(persistent_path(ERROR_FOLDER), FUZZ_SUBFOLDER)} "
+                  "(input.txt in each case folder)")
+        else:
+            print(f"  Failing cases kept in: {fuzz_error_folder} (inputs in {FUZZ_DATA_FOLDER})")
+
+
+# --- Complexity Scaling (CPU time vs set size) ---
+def loglog_slope(points):
+    # Least-squares slope of log(y) against log(x) over (x, y) points with x, y > 0; None for fewer than 2 sizes.
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+def measure_cpu(jar_path, input_path):
+    # (CPU seconds of one run or the timeout as a lower bound, timed out?); None when the JAR crashed.
+    timeout = JAR_TIMEOUT * SCALING_TIMEOUT_FACTOR
+    try:
+        with open_jar_stdin(input_path) as stdin:
+            start_time = time.time()
+            process, (cpu, _) = run_measured(['java', '-jar', jar_path], stdin, timeout)
+    except subprocess.TimeoutExpired:
+        return timeout, True
+    if process.returncode != 0:
+        return None
+    return (cpu if cpu is not None else time.time() - start_time), False
+
+def scaling_main(test_mode='P', sizes=SCALING_SIZES, repeats=SCALING_REPEATS):
+    jar_files = get_jar_files()
+    limit = PUBLIC_MAX_INSTRUCTIONS if test_mode == 'P' else MUTUAL_MAX_INSTRUCTIONS
+    sizes = sorted({min(size, limit) for size in sizes})
+    contestants = {jar_name: os.path.join(JARS_DIR, jar_name) for jar_name in jar_files}
+    if os.path.exists(STANDARD_JAR_PATH):
+        contestants[os.path.basename(STANDARD_JAR_PATH)] = STANDARD_JAR_PATH
+    else:
+        print(f"Warning: {STANDARD_JAR_PATH} not found, slopes are reported without a reference.")
+    report_folder = persistent_path(SCALING_DATA_FOLDER) # Only scaling.json outlives a scratch workspace
+    for folder in {SCALING_DATA_FOLDER, report_folder}:
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder, exist_ok=True)
+    max_workers = max(1, (os.cpu_count() or 1) // 2) # Half the cores: CPU times stay comparable between runs
+    print(f"\nScaling: {len(contestants)} JAR(s), Mode {test_mode}, sizes {', '.join(map(str, sizes))} "
+          f"(ln N up to {SCALING_MAX_LN}), {repeats} set(s) per size, {max_workers} worker(s)")
+
+    # Start-up baseline: a one-person input, subtracted before fitting so JVM start-up does not flatten slopes
+    baseline_path = os.path.join(SCALING_DATA_FOLDER, "baseline.txt")
+    with open(baseline_path, 'w', encoding='utf-8') as f:
+        f.write("ln 1\n1\nbaseline\n20\n")
+    sets = {} # set index -> size
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        futures = []
+        for size in sizes:
+            ln_size = max(1, round(SCALING_MAX_LN * size / sizes[-1]))
+            for _ in range(repeats):
+                sets[len(sets) + 1] = size
+                futures.append(executor.submit(generate_data_task, len(sets), test_mode, size, SCALING_DATA_FOLDER,
+                                               None, ln_size))
+        data_paths = {}
+        for future in concurrent.futures.as_completed(futures):
+            test_index, data_path, status, message = future.result()
+            if status == "Success":
+                data_paths[test_index] = data_path
+            else:
+                print(f"  {message}")
+    print(f"Generated {len(data_paths)}/{len(sets)} set(s).")
+
+    timings = defaultdict(lambda: defaultdict(list)) # jar -> size (0 = baseline) -> CPU seconds
+    timeouts = defaultdict(set) # jar -> sizes with at least one timeout
+    crashes = Counter()
+    runs = [(jar_name, 0, baseline_path) for jar_name in contestants for _ in range(repeats)] + \
+           [(jar_name, sets[idx], path) for jar_name in contestants for idx, path in sorted(data_paths.items())]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(measure_cpu, contestants[jar_name], path): (jar_name, size) for jar_name, size, path in runs}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            jar_name, size = futures[future]
+            measured = future.result()
+            if measured is None:
+                crashes[jar_name] += 1
+                continue
+            cpu, timed_out = measured
+            timings[jar_name][size].append(cpu)
+            if timed_out:
+                timeouts[jar_name].add(size)
+            if done % 10 == 0 or done == len(futures):
+                print(f"  [{done}/{len(futures)}] runs measured")
+
+    slopes = {}
+    report = {}
+    for jar_name in contestants:
+        startup = statistics.median(timings[jar_name][0]) if timings[jar_name][0] else 0.0
+        medians = {size: max(statistics.median(timings[jar_name][size]) - startup, 0.0)
+                   for size in sizes if timings[jar_name][size]}
+        slopes[jar_name] = loglog_slope([(size, cpu) for size, cpu in medians.items() if cpu >= SCALING_MIN_CPU])
+        report[jar_name] = {"startup_cpu": startup, "cpu_by_size": medians, "slope": slopes[jar_name],
+                            "timeout_sizes": sorted(timeouts[jar_name]), "crashes": crashes[jar_name]}
+    reference = slopes.get(os.path.basename(STANDARD_JAR_PATH))
+
+    print("\n--- Scaling Summary (median CPU seconds above start-up) ---")
+    print(f"  {'JAR':<20} {'start-up':>8} " + " ".join(f"{size:>8}" for size in sizes) + "   slope")
+    for jar_name in contestants:
+        entry = report[jar_name]
+        cells = []
+        for size in sizes:
+            value = entry["cpu_by_size"].get(size)
+            cell = "-" if value is None else ('>' if size in timeouts[jar_name] else '') + f"{value:.2f}"
+            cells.append(f"{cell:>8}")
+        slope = entry["slope"]
+        line = f"  {jar_name:<20} {entry['startup_cpu']:>8.2f} " + " ".join(cells) + \
+               (f"   {slope:.2f}" if slope is not None else "   -")
+        if reference is not None and slope is not None and jar_name != os.path.basename(STANDARD_JAR_PATH) \
+                and slope > reference + SCALING_SLOPE_MARGIN:
+            entry["flagged"] = True
+            line += f"  ⚠️ grows faster than standard.jar ({reference:.2f})"
+        if crashes[jar_name]:
+            line += f"  ({crashes[jar_name]} crashed run(s) left out)"
+        print(line)
+    print(f"  Slope ~1 = linear in the set size, ~2 = quadratic; '>' marks sizes where a run hit the timeout; "
+          f"sizes under {SCALING_MIN_CPU}s are not fitted.")
+    report_path = os.path.join(report_folder, "scaling.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({"mode": test_mode, "sizes": sizes, "repeats": repeats, "jars": report}, f, ensure_ascii=False, indent=2)
+    print(f"  Details: {report_path}")
+
+
 # --- Main Function (MODIFIED FOR GENERATION RETRY) ---
-def main():
+def main(answer_source=ANSWER_SOURCE, cross_check_fraction=CROSS_CHECK_FRACTION):
     # --- Setup ---
     jar_files = get_jar_files()
+    _failure_clusters.clear()
     setup_directories(jar_files)
 
     # --- Get Parameters ---
@@ -391,31 +1491,8 @@ def main():
             print("Please create the 'strong' folder and place test files inside.")
             return
 
-        strong_files_paths = []
         try:
-            strong_files_paths = [os.path.join(STRONG_DATA_FOLDER, f) for f in os.listdir(STRONG_DATA_FOLDER)
-                            if os.path.isfile(os.path.join(STRONG_DATA_FOLDER, f))]
-            # NEW: Try to extract index from filename for consistent numbering
-            temp_local_files = {}
-            processed_indices = set()
-            for file_path in strong_files_paths:
-                extracted_index = extract_index_from_filename(file_path)
-                if extracted_index:
-                    if extracted_index not in processed_indices:
-                        temp_local_files[extracted_index] = file_path
-                        processed_indices.add(extracted_index)
-                    else:
-                        print(f"Warning: Duplicate index {extracted_index} found in local files. Skipping {os.path.basename(file_path)}.")
-                else:
-                    # Assign next available index if pattern doesn't match
-                    next_idx = 1
-                    while next_idx in temp_local_files or next_idx in processed_indices:
-                        next_idx += 1
-                    print(f"Warning: Could not extract index from '{os.path.basename(file_path)}'. Assigning index {next_idx}.")
-                    temp_local_files[next_idx] = file_path
-                    processed_indices.add(next_idx)
-            successfully_generated_files = dict(sorted(temp_local_files.items())) # Store sorted by index
-
+            successfully_generated_files = load_regression_corpus() # Indices come from manifest.json order
         except Exception as e:
             print(f"Error reading strong data folder {STRONG_DATA_FOLDER}: {e}")
             return
@@ -451,8 +1528,11 @@ def main():
     print(f"\nStarting tests for {len(jar_files)} JAR(s). Run Mode: {run_mode}")
     max_workers = os.cpu_count() or 1 # Ensure at least 1 worker
     print(f"Using up to {max_workers} worker threads.")
-    results = defaultdict(lambda: defaultdict(list))
+    results = defaultdict(Counter) # jar -> result key -> count
+    result_times = defaultdict(float) # jar -> summed wall time
+    failed_commands_by_jar = defaultdict(list) # jar -> [by_alias of each failing set]
     results_lock = threading.Lock()
+    store = open_results_store(run_mode, answer_source)
     start_run_time = time.time()
     total_jar_tests_submitted = 0
     completed_jar_tests = 0
@@ -472,8 +1552,9 @@ def main():
             indices_to_generate = set(range(1, num_tests_requested + 1))
             generation_attempts = defaultdict(int)
             permanently_failed_indices = set()
+            scratch_full = False
 
-            while len(successfully_generated_files) < num_tests_requested and \
+            while not scratch_full and len(successfully_generated_files) < num_tests_requested and \
                   len(successfully_generated_files) + len(permanently_failed_indices) < num_tests_requested:
 
                 indices_needing_retry_this_batch = []
@@ -501,16 +1582,23 @@ def main():
                      attempt_num = generation_attempts[index]
                      # print(f"  - Submitting index {index} (Attempt {attempt_num}/{MAX_GEN_RETRIES_PER_INDEX})")
                      current_batch_futures.append(
-                         executor.submit(generate_data_task, index, test_mode, num_logical_instr_per_test, DATA_FOLDER)
+                         executor.submit(generate_data_task, index, test_mode, num_logical_instr_per_test, DATA_FOLDER,
+                                         ANSWERS_FOLDER if answer_source == "generator" else None)
                      )
 
                 for future in concurrent.futures.as_completed(current_batch_futures):
+                    if future.cancelled():
+                        continue
                     try:
                         test_index, data_filename, status, message = future.result()
                         if status == "Success":
                             if test_index not in successfully_generated_files: # Avoid duplicates if somehow submitted twice
                                 # print(f"Data Gen: SUCCESS for index {test_index} (path: {data_filename})")
                                 successfully_generated_files[test_index] = data_filename
+                            if not scratch_full and not scratch_has_room():
+                                scratch_full = True
+                                for pending in current_batch_futures:
+                                    pending.cancel() # Sets not started yet; running ones still finish
                         else: pass
                              # Gen Failed
                              # print(f"Data Gen: FAILED for index {test_index} (Attempt {generation_attempts[test_index]}/{MAX_GEN_RETRIES_PER_INDEX}). Reason: {message.splitlines()[0]}") # Show first line of error
@@ -520,7 +1608,7 @@ def main():
                         print(f"Error retrieving generation result (unknown index): {e}")
 
                 # Optional delay between batches
-                if len(successfully_generated_files) < num_tests_requested and \
+                if not scratch_full and len(successfully_generated_files) < num_tests_requested and \
                    len(successfully_generated_files) + len(permanently_failed_indices) < num_tests_requested:
                     # print(f"Data Gen: Completed batch. Waiting {RETRY_DELAY_SECONDS}s before next attempt...")
                     time.sleep(RETRY_DELAY_SECONDS)
@@ -529,6 +1617,8 @@ def main():
             # --- Report final generation status ---
             final_success_count = len(successfully_generated_files)
             print(f"\nPhase 1 Complete: {final_success_count}/{num_tests_requested} data sets generated successfully.")
+            if scratch_full:
+                print(f"Warning: Generation stopped early, the scratch workspace reached its {_scratch_workspace.max_bytes / 2**20:.0f} MiB cap.")
             if permanently_failed_indices:
                 print(f"Warning: Failed to generate data for indices after {MAX_GEN_RETRIES_PER_INDEX} retries: {sorted(list(permanently_failed_indices))}")
             if not successfully_generated_files:
@@ -544,25 +1634,52 @@ def main():
 
         # MODIFIED: Use the count of *actually* successful generations
         num_successful_sets = len(successfully_generated_files)
-        print(f"\nPhase 1.5: Generating expected answers for {num_successful_sets} successfully generated data set(s) using standard.jar...")
-        # The loop now iterates over the potentially smaller set of successful files
-        for test_index, data_path in successfully_generated_files.items():
-            answer_futures.append(executor.submit(run_standard_jar_and_save_answer, data_path, test_index))
-
-        ans_success_count = 0
-        for future in concurrent.futures.as_completed(answer_futures):
-            try:
-                ans_index, ans_ok, standard_time_for_this_run = future.result()
-                if ans_ok:
-                    indices_with_valid_answers.add(ans_index)
-                    ans_success_count += 1
-                    if standard_time_for_this_run is not None:
-                         standard_jar_times.append(standard_time_for_this_run)
-                # else: Failure message printed by task
-            except Exception as e:
-                print(f"Error retrieving standard answer generation result for index (unknown): {e}")
-        # MODIFIED: Report based on successful generations
-        print(f"\nPhase 1.5 Complete: {ans_success_count}/{num_successful_sets} standard answer sets generated successfully.")
+        if answer_source == "generator" and run_mode.startswith("Generate"):
+            # Answers were written by the generator itself; only re-check a sample against standard.jar.
+            print(f"\nPhase 1.5: Skipped, {num_successful_sets} answer set(s) were co-generated by {ANSWER_SOURCE_LABELS[answer_source]}.")
+            indices_with_valid_answers.update(successfully_generated_files.keys())
+            sample_size = min(num_successful_sets, int(round(num_successful_sets * cross_check_fraction)))
+            if cross_check_fraction > 0: sample_size = max(sample_size, 1)
+            if sample_size and not os.path.exists(STANDARD_JAR_PATH):
+                print(f"Cross-check skipped: standard JAR not found at {STANDARD_JAR_PATH}")
+            elif sample_size:
+                sampled_indices = sorted(random.sample(sorted(successfully_generated_files), sample_size))
+                print(f"Cross-checking {sample_size} co-generated answer set(s) against standard.jar: {sampled_indices}")
+                cross_futures = [executor.submit(cross_check_answer_with_standard_jar, successfully_generated_files[i], i)
+                                 for i in sampled_indices]
+                mismatched = 0
+                for future in concurrent.futures.as_completed(cross_futures):
+                    cc_index, cc_match, cc_detail = future.result()
+                    if cc_match is False:
+                        mismatched += 1
+                        print(f"  Cross-check MISMATCH set {cc_index}: {cc_detail} (standard.jar answer used)")
+                    elif cc_match is None:
+                        print(f"  Cross-check set {cc_index}: {cc_detail}")
+                print(f"Cross-check Complete: {sample_size - mismatched}/{sample_size} co-generated answer set(s) agree with standard.jar.")
+        else:
+            if answer_source == "generator": # Local data has no co-generated answers
+                answer_source = "oracle"
+            answer_label = ANSWER_SOURCE_LABELS[answer_source]
+            answer_function = ANSWER_FUNCTIONS[answer_source]
+            print(f"\nPhase 1.5: Generating expected answers for {num_successful_sets} successfully generated data set(s) using {answer_label}...")
+            # The loop now iterates over the potentially smaller set of successful files
+            for test_index, data_path in successfully_generated_files.items():
+                answer_futures.append(executor.submit(answer_function, data_path, test_index))
+
+            ans_success_count = 0
+            for future in concurrent.futures.as_completed(answer_futures):
+                try:
+                    ans_index, ans_ok, standard_time_for_this_run = future.result()
+                    if ans_ok:
+                        indices_with_valid_answers.add(ans_index)
+                        ans_success_count += 1
+                        if standard_time_for_this_run is not None:
+                             standard_jar_times.append(standard_time_for_this_run)
+                    # else: Failure message printed by task
+                except Exception as e:
+                    print(f"Error retrieving standard answer generation result for index (unknown): {e}")
+            # MODIFIED: Report based on successful generations
+            print(f"\nPhase 1.5 Complete: {ans_success_count}/{num_successful_sets} standard answer sets generated successfully.")
 
         # --- Phase 2: Testing (Uses indices_with_valid_answers) ---
         if not indices_with_valid_answers:
@@ -587,7 +1704,7 @@ def main():
             # --- Process Test Results (Logic Unchanged) ---
             for future in concurrent.futures.as_completed(test_futures):
                 try:
-                    jar_name, test_set_idx_res, result_type, elapsed_time, message = future.result()
+                    jar_name, test_set_idx_res, result_type, elapsed_time, message, failed_commands, signature, usage = future.result()
                     with progress_lock:
                         completed_jar_tests += 1
                         progress = f"{completed_jar_tests}/{total_jar_tests_submitted}" if total_jar_tests_submitted > 0 else "N/A"
@@ -596,17 +1713,19 @@ def main():
                     result_key_map = {"Pass": "pass", "Validation Failed": "vf", "Runtime Error": "re", "Timeout": "timeout", "Tester Error": "tester_error"}
                     result_key = result_key_map.get(result_type, "tester_error")
                     with results_lock:
-                        results[jar_name][result_key].append(1)
-                        results[jar_name]["times"].append(elapsed_time)
+                        results[jar_name][result_key] += 1
+                        result_times[jar_name] += elapsed_time
+                        if failed_commands:
+                            failed_commands_by_jar[jar_name].append(failed_commands)
                         if result_type == "Timeout":
                              # Correctly count Timeout under 're' bucket as well
-                             if "re" not in results[jar_name]: results[jar_name]["re"] = []
-                             results[jar_name]["re"].append(1) # Increment RE/Timeout count
-                             # Store timeout specific count if needed separately (optional)
-                             # if "timeout" not in results[jar_name]: results[jar_name]["timeout"] = []
-                             # results[jar_name]["timeout"].append(1)
+                             results[jar_name]["re"] += 1
+                        if store:
+                            store.record(jar_name, test_set_idx_res, successfully_generated_files[test_set_idx_res],
+                                         result_type, elapsed_time, message, signature, usage)
 
                     print(f"[{progress}] JAR: {jar_name:<20} | Set: {test_set_idx_res:<5} | Result: {result_icon:<2} | Time: {elapsed_time:.3f}s | Info: {message}")
+                    sync_scratch_workspace(store)
                 except Exception as e:
                     # Handle potential errors retrieving results from futures
                     print(f"Error processing test future result: {e}")
@@ -616,6 +1735,9 @@ def main():
                          # Or try to infer JAR if only one is running? Difficult.
 
 
+    if store:
+        store.close()
+
     # --- Final Summary (MODIFIED: Use actual tested count) ---
     end_run_time = time.time()
     total_run_duration = end_run_time - start_run_time
@@ -625,23 +1747,23 @@ def main():
     data_tested_count = len(indices_with_valid_answers)
     print(f"Tested {len(jar_files)} JAR(s) against {data_tested_count} data set(s) with valid standard answers.") # Clarified meaning
 
+    answer_label = ANSWER_SOURCE_LABELS[answer_source]
     if standard_jar_times:
         avg_standard_time = sum(standard_jar_times) / len(standard_jar_times)
-        print(f"Standard JAR Average Time: {avg_standard_time:.3f}s")
+        print(f"Answer Source ({answer_label}) Average Time: {avg_standard_time:.3f}s")
     else:
-        print("Standard JAR Average Time: N/A (No successful runs or standard.jar missing/failed)")
+        print(f"Answer Source ({answer_label}) Average Time: N/A (No successful runs or {answer_label} missing/failed)")
 
     for jar_name in jar_files:
         stats = results[jar_name]
-        passed = len(stats.get("pass", []))
-        vf = len(stats.get("vf", []))
-        re_timeout_count = len(stats.get("re", [])) # Includes timeouts
-        tester_errors = len(stats.get("tester_error", []))
+        passed = stats["pass"]
+        vf = stats["vf"]
+        re_timeout_count = stats["re"] # Includes timeouts
+        tester_errors = stats["tester_error"]
         # MODIFIED: Calculate total results received for this jar specifically
         total_results_received_for_jar = passed + vf + re_timeout_count + tester_errors
 
-        times = stats.get("times", [])
-        avg_time = sum(times) / len(times) if times else 0
+        avg_time = result_times[jar_name] / total_results_received_for_jar if total_results_received_for_jar else 0
         # MODIFIED: Calculate accuracy based on the number of tests actually run for this jar against valid data
         accuracy = (passed / data_tested_count * 100) if data_tested_count > 0 else 0
 
@@ -655,10 +1777,85 @@ def main():
             summary_line += f" | ❓ Tester Errors: {tester_errors}"
         print(summary_line)
         print(f"  Average Time per Test: {avg_time:.3f}s")
+        if failed_commands_by_jar[jar_name]:
+            print(f"  Most failing commands: {format_failing_commands(failed_commands_by_jar[jar_name])}")
         if vf > 0 or re_timeout_count > 0 or tester_errors > 0:
-            jar_error_path = os.path.join(ERROR_FOLDER, os.path.splitext(jar_name)[0])
+            jar_error_path = os.path.join(persistent_path(ERROR_FOLDER), os.path.splitext(jar_name)[0])
             print(f"  Check errors in: {jar_error_path}")
-            print(f"  Compare with expected answers in: {ANSWERS_FOLDER}")
+            if not _scratch_workspace: # The scratch answers folder is gone after the run; cases keep their own copy
+                print(f"  Compare with expected answers in: {ANSWERS_FOLDER}")
+
+    if _failure_clusters:
+        print("\n--- Failure Clusters ---")
+        report_failure_clusters(jar_files, ERROR_FOLDER)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="HW11 checker: generate data, build answers, test all JARs.")
+    parser.add_argument("--answer-source", choices=ANSWER_SOURCES, default=ANSWER_SOURCE,
+                        help="Where expected answers come from (default: %(default)s)")
+    parser.add_argument("--cross-check", type=float, default=CROSS_CHECK_FRACTION, metavar="FRACTION",
+                        help="With --answer-source generator, share of sets re-checked against standard.jar (default: %(default)s)")
+    parser.add_argument("--fuzz", action="store_true",
+                        help="Differential fuzzing without standard.jar: generate, run and compare until a budget is hit")
+    parser.add_argument("--fuzz-mode", choices=['P', 'M'], default='P', help="Generator mode for --fuzz")
+    parser.add_argument("--fuzz-instr", type=int, default=None,
+                        help="Logical instructions per fuzz set (default: the mode's maximum)")
+    parser.add_argument("--fuzz-minutes", type=float, default=FUZZ_TIME_BUDGET_MINUTES,
+                        help="Time budget for --fuzz (default: %(default)s)")
+    parser.add_argument("--fuzz-max-failures", type=int, default=FUZZ_MAX_FAILURES,
+                        help="Stop --fuzz after this many failing runs (default: %(default)s)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Complexity-scaling mode: time every JAR and standard.jar on growing sets and fit log-log slopes")
+    parser.add_argument("--scaling-mode", choices=['P', 'M'], default='P', help="Generator mode for --scaling")
+    parser.add_argument("--scaling-sizes", default=",".join(map(str, SCALING_SIZES)), metavar="N,N,...",
+                        help="Instructions per set for --scaling (default: %(default)s)")
+    parser.add_argument("--scaling-repeats", type=int, default=SCALING_REPEATS, help="Sets per size for --scaling")
+    parser.add_argument("--stress", choices=generator11.STRESS_PROFILES, default=STRESS_PROFILE,
+                        help="Generate every set with this generator11 stress profile (all modes, incl. --fuzz/--scaling)")
+    parser.add_argument("--ln-topology", choices=generator11.LN_TOPOLOGIES, default=LN_TOPOLOGY,
+                        help="Graph shape of the initial ln block of every generated set (default: %(default)s)")
+    parser.add_argument("--ln-density", type=float, default=LN_DENSITY,
+                        help="Edge probability for --ln-topology er (default: %(default)s)")
+    parser.add_argument("--max-mismatches", type=int, default=MAX_MISMATCHES_REPORTED, metavar="K",
+                        help="Mismatching lines detailed per failing set in diff.json (default: %(default)s)")
+    parser.add_argument("--cluster-reps", type=int, default=CLUSTER_REPRESENTATIVES, metavar="N",
+                        help="Failing sets saved in full per failure cluster, 0 = all (default: %(default)s)")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Do not add failing inputs to the strong/ regression corpus")
+    parser.add_argument("--compress", action="store_true",
+                        help="Store data, answers, outputs and error copies gzip-compressed (*.txt.gz)")
+    parser.add_argument("--drop-passing-outputs", action="store_true",
+                        help="Validate JAR output in memory and only write output/ files for failing runs")
+    parser.add_argument("--no-db", action="store_true", help="Do not record verdicts in the results database")
+    parser.add_argument("--scratch", nargs="?", const=SCRATCH_DEFAULT_PARENT, default=SCRATCH_DIR, metavar="DIR",
+                        help="Keep data/answers/output/errors in a RAM-backed directory and sync errors and the "
+                             "results db back to BASE_DIR; passing outputs are not kept. Default DIR: "
+                             f"{SCRATCH_DEFAULT_PARENT} (/dev/shm on Linux, otherwise the system temp directory, "
+                             "which is usually on disk, so give a RAM disk explicitly on Windows/macOS)")
+    parser.add_argument("--scratch-max-mb", type=int, default=SCRATCH_MAX_MB,
+                        help="Scratch size cap in MiB (default: %(default)s)")
+    args = parser.parse_args()
+    if args.no_db:
+        RESULTS_DB_PATH = None
+    STRESS_PROFILE = args.stress
+    LN_TOPOLOGY = args.ln_topology
+    LN_DENSITY = args.ln_density
+    COMPRESS_FILES = args.compress
+    # The scratch copy of output/ is deleted on close, so passing outputs written there would never be read
+    KEEP_PASSING_OUTPUTS = not (args.drop_passing_outputs or args.scratch)
+    MAX_MISMATCHES_REPORTED = args.max_mismatches
+    CLUSTER_REPRESENTATIVES = args.cluster_reps
+    PROMOTE_FAILURES = not args.no_promote
+    SCRATCH_DIR = args.scratch
+    workspace = enter_scratch_workspace(SCRATCH_DIR, args.scratch_max_mb) if SCRATCH_DIR else None
+    try:
+        if args.scaling:
+            scaling_main(args.scaling_mode, [int(size) for size in args.scaling_sizes.split(",")], args.scaling_repeats)
+        elif args.fuzz:
+            fuzz_instr = args.fuzz_instr or (PUBLIC_MAX_INSTRUCTIONS if args.fuzz_mode == 'P' else MUTUAL_MAX_INSTRUCTIONS)
+            fuzz_main(args.fuzz_mode, fuzz_instr, args.fuzz_minutes, args.fuzz_max_failures)
+        else:
+            main(answer_source=args.answer_source, cross_check_fraction=args.cross_check)
+    finally:
+        if workspace:
+            workspace.close()
\ No newline at end of file
@@ -6,8 +6,12 @@ from collections import defaultdict, deque
 import os
 import argparse
 import enum
+import itertools
 import time
 
+from network11 import BestAcquaintanceIndex, IndexedSet, Person, OfficialAccount, Message, ShortestPathIndex
+from oracle11 import EXCEPTION_ABBREVIATIONS, OracleNetwork, exception_abbreviation, open_text, run_lines
+
 # --- ALIAS MAP (Updated for HW11) ---
 ALIAS_MAP = {
     "add_person": "ap",
@@ -155,15 +159,31 @@ for key, name in GENERATOR_TARGET_OUTCOME_MAP.items():
     EXCEPTION_NAME_TO_TARGET_KEY[name].append(key)
 
 # --- Constants ---
+# Sidecar index (-x): one fixed-width record per expected output line, so record k is at byte k * width.
+INDEX_RECORD_FORMAT = "{line:>7} {alias:<8} {outcome:<6}\n"  # 1-based input line, command alias, intended outcome
+INDEX_RECORD_WIDTH = 24
 PUBLIC_MAX_INSTRUCTIONS = 10000
 PUBLIC_MAX_N_LOAD = 300
 MUTUAL_MAX_INSTRUCTIONS = 3000
 MUTUAL_MAX_N_LOAD = 100
+LN_TOPOLOGIES = ("random", "chain", "star", "grid", "cliques", "er", "components")  # Shapes of the initial ln graph
+LN_ER_DENSITY = 0.05  # Default edge probability of the "er" topology
+LN_COMPONENT_SIZE = 4  # Persons per component of the "components" topology
 
 COMMANDS = set(ALIAS_MAP.values()) - {'ln'}
 LOAD_CMDS = {"ln"}
 COMMANDS_WITH_ARGS = COMMANDS
 
+# Adjusted weights for HW11 commands might be needed here based on testing goals
+COMMAND_WEIGHTS = {
+    "ap": 10, "ar": 10, "mr": 8, "at": 7, "dt": 4, "att": 7, "dft": 4,
+    "qv": 5, "qci": 5, "qts": 2, "qtav": 5, "qtvs": 5, "qba": 5, "qcs": 3,
+    "coa": 7, "doa": 4, "ca": 8, "da": 5, "foa": 6, "qsp": 7, "qbc": 4, "qra": 4,
+    # HW11 weights - adjust these based on importance/complexity
+    "am": 10, "sm": 12, "qsv": 5, "qrm": 5, "arem": 9, "afm": 9, "aem": 9,
+    "sei": 6, "qp": 5, "dce": 3, "qm": 5,
+}
+
 EXCEPTION_MAP = defaultdict(set)
 for (cmd_alias, _), exc_name in GENERATOR_TARGET_OUTCOME_MAP.items():
     EXCEPTION_MAP[cmd_alias].add(exc_name)
@@ -178,8 +198,14 @@ class GenPhase(enum.Enum):
 
 # --- Generator Class ---
 class DataGenerator:
-    def __init__(self, mode='P', num_logical_instructions=100):
+    def __init__(self, mode='P', num_logical_instructions=100, emit_answers=False, ln_size=None, stress_profile=None,
+                 ln_topology="random", ln_density=LN_ER_DENSITY):
         self.mode = mode.upper()
+        self.emit_answers = emit_answers  # Also simulate every emitted command in an oracle11 network and keep its output
+        self.ln_size = ln_size  # Fixed `ln` person count (capped by the mode's limit); None = random
+        self.ln_topology = ln_topology  # One of LN_TOPOLOGIES: graph shape of the initial ln block
+        self.ln_density = ln_density  # Edge probability for the "er" topology
+        self.stress_profile = stress_profile  # Name in _STRESS_PROFILE_METHODS: replaces the phased random mix
         self.target_instructions = num_logical_instructions
         if self.mode == 'P':
             self.max_instr_limit = PUBLIC_MAX_INSTRUCTIONS
@@ -191,18 +217,25 @@ class DataGenerator:
         self._initialize_state()
 
     def _initialize_state(self):
+        persons = {}
         self.network_state = {
-            "persons": {},
-            # id -> {name, age, acquaintances: {id:val}, tags: {tag_id}, money: M, socialValue: SV, messages_received_obj: deque(), articles_received_ids: deque()}
+            "persons": persons,  # id -> Person (see network11)
+            "paths": ShortestPathIndex(persons),  # Cached BFS trees, told about every acquaintance change
+            "best_acquaintances": BestAcquaintanceIndex(persons),  # qba answers and the qcs couple count
             "person_tags": {},  # (person_id, tag_id) -> {member_id: age} # Stores actual members of a tag
             "relations": {},  # (min_id, max_id) -> value
-            "accounts": {},
-            # account_id -> {owner_id, name, followers: {person_id: contribution_count}, articles: {article_id}}
+            "accounts": {},  # account_id -> OfficialAccount
             "articles_map": {},  # article_id -> contributor_person_id (Original contributor)
             "triple_sum": 0,
-            "couple_sum_dirty": True,
+            # Counter kept by the state updaters so generate_instruction never has to scan the state
+            "accounts_with_followers": 0,
+            # Tag indexes kept by the tag updaters (at/dt/att/dft/mr)
+            "tag_owners": IndexedSet(),  # Persons owning at least one tag
+            "nonempty_tags": IndexedSet(),  # (owner_id, tag_id) with at least one member
+            "nonfull_tags": IndexedSet(),  # (owner_id, tag_id) with fewer than TAG_PERSONS_LIMIT members
+            "member_tags": defaultdict(set),  # member_id -> {(owner_id, tag_id)} the person belongs to
             # HW11 additions to network_state
-            "messages_map": {},  # message_id -> message_object (see _generate_message_object_structure)
+            "messages_map": {},  # message_id -> Message (see _generate_message_object_structure)
             "emoji_id_list": [],  # List of stored emoji IDs
             "emoji_heat_list": [],  # Corresponding heat for emoji_id_list
             "next_message_id_counter": 0,  # Simple counter for unique message IDs
@@ -215,6 +248,15 @@ class DataGenerator:
         self.commands_successfully_generated = set()
         self.exceptions_attempted = set()
         self.all_exceptions_to_attempt = set(ALL_TARGET_KEYS)
+        # Co-generated expected output (see _emit). The answers come from a second, oracle11-side network
+        # fed the same commands, not from network_state: the generator's state has no exception counters or
+        # output formatting, so every command is simulated twice (~0.7 s on a 10000-instruction P set).
+        self.answer_network = OracleNetwork() if self.emit_answers else None
+        self.answer_marks = []  # (len(generated_lines) once the command is written, expected output line)
+        self.intent_mismatches = []  # (command, intended outcome, oracle output) where the two disagree
+        self.command_marks = []  # (len(generated_lines) once written, first input line, alias, outcome abbreviation)
+        self._last_outcome = None
+        self._weight_vector_cache = {}  # pruning signature -> (runnable_cmds, cum_weights)
 
     def _get_next_message_id(self):
         # A simple way to get a unique message ID. Can be made more robust.
@@ -254,51 +296,36 @@ class DataGenerator:
 
     def _get_existing_tag_ids_for_person(self, person_id):
         person_data = self.network_state["persons"].get(person_id)
-        return list(person_data["tags"]) if person_data and "tags" in person_data else []
+        return list(person_data.tags) if person_data else []
 
     def _get_persons_in_tag(self, owner_id, tag_id):  # owner_id is person who owns the tag
         return list(self.network_state["person_tags"].get((owner_id, tag_id), {}).keys())
 
     def _get_accounts_owned_by_person(self, person_id):
         return [acc_id for acc_id, acc_data in self.network_state["accounts"].items() if
-                acc_data["owner_id"] == person_id]
+                acc_data.owner_id == person_id]
 
     def _get_followers_of_account(self, account_id):
         acc_data = self.network_state["accounts"].get(account_id)
-        return list(acc_data["followers"].keys()) if acc_data and "followers" in acc_data else []
+        return list(acc_data.followers.keys()) if acc_data else []
 
     def _get_articles_of_account(self, account_id):  # Articles *created by* this account
         acc_data = self.network_state["accounts"].get(account_id)
-        return list(acc_data["articles"]) if acc_data and "articles" in acc_data else []
+        return list(acc_data.articles) if acc_data else []
 
     def _get_articles_received_by_person(self, person_id):
         person_data = self.network_state["persons"].get(person_id)
-        return list(
-            person_data["articles_received_ids"]) if person_data and "articles_received_ids" in person_data else []
+        return list(person_data.articles_received_ids) if person_data else []
 
     def _get_messages_received_by_person_obj(self, person_id):
         person_data = self.network_state["persons"].get(person_id)
-        return list(
-            person_data["messages_received_obj"]) if person_data and "messages_received_obj" in person_data else []
+        return list(person_data.messages_received_obj) if person_data else []
 
     def _bfs_reachable(self, start_id):
         state = self.network_state
         if start_id not in state["persons"]:
-            return set()
-        reachable = set()
-        queue = deque([start_id])
-        visited = {start_id}
-        reachable.add(start_id)
-        while queue:
-            current_id = queue.popleft()
-            current_person_data = state["persons"].get(current_id)
-            if current_person_data and "acquaintances" in current_person_data:
-                for acquaintance_id in current_person_data["acquaintances"].keys():
-                    if acquaintance_id not in visited:
-                        visited.add(acquaintance_id)
-                        reachable.add(acquaintance_id)
-                        queue.append(acquaintance_id)
-        return reachable
+            return {}
+        return state["paths"].tree(start_id)  # person_id -> distance; only read it, the index owns it
 
     # --- Helper Functions for Parameter Generation (Updated/Reviewed for HW11) ---
     def _generate_random_id(self, id_type="person", used_ids=None, pool_range_override=None):
@@ -365,7 +392,7 @@ class DataGenerator:
         # Get tags *owned* by this person
         person_data = self.network_state["persons"].get(person_id)
         if not person_data: return None  # Person doesn't exist
-        existing_tag_ids_owned = list(person_data.get("tags", set()))
+        existing_tag_ids_owned = list(person_data.tags)
 
         tag_pool = set(range(TAG_ID_POOL_RANGE[0], TAG_ID_POOL_RANGE[1] + 1))
         if not tag_pool: return None
@@ -425,7 +452,7 @@ class DataGenerator:
     def _get_random_existing_tag_id_for_person(self, person_id):  # Tag owned by person
         person_data = self.network_state["persons"].get(person_id)
         if not person_data: return None
-        existing_tag_ids_owned = list(person_data.get("tags", set()))
+        existing_tag_ids_owned = list(person_data.tags)
         return random.choice(existing_tag_ids_owned) if existing_tag_ids_owned else None
 
     def _get_random_person_in_tag(self, owner_id, tag_id):
@@ -446,7 +473,7 @@ class DataGenerator:
     def _get_random_account_not_owned_by_person(self, person_id):
         existing_account_ids = self._get_existing_account_ids()
         non_owned_accounts = [acc_id for acc_id in existing_account_ids if
-                              self.network_state["accounts"][acc_id]["owner_id"] != person_id]
+                              self.network_state["accounts"][acc_id].owner_id != person_id]
         return random.choice(non_owned_accounts) if non_owned_accounts else None
 
     def _get_random_follower_of_account(self, account_id):
@@ -569,6 +596,11 @@ class DataGenerator:
         if id1 == id2: return None, None, None  # Ensure distinct IDs for normal/ERE/PINF cases
 
         value = self._generate_random_value()
+        if outcome == OUTCOME_NORMAL and random.random() < 0.25:
+            # Tie id1's current best value so qba/qcs have to fall back to the smaller id
+            best_value = state["best_acquaintances"].best_value(id1)
+            if best_value is not None and VALUE_RANGE[0] <= best_value <= VALUE_RANGE[1]:
+                value = best_value
         params = {"id1": id1, "id2": id2, "value": value}
         cmd_str = f"ar {id1} {id2} {value}"
         return cmd_str, params, outcome
@@ -624,6 +656,12 @@ class DataGenerator:
         if id1 is None or id2 is None: return None, None, None
 
         m_val = self._generate_random_mval()
+        if outcome == OUTCOME_NORMAL and random.random() < 0.2:
+            # Move the relation onto id1's best value to create a tie (or shift the best acquaintance)
+            best_value = state["best_acquaintances"].best_value(id1)
+            tie_m_val = best_value - state["relations"][(min(id1, id2), max(id1, id2))] if best_value else 0
+            if tie_m_val and MVAL_RANGE[0] <= tie_m_val <= MVAL_RANGE[1]:
+                m_val = tie_m_val
         params = {"id1": id1, "id2": id2, "m_val": m_val}
         cmd_str = f"mr {id1} {id2} {m_val}"
         return cmd_str, params, outcome
@@ -642,9 +680,8 @@ class DataGenerator:
             if person_id is None: return None, None, None
             outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
         elif target_key == ("at", "ETI"):
-            persons_with_tags_owned = [pid for pid, data in state["persons"].items() if data.get("tags")]
-            if persons_with_tags_owned:
-                person_id = random.choice(persons_with_tags_owned)
+            if state["tag_owners"]:
+                person_id = state["tag_owners"].choice()
                 tag_id = self._get_random_existing_tag_id_for_person(person_id)
                 if tag_id is None: return None, None, None
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
@@ -692,9 +729,8 @@ class DataGenerator:
             else:
                 return None, None, None
         elif target_key is None:
-            persons_with_tags_owned = [pid for pid, data in state["persons"].items() if data.get("tags")]
-            if persons_with_tags_owned:
-                person_id = random.choice(persons_with_tags_owned)
+            if state["tag_owners"]:
+                person_id = state["tag_owners"].choice()
                 tag_id = self._get_random_existing_tag_id_for_person(person_id)
                 if tag_id is None: return None, None, None
                 outcome = OUTCOME_NORMAL
@@ -744,15 +780,14 @@ class DataGenerator:
         elif target_key == ("att", "RNF"):  # Not linked
             valid_attempts = []
             # Find p1, p2 not linked, but p2 owns a tag
-            for p2_id in existing_ids:
-                p2_tags = self._get_existing_tag_ids_for_person(p2_id)
-                if not p2_tags: continue
-                tag_id_cand = random.choice(p2_tags)
+            if state["tag_owners"]:
+                p2_id = state["tag_owners"].choice()
+                tag_id_cand = self._get_random_existing_tag_id_for_person(p2_id)
+                p2_acq = state["persons"][p2_id].acquaintances
                 for p1_id in existing_ids:
-                    if p1_id != p2_id and (min(p1_id, p2_id), max(p1_id, p2_id)) not in state["relations"]:
+                    if p1_id != p2_id and p1_id not in p2_acq:
                         valid_attempts.append((p1_id, p2_id, tag_id_cand))
                         break
-                if valid_attempts: break
             if valid_attempts:
                 id1, id2, tag_id = valid_attempts[0]
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
@@ -778,16 +813,13 @@ class DataGenerator:
         elif target_key == ("att", "EPI_in_tag"):  # id1 already in tag
             valid_attempts = []
             # Find p1, p2 linked, p2 owns tag_id, and p1 is already a member of (p2, tag_id)
-            for (owner_id, tid), members in state["person_tags"].items():
-                if not members: continue
-                p2_id_cand = owner_id
-                tag_id_cand = tid
-                member_to_add_cand = random.choice(list(members.keys()))  # This is id1
+            if state["nonempty_tags"]:
+                p2_id_cand, tag_id_cand = state["nonempty_tags"].choice()
+                member_to_add_cand = random.choice(list(state["person_tags"][(p2_id_cand, tag_id_cand)]))  # This is id1
                 # Ensure p2_id_cand and member_to_add_cand are linked
                 if member_to_add_cand != p2_id_cand and (
                 min(member_to_add_cand, p2_id_cand), max(member_to_add_cand, p2_id_cand)) in state["relations"]:
                     valid_attempts.append((member_to_add_cand, p2_id_cand, tag_id_cand))
-                    break
             if valid_attempts:
                 id1, id2, tag_id = valid_attempts[0]
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
@@ -795,20 +827,22 @@ class DataGenerator:
                 return None, None, None
         elif target_key is None:  # Try normal
             valid_attempts = []
-            # Find p1, p2 linked, p2 owns tag_id, p1 not in (p2, tag_id), tag not full
-            linked_pairs = list(state["relations"].keys())
-            random.shuffle(linked_pairs)
-            for min_r_id, max_r_id in linked_pairs:
-                p1_cand, p2_cand = random.choice([(min_r_id, max_r_id), (max_r_id, min_r_id)])
-                if p1_cand == p2_cand: continue
-                p2_owned_tags = self._get_existing_tag_ids_for_person(p2_cand)
-                random.shuffle(p2_owned_tags)
-                for tag_id_cand in p2_owned_tags:
-                    tag_current_members = self._get_persons_in_tag(p2_cand, tag_id_cand)
-                    if p1_cand not in tag_current_members and len(tag_current_members) < TAG_PERSONS_LIMIT:
-                        valid_attempts.append((p1_cand, p2_cand, tag_id_cand))
-                        break
-                if valid_attempts: break
+            # Find p1, p2 linked, p2 owns tag_id, p1 not in (p2, tag_id), tag not full.
+            # Sample non-full tags; members of a tag are always acquaintances of its owner, so a
+            # candidate exists iff the owner has an acquaintance outside the tag.
+            nonfull_tags = state["nonfull_tags"]
+            for _ in range(min(len(nonfull_tags), 8)):
+                p2_cand, tag_id_cand = nonfull_tags.choice()
+                p2_acq = state["persons"][p2_cand].acquaintances
+                tag_current_members = state["person_tags"][(p2_cand, tag_id_cand)]
+                if len(p2_acq) <= len(tag_current_members): continue
+                p1_cand = random.choice(list(p2_acq))
+                if p1_cand in tag_current_members:
+                    outside = [pid for pid in p2_acq if pid not in tag_current_members]
+                    if not outside: continue
+                    p1_cand = random.choice(outside)
+                valid_attempts.append((p1_cand, p2_cand, tag_id_cand))
+                break
             if valid_attempts:
                 id1, id2, tag_id = valid_attempts[0]
                 outcome = OUTCOME_NORMAL
@@ -863,22 +897,15 @@ class DataGenerator:
         elif target_key == ("dft", "PINF_not_in_tag"):  # id1 (person to delete) not in tag
             valid_attempts = []
             # Find p2 who owns a tag_id, and p1 who is NOT in that tag
-            for p2_id_cand in existing_ids:
-                p2_owned_tags = self._get_existing_tag_ids_for_person(p2_id_cand)
-                if not p2_owned_tags: continue
-                tag_id_cand = random.choice(p2_owned_tags)
-                tag_members = self._get_persons_in_tag(p2_id_cand, tag_id_cand)
+            if state["tag_owners"]:
+                p2_id_cand = state["tag_owners"].choice()
+                tag_id_cand = self._get_random_existing_tag_id_for_person(p2_id_cand)
+                tag_members = state["person_tags"].get((p2_id_cand, tag_id_cand), {})
 
                 non_members = [pid for pid in existing_ids if
                                pid not in tag_members and pid != p2_id_cand]  # pid1 != pid2 for dft JML usually
                 if non_members:
-                    p1_id_cand = random.choice(non_members)
-                    # Ensure p1 and p2 exist and p2 owns tag
-                    if state["persons"].get(p1_id_cand) and state["persons"].get(p2_id_cand) and tag_id_cand in \
-                            state["persons"][p2_id_cand].get("tags", set()):
-                        valid_attempts.append((p1_id_cand, p2_id_cand, tag_id_cand))
-                        break
-                if valid_attempts: break
+                    valid_attempts.append((random.choice(non_members), p2_id_cand, tag_id_cand))
             if valid_attempts:
                 id1, id2, tag_id = valid_attempts[0]
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
@@ -887,13 +914,10 @@ class DataGenerator:
         elif target_key is None:  # Try normal
             valid_attempts = []
             # Find p2 who owns tag_id, and p1 who IS in that tag
-            for (owner_id, tid), members_map in state["person_tags"].items():
-                if members_map:  # If tag has members
-                    p2_id_cand = owner_id
-                    tag_id_cand = tid
-                    p1_id_cand = random.choice(list(members_map.keys()))
-                    valid_attempts.append((p1_id_cand, p2_id_cand, tag_id_cand))
-                    break
+            if state["nonempty_tags"]:
+                p2_id_cand, tag_id_cand = state["nonempty_tags"].choice()
+                p1_id_cand = random.choice(list(state["person_tags"][(p2_id_cand, tag_id_cand)]))
+                valid_attempts.append((p1_id_cand, p2_id_cand, tag_id_cand))
             if valid_attempts:
                 id1, id2, tag_id = valid_attempts[0]
                 outcome = OUTCOME_NORMAL
@@ -1023,19 +1047,13 @@ class DataGenerator:
                 return None, None, None
         elif target_key is None:  # Try normal
             # Find a person who owns a tag that has members
-            persons_owning_tags_with_members = []
-            for (owner_id, tid), members_map in state["person_tags"].items():
-                if members_map:  # If tag has members
-                    persons_owning_tags_with_members.append((owner_id, tid))
-
-            if persons_owning_tags_with_members:
-                person_id, tag_id = random.choice(persons_owning_tags_with_members)
+            if state["nonempty_tags"]:
+                person_id, tag_id = state["nonempty_tags"].choice()
                 outcome = OUTCOME_NORMAL
             else:  # No tags with members exist
                 # Fallback: find any owned tag, even if empty (JML allows ageVar for empty tag -> 0)
-                persons_owning_any_tag = [pid for pid, data in state["persons"].items() if data.get("tags")]
-                if persons_owning_any_tag:
-                    person_id = random.choice(persons_owning_any_tag)
+                if state["tag_owners"]:
+                    person_id = state["tag_owners"].choice()
                     tag_id = self._get_random_existing_tag_id_for_person(person_id)
                     if tag_id is not None:
                         outcome = OUTCOME_NORMAL
@@ -1064,18 +1082,17 @@ class DataGenerator:
             if _id is None: return None, None, None
             outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
         elif target_key == ("qba", "ANE"):
-            persons_with_no_acquaintances = [pid for pid, data in state["persons"].items() if
-                                             not data.get("acquaintances", {})]
-            if persons_with_no_acquaintances:
+            linked = state["best_acquaintances"].linked
+            if len(linked) < len(existing_ids):
+                persons_with_no_acquaintances = [pid for pid in existing_ids if pid not in linked]
                 _id = random.choice(persons_with_no_acquaintances)
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
             else:
                 return None, None, None
         elif target_key is None:
-            persons_with_acquaintances = [pid for pid, data in state["persons"].items() if
-                                          data.get("acquaintances", {})]
-            if persons_with_acquaintances:
-                _id = random.choice(persons_with_acquaintances)
+            linked = state["best_acquaintances"].linked
+            if linked:
+                _id = linked.choice()
                 outcome = OUTCOME_NORMAL
             else:
                 return None, None, None
@@ -1105,6 +1122,8 @@ class DataGenerator:
         else:
             target_n = max(min_n, min(max_n, self.target_instructions // 10))
             n = random.randint(min_n, max(min_n, target_n))
+            if self.ln_size is not None:
+                n = max(0, min(self.ln_size, max_n))
 
         ids = []
         if n > 0:
@@ -1112,67 +1131,70 @@ class DataGenerator:
             if len(id_pool) < n: n = len(id_pool)
             if n > 0: ids = random.sample(id_pool, n)
 
-        names = [self._generate_random_name() for _ in range(n)]
-        ages = [self._generate_random_age() for _ in range(n)]
-        values_matrix = []
-        if n > 1:
-            for i in range(n - 1):
-                row = [random.randint(0, VALUE_RANGE[1]) for _ in range(i + 1)]
-                values_matrix.append(row)
-
-        output_lines = [f"ln {n}"]
-        output_lines.append(" ".join(map(str, ids)) if n > 0 else "")
-        output_lines.append(" ".join(names) if n > 0 else "")
-        output_lines.append(" ".join(map(str, ages)) if n > 0 else "")
-        if n > 1:
-            for row in values_matrix: output_lines.append(" ".join(map(str, row)))
-        output_str = "\n".join(line for line in output_lines if line is not None)
-
-        # Update state based on ln (critical!)
-        for i in range(n):
-            person_id = ids[i]
-            # Use _update_state_ap's logic for consistency but without exception
-            state["persons"][person_id] = {
-                "name": names[i],
-                "age": ages[i],
-                "acquaintances": {},
-                "tags": set(),  # Person owns these tags
-                "money": 0,  # Initialize money
-                "socialValue": 0,  # Initialize socialValue
-                "messages_received_obj": deque(),  # Initialize received messages
-                "articles_received_ids": deque()  # Initialize received articles
-            }
-            # Note: person_tags stores members, not owned tags by person. Owned tags are in person[id]["tags"]
-
-        if n > 1:
-            for i in range(n - 1):
-                for j in range(i + 1):
-                    id1 = ids[i + 1]
-                    id2 = ids[j]
-                    value = values_matrix[i][j]
-                    if value > 0:
-                        # Use _update_state_ar's logic for consistency but without exception
-                        pair_key = (min(id1, id2), max(id1, id2))
-                        if id1 in state["persons"] and id2 in state["persons"] and id1 != id2 and pair_key not in state[
-                            "relations"]:
-                            state["persons"][id1]["acquaintances"][id2] = value
-                            state["persons"][id2]["acquaintances"][id1] = value
-                            state["relations"][pair_key] = value
-
-        state["triple_sum"] = 0
-        state["couple_sum_dirty"] = True
-        person_list = list(state["persons"].keys())
-        for i in range(len(person_list)):
-            for j in range(i + 1, len(person_list)):
-                for k in range(j + 1, len(person_list)):
-                    p1_id, p2_id, p3_id = person_list[i], person_list[j], person_list[k]
-                    if (min(p1_id, p2_id), max(p1_id, p2_id)) in state["relations"] and \
-                            (min(p2_id, p3_id), max(p2_id, p3_id)) in state["relations"] and \
-                            (min(p3_id, p1_id), max(p3_id, p1_id)) in state["relations"]:
-                        state["triple_sum"] += 1
-        params = {"n": n, "ids": ids, "names": names, "ages": ages, "values_matrix": values_matrix}
+        edges = self._ln_edges(n)
+        output_str = self._load_ln(ids, edges)
+        params = {"n": n, "ids": ids, "edges": edges}
         return output_str, params, OUTCOME_NORMAL
 
+    def _ln_edges(self, n):
+        """Relations {(i, j): value} (i > j, indexes into the ln ids) of n persons shaped by self.ln_topology."""
+        value = self._generate_random_value
+        topology = self.ln_topology
+        if topology == "chain":
+            return {(i, i - 1): value() for i in range(1, n)}
+        if topology == "star":
+            return {(i, 0): value() for i in range(1, n)}
+        if topology == "grid":  # Row-major, width ceil(sqrt(n)); the last row may be partial
+            width = math.isqrt(n - 1) + 1 if n > 1 else 1
+            edges = {(i, i - 1): value() for i in range(1, n) if i % width}
+            edges.update({(i, i - width): value() for i in range(width, n)})
+            return edges
+        if topology == "cliques":  # Cliques of ~sqrt(n) persons, consecutive ones joined by one bridge, in a ring
+            size = max(2, round(math.sqrt(n)))
+            starts = list(range(0, n, size))
+            edges = {(i, j): value() for start in starts for i in range(start, min(start + size, n)) for j in range(start, i)}
+            edges.update({(start, start - 1): value() for start in starts[1:]})
+            if len(starts) > 2:
+                edges[(n - 1, 0)] = value()
+            return edges
+        if topology == "er":
+            return {pair: value() for pair in self._sample_pairs(n, self.ln_density)}
+        if topology == "components":  # Random tree per component plus each remaining inner pair with p = 0.5
+            edges = {}
+            for start in range(0, n, LN_COMPONENT_SIZE):
+                for i in range(start + 1, min(start + LN_COMPONENT_SIZE, n)):
+                    tree_parent = random.randint(start, i - 1)
+                    edges.update({(i, j): value() for j in range(start, i) if j == tree_parent or random.random() < 0.5})
+            return edges
+        # "random": every pair draws a value in [0, max], 0 meaning no relation
+        edges = {}
+        for i in range(1, n):
+            for j in range(i):
+                pair_value = random.randint(0, VALUE_RANGE[1])
+                if pair_value > 0:
+                    edges[(i, j)] = pair_value
+        return edges
+
+    @staticmethod
+    def _sample_pairs(n, density):
+        """Each pair (i, j), i > j, of n indexes independently with probability `density`. Walks the pairs in
+        row order with geometric skips, so the cost is proportional to the pairs taken rather than n^2."""
+        if density <= 0 or n < 2:
+            return []
+        if density >= 1:
+            return [(i, j) for i in range(1, n) for j in range(i)]
+        log_miss = math.log(1 - density)
+        pairs = []
+        i, j = 1, -1
+        while True:
+            j += 1 + int(math.log(1 - random.random()) / log_miss)
+            while j >= i:
+                j -= i
+                i += 1
+                if i >= n:
+                    return pairs
+            pairs.append((i, j))
+
     def _generate_coa(self, target_key=None):
         state = self.network_state
         existing_persons = self._get_existing_person_ids()
@@ -1238,7 +1260,7 @@ class DataGenerator:
                 return None, None, None
         elif target_key == ("doa", "DAPermissionDenied_DOA"):
             # Find account owned by someone else
-            accounts_and_owners = [(acc_id, data["owner_id"]) for acc_id, data in state["accounts"].items()]
+            accounts_and_owners = [(acc_id, data.owner_id) for acc_id, data in state["accounts"].items()]
             random.shuffle(accounts_and_owners)
             found = False
             for acc_id_cand, owner_id_cand in accounts_and_owners:
@@ -1389,7 +1411,7 @@ class DataGenerator:
             outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
         elif target_key == ("da", "AINF"):  # Article not in account
             # Find account with owner, and an article NOT in that account's list
-            accounts_with_owners = [(acc_id, data["owner_id"]) for acc_id, data in state["accounts"].items()]
+            accounts_with_owners = [(acc_id, data.owner_id) for acc_id, data in state["accounts"].items()]
             random.shuffle(accounts_with_owners)
             found = False
             for acc_id_cand, owner_id_cand in accounts_with_owners:
@@ -1407,8 +1429,8 @@ class DataGenerator:
         elif target_key == ("da", "DAPermissionDenied_DA"):  # Person not owner of account
             # Find account with article, and a person who is NOT the owner
             accounts_with_articles_and_owners = [
-                (acc_id, data["owner_id"], list(data["articles"]))
-                for acc_id, data in state["accounts"].items() if data["articles"]
+                (acc_id, data.owner_id, list(data.articles))
+                for acc_id, data in state["accounts"].items() if data.articles
             ]
             random.shuffle(accounts_with_articles_and_owners)
             found = False
@@ -1427,8 +1449,8 @@ class DataGenerator:
         elif target_key is None:
             # Person is owner, account has article
             accounts_with_articles_and_owners = [
-                (acc_id, data["owner_id"], list(data["articles"]))
-                for acc_id, data in state["accounts"].items() if data["articles"]
+                (acc_id, data.owner_id, list(data.articles))
+                for acc_id, data in state["accounts"].items() if data.articles
             ]
             random.shuffle(accounts_with_articles_and_owners)
             found = False
@@ -1534,17 +1556,16 @@ class DataGenerator:
         elif target_key == ("qsp", "PathNotFound"):
             if len(existing_ids) < 2: return None, None, None
             found_unreachable = False
-            # Try finding two distinct components
-            all_persons = list(existing_ids)
-            random.shuffle(all_persons)
-            for start_node_cand in all_persons:
-                reachable_set = self._bfs_reachable(start_node_cand)
+            # Try finding two distinct components. One BFS tree is enough: if it spans everyone the graph is connected and no pair works.
+            start_node_cand = random.choice(existing_ids)
+            reachable_set = self._bfs_reachable(start_node_cand)
+            if len(reachable_set) < len(existing_ids):
                 unreachable_candidates = [pid for pid in existing_ids if pid not in reachable_set]
-                if unreachable_candidates:
-                    id1 = start_node_cand
-                    id2 = random.choice(unreachable_candidates)
-                    found_unreachable = True
-                    break
+                if random.random() < 0.5:
+                    id1, id2 = start_node_cand, random.choice(unreachable_candidates)
+                else:
+                    id1, id2 = random.choice(unreachable_candidates), start_node_cand
+                found_unreachable = True
             if found_unreachable:
                 outcome = GENERATOR_TARGET_OUTCOME_MAP[target_key]
             else:
@@ -1644,9 +1665,8 @@ class DataGenerator:
                 return None, None, None
         elif target_key is None:
             # Find person owning a tag (even if empty, sum is 0)
-            persons_owning_any_tag = [pid for pid, data in state["persons"].items() if data.get("tags")]
-            if persons_owning_any_tag:
-                person_id = random.choice(persons_owning_any_tag)
+            if state["tag_owners"]:
+                person_id = state["tag_owners"].choice()
                 tag_id = self._get_random_existing_tag_id_for_person(person_id)
                 if tag_id is not None:
                     outcome = OUTCOME_NORMAL
@@ -1676,19 +1696,9 @@ class DataGenerator:
 
     def _generate_message_object_structure(self, msg_id, type_val, social_value, p1_id, p2_id, tag_id, msg_kind,
                                            emoji_id=None, lucky_money=None, article_id=None):
-        """Helper to create the internal message object dictionary."""
-        return {
-            "id": msg_id,
-            "type": type_val,  # 0 for person-to-person, 1 for group
-            "socialValue": social_value,  # Derived or given
-            "person1_id": p1_id,  # Sender
-            "person2_id": p2_id,  # Receiver (if type 0)
-            "tag_id": tag_id,  # Tag ID (if type 1)
-            "msg_kind": msg_kind,  # "ordinary", "emoji", "red_envelope", "forward"
-            "emojiId": emoji_id,  # Specific to EmojiMessage
-            "lucky_money": lucky_money,  # Specific to RedEnvelopeMessage
-            "articleId": article_id,  # Specific to ForwardMessage
-        }
+        """Helper to create the internal Message record."""
+        return Message(msg_id, type_val, social_value, p1_id, p2_id, tag_id, msg_kind,
+                       emojiId=emoji_id, lucky_money=lucky_money, articleId=article_id)
 
     def _generate_add_ordinary_message(self, target_key=None):  # Corresponds to 'am'
         state = self.network_state
@@ -1765,14 +1775,10 @@ class DataGenerator:
         cmd_arg5 = p2_id if msg_type == 0 else tag_id_for_group
         cmd_str = f"am {msg_id} {social_value_param} {msg_type} {p1_id} {cmd_arg5}"
 
-        # The internal message object to be stored
-        internal_msg_obj_params = {
-            "msg_id": msg_id, "type_val": msg_type, "social_value": social_value_param,
-            "p1_id": p1_id, "p2_id": p2_id, "tag_id": tag_id_for_group,
-            "msg_kind": "ordinary"
-        }
-        # Attach the internal object structure to params for _update_state_add_message
-        params["internal_message_object_params"] = internal_msg_obj_params
+        # Attach the internal Message record to params for _update_state_add_message_generic
+        params["internal_message_object_params"] = self._generate_message_object_structure(
+            msg_id, msg_type, social_value_param, p1_id, p2_id, tag_id_for_group, "ordinary"
+        )
 
         return cmd_str, params, outcome
 
@@ -2070,9 +2076,9 @@ class DataGenerator:
             # Find a type 0 message where p1 and p2 are NOT linked
             type0_messages_not_linked = []
             for mid, m_obj in state["messages_map"].items():
-                if m_obj["type"] == 0:
-                    p1 = m_obj["person1_id"]
-                    p2 = m_obj["person2_id"]
+                if m_obj.type == 0:
+                    p1 = m_obj.person1_id
+                    p2 = m_obj.person2_id
                     if p1 and p2 and (min(p1, p2), max(p1, p2)) not in state["relations"]:
                         type0_messages_not_linked.append(mid)
             if not type0_messages_not_linked: return None, None, None
@@ -2083,10 +2089,10 @@ class DataGenerator:
             # Find a type 1 message where p1 does NOT own the tag
             type1_messages_tag_not_owned = []
             for mid, m_obj in state["messages_map"].items():
-                if m_obj["type"] == 1:
-                    p1 = m_obj["person1_id"]
-                    tag = m_obj["tag_id"]
-                    if p1 and tag and (tag not in state["persons"].get(p1, {}).get("tags", set())):
+                if m_obj.type == 1:
+                    p1 = m_obj.person1_id
+                    tag = m_obj.tag_id
+                    if p1 and tag and (p1 not in state["persons"] or tag not in state["persons"][p1].tags):
                         type1_messages_tag_not_owned.append(mid)
             if not type1_messages_tag_not_owned: return None, None, None
             msg_to_send_id = random.choice(type1_messages_tag_not_owned)
@@ -2096,14 +2102,14 @@ class DataGenerator:
             # Find a message that CAN be sent (type 0 linked, or type 1 tag owned)
             sendable_message_ids = []
             for mid, m_obj in state["messages_map"].items():
-                p1 = m_obj["person1_id"]
-                if m_obj["type"] == 0:
-                    p2 = m_obj["person2_id"]
+                p1 = m_obj.person1_id
+                if m_obj.type == 0:
+                    p2 = m_obj.person2_id
                     if p1 and p2 and (min(p1, p2), max(p1, p2)) in state["relations"]:
                         sendable_message_ids.append(mid)
-                elif m_obj["type"] == 1:
-                    tag = m_obj["tag_id"]
-                    if p1 and tag and (tag in state["persons"].get(p1, {}).get("tags", set())):
+                elif m_obj.type == 1:
+                    tag = m_obj.tag_id
+                    if p1 and tag and (p1 in state["persons"] and tag in state["persons"][p1].tags):
                         sendable_message_ids.append(mid)
             if not sendable_message_ids: return None, None, None
             msg_to_send_id = random.choice(sendable_message_ids)
@@ -2246,17 +2252,7 @@ class DataGenerator:
         state = self.network_state
         _id = params["id"]
         if _id not in state["persons"]:  # Should be checked by JML via containsPerson
-            state["persons"][_id] = {
-                "name": params["name"],
-                "age": params["age"],
-                "acquaintances": {},
-                "tags": set(),  # Person owns these tags
-                "money": 0,
-                "socialValue": 0,
-                "messages_received_obj": deque(),
-                "articles_received_ids": deque()
-            }
-            state["couple_sum_dirty"] = True
+            state["persons"][_id] = Person(params["name"], params["age"])
 
     def _update_state_ar(self, params):
         state = self.network_state
@@ -2264,9 +2260,12 @@ class DataGenerator:
         pair = (min(id1, id2), max(id1, id2))
         # Assuming checks for person existence and not already linked are passed (JML)
         if id1 in state["persons"] and id2 in state["persons"] and id1 != id2 and pair not in state["relations"]:
-            state["persons"][id1]["acquaintances"][id2] = value
-            state["persons"][id2]["acquaintances"][id1] = value
+            p1_acq = state["persons"][id1].acquaintances
+            p2_acq = state["persons"][id2].acquaintances
+            p1_acq[id2] = value
+            p2_acq[id1] = value
             state["relations"][pair] = value
+            state["paths"].edge_added(id1, id2)
 
             # Efficiently update triple_sum (copied from _generate_ln, adjust for single edge)
             # This logic is complex and error-prone, ensure it matches JML's definition.
@@ -2275,12 +2274,10 @@ class DataGenerator:
             # Let's defer full recalculation and just mark dirty. A full qts will do it.
             # For a more precise update:
             new_triangles = 0
-            p1_acq = set(state["persons"][id1]["acquaintances"].keys()) - {id2}
-            p2_acq = set(state["persons"][id2]["acquaintances"].keys()) - {id1}
-            common_neighbors_of_new_pair = p1_acq.intersection(p2_acq)
+            common_neighbors_of_new_pair = (p1_acq.keys() - {id2}) & (p2_acq.keys() - {id1})
             new_triangles += len(common_neighbors_of_new_pair)
             state["triple_sum"] += new_triangles
-            state["couple_sum_dirty"] = True
+            state["best_acquaintances"].relation_changed(id1, id2)
 
     def _update_state_mr(self, params):
         state = self.network_state
@@ -2290,57 +2287,65 @@ class DataGenerator:
         if pair in state["relations"]:
             old_value = state["relations"][pair]
             new_value = old_value + m_val
+            p1_acq = state["persons"][id1].acquaintances
+            p2_acq = state["persons"][id2].acquaintances
 
             # Triple sum adjustment before relation change/removal
             triangles_involving_edge = 0
             if old_value > 0:  # If it was an actual edge
-                p1_acq_old = set(state["persons"][id1]["acquaintances"].keys()) - {id2}
-                p2_acq_old = set(state["persons"][id2]["acquaintances"].keys()) - {id1}
-                common_neighbors_old = p1_acq_old.intersection(p2_acq_old)
+                common_neighbors_old = (p1_acq.keys() - {id2}) & (p2_acq.keys() - {id1})
                 triangles_involving_edge = len(common_neighbors_old)
 
             if new_value > 0:
-                state["persons"][id1]["acquaintances"][id2] = new_value
-                state["persons"][id2]["acquaintances"][id1] = new_value
+                p1_acq[id2] = new_value
+                p2_acq[id1] = new_value
                 state["relations"][pair] = new_value
                 # Triple sum doesn't change if value changes but edge remains.
             else:  # Relation removed
-                del state["persons"][id1]["acquaintances"][id2]
-                del state["persons"][id2]["acquaintances"][id1]
+                del p1_acq[id2]
+                del p2_acq[id1]
                 del state["relations"][pair]
+                state["paths"].edge_removed(id1, id2)
                 state["triple_sum"] -= triangles_involving_edge  # Subtract lost triangles
 
                 # Side effect: remove from tags as per JML
                 # This is complex as it involves iterating tags of id1 and id2.
                 # For id1's tags: if id2 was in any of id1.tag[k], remove id2.
                 # For id2's tags: if id1 was in any of id2.tag[k], remove id1.
-                for tag_owner_id, tag_to_check_id, person_to_remove_from_tag in [(id1, id2), (id2, id1)]:
-                    owner_tags = state["persons"][tag_owner_id].get("tags", set())
-                    for owned_tag_id in list(owner_tags):  # Iterate copy if modifying
-                        tag_key = (tag_owner_id, owned_tag_id)
-                        if tag_key in state["person_tags"]:
-                            if person_to_remove_from_tag in state["person_tags"][tag_key]:
-                                del state["person_tags"][tag_key][person_to_remove_from_tag]
-            state["couple_sum_dirty"] = True
+                # member_tags lets us visit only the tags that actually contain the other endpoint.
+                for tag_owner_id, person_to_remove_from_tag in [(id1, id2), (id2, id1)]:
+                    affected_tags = [tag_key for tag_key in state["member_tags"].get(person_to_remove_from_tag, ())
+                                     if tag_key[0] == tag_owner_id]
+                    for tag_key in affected_tags:
+                        self._remove_tag_member(tag_key, person_to_remove_from_tag)
+            state["best_acquaintances"].relation_changed(id1, id2)
 
     def _update_state_at(self, params):  # Add Tag to person
         state = self.network_state
         person_id, tag_id = params["person_id"], params["tag_id"]
         # Assuming person exists and doesn't already have this tag (JML checks)
         if person_id in state["persons"]:
-            state["persons"][person_id].setdefault("tags", set()).add(tag_id)
+            state["persons"][person_id].tags.add(tag_id)
+            state["tag_owners"].add(person_id)
             state["person_tags"][(person_id, tag_id)] = {}  # Initialize empty member list for this new tag instance
+            state["nonfull_tags"].add((person_id, tag_id))
 
     def _update_state_dt(self, params):  # Delete Tag from person
         state = self.network_state
         person_id, tag_id = params["person_id"], params["tag_id"]
         # Assuming person exists and has this tag (JML checks)
-        if person_id in state["persons"] and "tags" in state["persons"][person_id]:
-            state["persons"][person_id]["tags"].discard(tag_id)
-            if not state["persons"][person_id]["tags"]:  # if set becomes empty
-                del state["persons"][person_id]["tags"]
-        if (person_id, tag_id) in state["person_tags"]:
-            del state["person_tags"][(person_id, tag_id)]  # Remove member list too
+        if person_id in state["persons"]:
+            owner_tags = state["persons"][person_id].tags
+            owner_tags.discard(tag_id)
+            if not owner_tags:
+                state["tag_owners"].discard(person_id)
+        tag_key = (person_id, tag_id)
+        if tag_key in state["person_tags"]:
+            for member_id in state["person_tags"][tag_key]:
+                state["member_tags"][member_id].discard(tag_key)
+            del state["person_tags"][tag_key]  # Remove member list too
+            state["nonempty_tags"].discard(tag_key)
+            state["nonfull_tags"].discard(tag_key)
 
     def _update_state_att(self, params):  # Add Person To Tag
         state = self.network_state
@@ -2348,8 +2353,12 @@ class DataGenerator:
         tag_key = (id2, tag_id)
         # Assuming JML checks passed (p1,p2 exist, p1!=p2, linked, p2 has tag, p1 not in tag, tag not full)
         if tag_key in state["person_tags"]:  # Ensure tag instance exists
-            p1_age = state["persons"][id1]["age"]
-            state["person_tags"][tag_key][id1] = p1_age
+            members = state["person_tags"][tag_key]
+            members[id1] = state["persons"][id1].age
+            state["member_tags"][id1].add(tag_key)
+            state["nonempty_tags"].add(tag_key)
+            if len(members) >= TAG_PERSONS_LIMIT:
+                state["nonfull_tags"].discard(tag_key)
 
     def _update_state_dft(self, params):  # Delete Person From Tag
         state = self.network_state
@@ -2357,18 +2366,27 @@ class DataGenerator:
         tag_key = (id2, tag_id)
         # Assuming JML checks passed (p1,p2 exist, p2 has tag, p1 in tag)
         if tag_key in state["person_tags"] and id1 in state["person_tags"][tag_key]:
-            del state["person_tags"][tag_key][id1]
+            self._remove_tag_member(tag_key, id1)
+
+    def _remove_tag_member(self, tag_key, member_id):
+        """Drops member_id from tag instance tag_key and keeps the tag indexes in sync."""
+        state = self.network_state
+        members = state["person_tags"][tag_key]
+        del members[member_id]
+        state["member_tags"][member_id].discard(tag_key)
+        if not members:
+            state["nonempty_tags"].discard(tag_key)
+        if len(members) < TAG_PERSONS_LIMIT:
+            state["nonfull_tags"].add(tag_key)
 
     def _update_state_coa(self, params):
         state = self.network_state
         person_id, account_id, account_name = params["person_id"], params["account_id"], params["account_name"]
         # Assuming JML checks passed
         if person_id in state["persons"] and account_id not in state["accounts"]:
-            state["accounts"][account_id] = {
-                "owner_id": person_id, "name": account_name,
-                "followers": {person_id: 0},  # Owner is initial follower with 0 contributions
-                "articles": set()
-            }
+            # Owner is initial follower with 0 contributions
+            state["accounts"][account_id] = OfficialAccount(person_id, account_name, followers={person_id: 0})
+            state["accounts_with_followers"] += 1
             # couple_sum not affected by account creation directly
 
     def _update_state_doa(self, params):
@@ -2376,23 +2394,25 @@ class DataGenerator:
         person_id, account_id = params["person_id"], params["account_id"]
         # Assuming JML checks passed
         if account_id in state["accounts"]:  # And owner is person_id
+            if state["accounts"][account_id].followers:
+                state["accounts_with_followers"] -= 1
             del state["accounts"][account_id]
-            state["couple_sum_dirty"] = True  # Might affect couple sum if official accounts were part of it
 
     def _update_state_ca(self, params):  # Contribute Article
         state = self.network_state
         person_id, account_id, article_id = params["person_id"], params["account_id"], params["article_id"]
         # Assuming JML checks passed
-        if account_id in state["accounts"] and person_id in state["accounts"][account_id]["followers"]:
+        if account_id in state["accounts"] and person_id in state["accounts"][account_id].followers:
             acc_data = state["accounts"][account_id]
-            acc_data["articles"].add(article_id)
+            acc_data.articles.add(article_id)
             state["articles_map"][article_id] = person_id  # person_id is the contributor for this article
-            acc_data["followers"][person_id] = acc_data["followers"].get(person_id, 0) + 1
+            acc_data.followers[person_id] = acc_data.followers.get(person_id, 0) + 1
 
             # Add article to received list of ALL followers of this account
-            for follower_pid in acc_data["followers"].keys():
-                if follower_pid in state["persons"]:
-                    state["persons"][follower_pid]["articles_received_ids"].appendleft(article_id)
+            persons = state["persons"]
+            for follower_pid in acc_data.followers:
+                if follower_pid in persons:
+                    persons[follower_pid].articles_received_ids.appendleft(article_id)
                     # JML for Person.getReceivedArticles() does not impose a strict limit on size of internal list
                     # The queryReceivedArticles() method returns only top 5.
 
@@ -2400,36 +2420,38 @@ class DataGenerator:
         state = self.network_state
         person_id, account_id, article_id = params["person_id"], params["account_id"], params["article_id"]
         # Assuming JML checks passed (person is owner, account has article)
-        if account_id in state["accounts"] and article_id in state["accounts"][account_id]["articles"]:
+        if account_id in state["accounts"] and article_id in state["accounts"][account_id].articles:
             acc_data = state["accounts"][account_id]
             original_contributor_id = state["articles_map"].get(article_id)  # Get who originally contributed it
 
-            acc_data["articles"].discard(article_id)
+            acc_data.articles.discard(article_id)
             if article_id in state["articles_map"]:
                 del state["articles_map"][article_id]
 
-            if original_contributor_id is not None and original_contributor_id in acc_data["followers"]:
-                acc_data["followers"][original_contributor_id] -= 1
-                if acc_data["followers"][original_contributor_id] < 0:  # Should not happen
-                    acc_data["followers"][original_contributor_id] = 0
+            followers = acc_data.followers
+            if original_contributor_id is not None and original_contributor_id in followers:
+                followers[original_contributor_id] -= 1
+                if followers[original_contributor_id] < 0:  # Should not happen
+                    followers[original_contributor_id] = 0
 
             # Remove from all followers' received lists
-            for follower_pid in acc_data["followers"].keys():
-                if follower_pid in state["persons"] and "articles_received_ids" in state["persons"][follower_pid]:
+            persons = state["persons"]
+            for follower_pid in followers:
+                follower = persons.get(follower_pid)
+                if follower is not None and article_id in follower.articles_received_ids:
                     # Remove ALL occurrences, as JML implies it's gone
-                    new_deque = deque()
-                    for item in state["persons"][follower_pid]["articles_received_ids"]:
-                        if item != article_id:
-                            new_deque.append(item)
-                    state["persons"][follower_pid]["articles_received_ids"] = new_deque
+                    follower.articles_received_ids = deque(
+                        item for item in follower.articles_received_ids if item != article_id)
 
     def _update_state_foa(self, params):  # Follow Official Account
         state = self.network_state
         person_id, account_id = params["person_id"], params["account_id"]
         # Assuming JML checks passed
         if account_id in state["accounts"] and person_id in state["persons"]:
-            state["accounts"]["account_id"].setdefault("followers", {})[person_id] = 0 # New follower, 0 contributions
-            state["couple_sum_dirty"] = True  # Follow actions might affect couple sum if it considers official accounts
+            followers = state["accounts"][account_id].followers
+            if not followers:
+                state["accounts_with_followers"] += 1
+            followers.setdefault(person_id, 0)  # New follower, 0 contributions
 
             # --- END OF HW10 STATE UPDATERS (placeholder) ---
 
@@ -2438,25 +2460,12 @@ class DataGenerator:
     def _update_state_add_message_generic(self, internal_msg_params):
         """Generic helper for adding any message type to network_state.messages_map."""
         state = self.network_state
-        msg_id = internal_msg_params["msg_id"]
         # Assumes JML pre-conditions for addMessage are met by the generator
         # (e.g., msg_id not exists, emojiId exists if EmojiMsg, articleId valid if ForwardMsg)
-
-        # Construct the message object to store
-        # This uses the simplified structure we defined.
-        # If a more complex object simulation is needed, this would change.
-        message_to_store = self._generate_message_object_structure(
-            msg_id,
-            internal_msg_params["type_val"],
-            internal_msg_params["social_value"],
-            internal_msg_params["p1_id"],
-            internal_msg_params.get("p2_id"),  # Might be None
-            internal_msg_params.get("tag_id"),  # Might be None
-            internal_msg_params["msg_kind"],
-            internal_msg_params.get("emojiId"),
-            internal_msg_params.get("lucky_money"),
-            internal_msg_params.get("articleId")
-        )
+        # Every add-message generator already builds the Message record via
+        # _generate_message_object_structure, so it is stored as-is.
+        message_to_store = internal_msg_params
+        msg_id = message_to_store.id
         state["messages_map"][msg_id] = message_to_store
         state["all_message_ids_ever_used"].add(msg_id)
 
@@ -2468,73 +2477,73 @@ class DataGenerator:
         if msg_id_to_send not in state["messages_map"]: return  # Should not happen if JML met
 
         msg_obj = state["messages_map"][msg_id_to_send]
-        sender_id = msg_obj["person1_id"]
+        sender_id = msg_obj.person1_id
         sender_data = state["persons"].get(sender_id)
         if not sender_data: return  # Should not happen
 
         # Increment sender's social value
-        sender_data["socialValue"] += msg_obj["socialValue"]
+        sender_data.socialValue += msg_obj.socialValue
 
         # Handle money for sender if RedEnvelope
-        if msg_obj["msg_kind"] == "red_envelope":
-            total_red_envelope_money = msg_obj["lucky_money"]
+        if msg_obj.msg_kind == "red_envelope":
+            total_red_envelope_money = msg_obj.lucky_money
             money_deducted_from_sender = 0
-            if msg_obj["type"] == 0:  # person-to-person
+            if msg_obj.type == 0:  # person-to-person
                 money_deducted_from_sender = total_red_envelope_money
-            elif msg_obj["type"] == 1:  # group
+            elif msg_obj.type == 1:  # group
                 tag_owner_id = sender_id  # Sender is the tag owner for group messages
-                tag_id = msg_obj["tag_id"]
+                tag_id = msg_obj.tag_id
                 tag_members_map = state["person_tags"].get((tag_owner_id, tag_id), {})
                 num_tag_members = len(tag_members_map)
                 if num_tag_members > 0:
                     money_per_member = total_red_envelope_money // num_tag_members
                     money_deducted_from_sender = money_per_member * num_tag_members
-            sender_data["money"] -= money_deducted_from_sender
+            sender_data.money -= money_deducted_from_sender
 
         # Distribute to receivers
-        receivers_data_list = []  # List of (person_data_dict, money_to_add, article_to_add)
+        receivers_data_list = []  # List of (Person, money_to_add, article_to_add)
 
-        if msg_obj["type"] == 0:  # Person-to-person
-            receiver_id = msg_obj["person2_id"]
+        if msg_obj.type == 0:  # Person-to-person
+            receiver_id = msg_obj.person2_id
             if receiver_id and receiver_id in state["persons"]:
                 receiver_data = state["persons"][receiver_id]
-                money_to_add_p2p = msg_obj["lucky_money"] if msg_obj["msg_kind"] == "red_envelope" else 0
-                article_to_add_p2p = msg_obj["articleId"] if msg_obj["msg_kind"] == "forward" else None
+                money_to_add_p2p = msg_obj.lucky_money if msg_obj.msg_kind == "red_envelope" else 0
+                article_to_add_p2p = msg_obj.articleId if msg_obj.msg_kind == "forward" else None
                 receivers_data_list.append((receiver_data, money_to_add_p2p, article_to_add_p2p))
 
-        elif msg_obj["type"] == 1:  # Group message
+        elif msg_obj.type == 1:  # Group message
             tag_owner_id = sender_id  # In our model, sender is the tag owner
-            tag_id = msg_obj["tag_id"]
+            tag_id = msg_obj.tag_id
             tag_key = (tag_owner_id, tag_id)
             members_in_tag_map = state["person_tags"].get(tag_key, {})
 
             money_per_member_group = 0
-            if msg_obj["msg_kind"] == "red_envelope" and len(members_in_tag_map) > 0:
-                money_per_member_group = msg_obj["lucky_money"] // len(members_in_tag_map)
+            if msg_obj.msg_kind == "red_envelope" and len(members_in_tag_map) > 0:
+                money_per_member_group = msg_obj.lucky_money // len(members_in_tag_map)
 
             for member_id in members_in_tag_map.keys():
                 if member_id in state["persons"]:
                     member_data = state["persons"][member_id]
-                    article_to_add_group = msg_obj["articleId"] if msg_obj["msg_kind"] == "forward" else None
+                    article_to_add_group = msg_obj.articleId if msg_obj.msg_kind == "forward" else None
                     receivers_data_list.append((member_data, money_per_member_group, article_to_add_group))
 
         # Apply updates to receivers
         for receiver_data, money_to_add, article_to_add in receivers_data_list:
-            receiver_data["socialValue"] += msg_obj["socialValue"]
+            receiver_data.socialValue += msg_obj.socialValue
             if money_to_add > 0:
-                receiver_data["money"] += money_to_add
+                receiver_data.money += money_to_add
 
             # Add message to receiver's message list (Person.messages in JML)
-            receiver_data["messages_received_obj"].appendleft(msg_obj)  # Add to front
+            receiver_data.messages_received_obj.appendleft(msg_obj)  # Add to front
             # JML for Person.getReceivedMessages (query) limits to 5, but internal list can be larger.
 
             if article_to_add is not None:  # Forward message
-                receiver_data["articles_received_ids"].appendleft(article_to_add)
+                receiver_data.articles_received_ids.appendleft(article_to_add)
                 # JML for Person.getReceivedArticles (query) limits to 5.
 
         # Handle Emoji Heat List
-        if msg_obj["msg_kind"] == "emoji":
-            emoji_id_sent = msg_obj["emojiId"]
+        if msg_obj.msg_kind == "emoji":
+            emoji_id_sent = msg_obj.emojiId
             try:
                 idx = state["emoji_id_list"].index(emoji_id_sent)
                 state["emoji_heat_list"][idx] += 1
@@ -2573,16 +2582,282 @@ class DataGenerator:
         # Filter messages map
         # JML: ensures messages.length == (\num_of ... if EmojiMessage => containsEmojiId(updated_list)...)
         # This means remove EmojiMessages whose emojiId is no longer in the updated emoji_id_list.
+        kept_emoji_ids = set(new_emoji_id_list)
         messages_to_delete_ids = []
         for msg_id, msg_obj in state["messages_map"].items():
-            if msg_obj["msg_kind"] == "emoji":
-                if msg_obj["emojiId"] not in state["emoji_id_list"]:
+            if msg_obj.msg_kind == "emoji":
+                if msg_obj.emojiId not in kept_emoji_ids:
                     messages_to_delete_ids.append(msg_id)
 
         for msg_id_del in messages_to_delete_ids:
             if msg_id_del in state["messages_map"]:  # Check again before del
                 del state["messages_map"][msg_id_del]
 
+    # --- Stress Profiles (--stress): one hot path pushed to its worst case within the mode's limits ---
+    def _stress_room(self):
+        """Instructions left before either the logical target or the line cap (ln counts all its lines) is hit."""
+        return min(self.target_instructions - self.instructions_generated,
+                   self.max_instr_limit - len(self.generated_lines))
+
+    def _stress_command(self, cmd_str, params=None):
+        # Profiles only build commands whose preconditions hold, so they go through the normal-outcome path
+        alias = cmd_str.split(' ', 1)[0]
+        update_method = self._ALIAS_TO_UPDATE_METHOD_MAP.get(alias)
+        if update_method and params is not None:
+            update_method(self, params)
+        self.commands_successfully_generated.add(alias)
+        self._emit(cmd_str)
+        self.instructions_generated += 1
+
+    def _stress_new_ids(self, kind, count):
+        start = self._stress_next_ids[kind]
+        self._stress_next_ids[kind] += count
+        return list(range(start, start + count))
+
+    def _stress_add_person(self):
+        _id = self._stress_new_ids("person", 1)[0]
+        name, age = self._generate_random_name(), self._generate_random_age()
+        self._stress_command(f"ap {_id} {name} {age}", {"id": _id, "name": name, "age": age})
+        return _id
+
+    def _stress_link(self, id1, id2, value=None):
+        value = value or self._generate_random_value()
+        self._stress_command(f"ar {id1} {id2} {value}", {"id1": id1, "id2": id2, "value": value})
+
+    def _emit_ln(self, ids, edges):
+        self._emit(self._load_ln(ids, edges))
+        self.instructions_generated += 1
+
+    def _load_ln(self, ids, edges):
+        """`ln` text for fresh persons `ids` with relations edges {(i, j): value} (i > j, indexes into ids); loads
+        them into the state like a sequence of ap/ar would."""
+        state = self.network_state
+        names = [self._generate_random_name() for _ in ids]
+        ages = [self._generate_random_age() for _ in ids]
+        rows = [[0] * i for i in range(1, len(ids))]  # rows[i - 1][j] = value between ids[i] and ids[j]
+        for (i, j), value in edges.items():
+            rows[i - 1][j] = value
+        lines = [f"ln {len(ids)}", " ".join(map(str, ids)), " ".join(names), " ".join(map(str, ages))]
+        lines.extend(" ".join(map(str, row)) for row in rows)
+        for _id, name, age in zip(ids, names, ages):
+            state["persons"][_id] = Person(name, age)
+        for (i, j), value in edges.items():
+            id1, id2 = ids[i], ids[j]
+            state["persons"][id1].acquaintances[id2] = value
+            state["persons"][id2].acquaintances[id1] = value
+            state["relations"][(min(id1, id2), max(id1, id2))] = value
+        state["paths"].clear()
+        state["best_acquaintances"].rebuild()
+        # Acquaintance sets as bitmasks; every triangle is seen once from each of its three edges
+        bits = {person_id: 1 << k for k, person_id in enumerate(state["persons"])}
+        masks = {person_id: sum(bits[other] for other in person.acquaintances)
+                 for person_id, person in state["persons"].items()}
+        state["triple_sum"] = sum((masks[a] & masks[b]).bit_count() for a, b in state["relations"]) // 3
+        return "\n".join(lines)
+
+    def _stress_build_tag(self, share):
+        """ln star around one owner (the other persons also linked among themselves), one tag on the owner and
+        as many members as `share` of the remaining budget buys, up to TAG_PERSONS_LIMIT."""
+        state = self.network_state
+        ids = self._stress_new_ids("person", self.max_n_load_limit)
+        owner = ids[0]
+        edges = {(i, 0): self._generate_random_value() for i in range(1, len(ids))}
+        edges.update({(i, j): self._generate_random_value()
+                      for i in range(2, len(ids)) for j in range(1, i) if random.random() < 0.3})
+        self._emit_ln(ids, edges)
+        tag_id = self._stress_new_ids("tag", 1)[0]
+        self._stress_command(f"at {owner} {tag_id}", {"person_id": owner, "tag_id": tag_id})
+        members = state["person_tags"][(owner, tag_id)]
+        budget = int(self._stress_room() * share)
+        for person_id in ids[1:]:
+            if len(members) >= TAG_PERSONS_LIMIT or budget < 1:
+                break
+            self._stress_command(f"att {person_id} {owner} {tag_id}", {"id1": person_id, "id2": owner, "tag_id": tag_id})
+            budget -= 1
+        while len(members) < TAG_PERSONS_LIMIT and budget >= 4:  # ap, ar to owner, ar to a member, att
+            other = random.choice(list(members))
+            person_id = self._stress_add_person()
+            self._stress_link(person_id, owner)
+            self._stress_link(person_id, other)
+            self._stress_command(f"att {person_id} {owner} {tag_id}", {"id1": person_id, "id2": owner, "tag_id": tag_id})
+            budget -= 4
+        return owner, tag_id
+
+    def _stress_qsp_chain(self):
+        """qsp/qci between the two ends of one long path, so every query is a full-length search; every few
+        queries a link is cut by mr and restored by ar, which invalidates cached distances."""
+        state = self.network_state
+        chain = self._stress_new_ids("person", self.max_n_load_limit)
+        self._emit_ln(chain, {(i, i - 1): self._generate_random_value() for i in range(1, len(chain))})
+        for _ in range(self._stress_room() * 3 // 20):  # 30% of the budget grows the chain (ap + ar per link)
+            person_id = self._stress_add_person()
+            self._stress_link(chain[-1], person_id)
+            chain.append(person_id)
+        step = 0
+        while self._stress_room() >= 2:
+            step += 1
+            if step % 8 == 0:
+                k = random.randrange(1, len(chain))
+                id1, id2 = chain[k - 1], chain[k]
+                m_val = -state["relations"][(min(id1, id2), max(id1, id2))]
+                self._stress_command(f"mr {id1} {id2} {m_val}", {"id1": id1, "id2": id2, "m_val": m_val})
+                self._stress_link(id1, id2)
+                continue
+            spread = max(1, len(chain) // 20)
+            head, tail = chain[random.randrange(spread)], chain[-1 - random.randrange(spread)]
+            self._stress_command(f"{'qci' if step % 4 == 0 else 'qsp'} {head} {tail}")
+
+    def _stress_tag_full(self):
+        """qtvs/qtav on a tag filled towards TAG_PERSONS_LIMIT with densely linked members; members leave and rejoin
+        (dft/att) and member relations change (mr) between queries, so cached sums go stale."""
+        state = self.network_state
+        owner, tag_id = self._stress_build_tag(0.45)
+        members = state["person_tags"][(owner, tag_id)]
+        step = 0
+        while self._stress_room() >= 2:
+            step += 1
+            if step % 10 == 0 and members:
+                person_id = random.choice(list(members))
+                self._stress_command(f"dft {person_id} {owner} {tag_id}", {"id1": person_id, "id2": owner, "tag_id": tag_id})
+                self._stress_command(f"att {person_id} {owner} {tag_id}", {"id1": person_id, "id2": owner, "tag_id": tag_id})
+            elif step % 10 == 5 and members:
+                id1 = random.choice(list(members))
+                in_tag = [other for other in state["persons"][id1].acquaintances if other in members]
+                id2 = random.choice(in_tag) if in_tag else owner
+                m_val = random.randint(1, MVAL_RANGE[1])  # Positive: the relation (and membership) stays
+                self._stress_command(f"mr {id1} {id2} {m_val}", {"id1": id1, "id2": id2, "m_val": m_val})
+            else:
+                self._stress_command(f"{'qtav' if step % 3 == 0 else 'qtvs'} {owner} {tag_id}")
+
+    def _stress_mr_churn(self):
+        """Dense graph under constant mr churn (value shifts, ties on the best value, removals re-added by ar),
+        each change followed by qba on the touched person or qcs."""
+        state = self.network_state
+        ids = self._stress_new_ids("person", self.max_n_load_limit)
+        self._emit_ln(ids, {(i, j): self._generate_random_value()
+                            for i in range(1, len(ids)) for j in range(i) if random.random() < 0.5})
+        pairs = IndexedSet(state["relations"])
+        touched = ids[0]
+        step = 0
+        while self._stress_room() >= 1:
+            step += 1
+            if step % 2:
+                if len(pairs) < len(ids) or random.random() < 0.1:
+                    for _ in range(20):
+                        id1, id2 = random.sample(ids, 2)
+                        if (min(id1, id2), max(id1, id2)) not in pairs:
+                            self._stress_link(id1, id2)
+                            pairs.add((min(id1, id2), max(id1, id2)))
+                            touched = id1
+                            break
+                    continue
+                id1, id2 = pairs.choice()
+                if random.random() < 0.5:
+                    id1, id2 = id2, id1
+                value = state["relations"][(min(id1, id2), max(id1, id2))]
+                best_value = state["best_acquaintances"].best_value(id1)
+                roll = random.random()
+                if roll < 0.2:
+                    m_val = -value  # Remove
+                elif roll < 0.45 and best_value and best_value != value:
+                    m_val = best_value - value  # Tie with the current best
+                else:
+                    m_val = random.randint(1 - value, MVAL_RANGE[1])  # Shift, relation stays
+                if not MVAL_RANGE[0] <= m_val <= MVAL_RANGE[1]:
+                    m_val = 1
+                self._stress_command(f"mr {id1} {id2} {m_val}", {"id1": id1, "id2": id2, "m_val": m_val})
+                if value + m_val <= 0:
+                    pairs.discard((min(id1, id2), max(id1, id2)))
+                touched = id1
+            elif step % 4 == 2 and state["persons"][touched].acquaintances:
+                self._stress_command(f"qba {touched}")
+            else:
+                self._stress_command("qcs")
+
+    def _stress_emoji_flood(self):
+        """Thousands of stored emojis (a few hot, most cold) and many pending emoji messages; dce mostly scans
+        everything and deletes nothing, and twice deletes the cold majority at once (restocked the first time)."""
+        state = self.network_state
+        ids = self._stress_new_ids("person", min(self.max_n_load_limit, 20))
+        hub = ids[0]
+        self._emit_ln(ids, {(i, 0): self._generate_random_value() for i in range(1, len(ids))})
+
+        def store(count):
+            for emoji_id in self._stress_new_ids("emoji", count):
+                self._stress_command(f"sei {emoji_id}", {"id": emoji_id})
+
+        def add_message(emoji_id):
+            msg_id = self._stress_new_ids("message", 1)[0]
+            p1, p2 = random.sample([hub, random.choice(ids[1:])], 2)
+            self._stress_command(f"aem {msg_id} {emoji_id} 0 {p1} {p2}", self._generate_message_object_structure(
+                msg_id, 0, emoji_id, p1, p2, None, "emoji", emoji_id=emoji_id))
+            return msg_id
+
+        store(self._stress_room() * 2 // 5)
+        hot = random.sample(state["emoji_id_list"], max(1, len(state["emoji_id_list"]) // 20))
+        for _ in range(self._stress_room() // 10):  # Heat for the hot emojis: aem + sm
+            msg_id = add_message(random.choice(hot))
+            self._stress_command(f"sm {msg_id}", {"id": msg_id})
+        for _ in range(self._stress_room() // 8):  # Pending messages on cold emojis, dropped with them by dce
+            add_message(random.choice(state["emoji_id_list"]))
+        halfway = self._stress_room() // 2
+        step = 0
+        while self._stress_room() >= 1:
+            step += 1
+            if step == halfway or self._stress_room() == 1:  # Mass deletion (restocked the first time)
+                before = len(state["emoji_id_list"])
+                self._stress_command("dce 1", {"limit": 1})
+                hot = [emoji_id for emoji_id, heat in zip(state["emoji_id_list"], state["emoji_heat_list"]) if heat]
+                store(min(before - len(state["emoji_id_list"]), self._stress_room() // 3))
+            elif step % 3 == 0:
+                self._stress_command(f"qp {random.choice(hot)}")
+            else:
+                limit = random.randint(LIMIT_RANGE_DCE[0], 0)  # Heat is never negative: nothing is deleted
+                self._stress_command(f"dce {limit}", {"limit": limit})
+
+    def _stress_sm_fanout(self):
+        """Group messages (ordinary, red envelope, emoji) sent to a tag filled towards TAG_PERSONS_LIMIT, so every sm
+        reaches every member; members' received lists keep growing, with qrm/qsv/qm on random members."""
+        state = self.network_state
+        owner, tag_id = self._stress_build_tag(0.35)
+        members = state["person_tags"][(owner, tag_id)]
+        emoji_ids = self._stress_new_ids("emoji", 5)
+        for emoji_id in emoji_ids:
+            self._stress_command(f"sei {emoji_id}", {"id": emoji_id})
+        step = 0
+        while self._stress_room() >= 2:
+            step += 1
+            if step % 10 == 0 and members:
+                person_id = random.choice(list(members))
+                self._stress_command(f"{random.choice(('qrm', 'qsv', 'qm'))} {person_id}")
+                continue
+            msg_id = self._stress_new_ids("message", 1)[0]
+            kind = step % 3
+            if kind == 0:
+                money = self._generate_random_money_for_red_envelope()
+                cmd_str = f"arem {msg_id} {money} 1 {owner} {tag_id}"
+                message = self._generate_message_object_structure(msg_id, 1, money * 5, owner, None, tag_id,
+                                                                  "red_envelope", lucky_money=money)
+            elif kind == 1:
+                emoji_id = random.choice(emoji_ids)
+                cmd_str = f"aem {msg_id} {emoji_id} 1 {owner} {tag_id}"
+                message = self._generate_message_object_structure(msg_id, 1, emoji_id, owner, None, tag_id, "emoji",
+                                                                  emoji_id=emoji_id)
+            else:
+                social_value = self._generate_random_social_value()
+                cmd_str = f"am {msg_id} {social_value} 1 {owner} {tag_id}"
+                message = self._generate_message_object_structure(msg_id, 1, social_value, owner, None, tag_id,
+                                                                  "ordinary")
+            self._stress_command(cmd_str, message)
+            self._stress_command(f"sm {msg_id}", {"id": msg_id})
+
+    def generate_stress(self):
+        self._initialize_state()
+        self._stress_next_ids = {"person": ID_POOL_RANGE[0], "tag": TAG_ID_POOL_RANGE[0],
+                                 "message": MESSAGE_ID_POOL_RANGE[0], "emoji": EMOJI_ID_POOL_RANGE[0]}
+        self._STRESS_PROFILE_METHODS[self.stress_profile](self)
+        return [str(line) for line in self.generated_lines if line is not None]
+
     _COMMAND_GENERATOR_METHODS = {
         "ap": _generate_ap, "ar": _generate_ar, "mr": _generate_mr,
         "at": _generate_at, "dt": _generate_dt, "att": _generate_att,
@@ -2624,6 +2899,14 @@ class DataGenerator:
         # Queries and ln do not have separate update methods here
     }
 
+    _STRESS_PROFILE_METHODS = {
+        "qsp_chain": _stress_qsp_chain,
+        "tag_full": _stress_tag_full,
+        "mr_churn": _stress_mr_churn,
+        "emoji_flood": _stress_emoji_flood,
+        "sm_fanout": _stress_sm_fanout,
+    }
+
     _STATE_UPDATE_METHODS = {
         INSTRUCTION_MAP.get(alias): method
         for alias, method in _ALIAS_TO_UPDATE_METHOD_MAP.items()
@@ -2646,13 +2929,33 @@ class DataGenerator:
             self.phase_instruction_count = 0
         self.phase_instruction_count += 1
 
+    def _emit(self, cmd_str, outcome=OUTCOME_NORMAL):
+        """Appends a (possibly multi-line) command and, when co-generating, its expected output line as computed
+        by self.answer_network (a separate simulation of the same command, not a read of network_state)."""
+        lines = cmd_str.strip().split('\n')
+        first_line = len(self.generated_lines) + 1
+        self.generated_lines.extend(lines)
+        # Every command prints exactly one output line, so command k describes output line k.
+        self.command_marks.append((len(self.generated_lines), first_line, lines[0].split(' ', 1)[0],
+                                   EXCEPTION_ABBREVIATIONS.get(outcome, OUTCOME_NORMAL)))
+        if self.answer_network is None:
+            return
+        for answer in run_lines(lines, self.answer_network):
+            self.answer_marks.append((len(self.generated_lines), answer))
+            abbr = exception_abbreviation(answer)
+            if outcome == OUTCOME_NORMAL:
+                intent_ok = abbr is None
+            else:
+                intent_ok = abbr is not None and abbr == EXCEPTION_ABBREVIATIONS.get(outcome)
+            if not intent_ok:
+                self.intent_mismatches.append((lines[0], outcome, answer))
+
     def generate_load_network(self):  # Unchanged from previous logic for ln
         if self.instructions_generated > 0: return 0
         result = self._generate_ln(target_key=None)
         if result and result[0] is not None:
             cmd_str, _, _ = result
-            lines = cmd_str.strip().split('\n')
-            self.generated_lines.extend(lines)
+            self._emit(cmd_str)
             # State update for ln is handled *within* _generate_ln
             # print(f"Generated load_network (first line: {lines[0]}). State updated IN GENERATOR.")
             return 1
@@ -2662,7 +2965,7 @@ class DataGenerator:
             ids = [1, 2];
             names = ["p1", "p2"];
             ages = [20, 30]
-            self.generated_lines.extend([f"ln {n}", " ".join(map(str, ids)), " ".join(names), " ".join(map(str, ages))])
+            self._emit("\n".join([f"ln {n}", " ".join(map(str, ids)), " ".join(names), " ".join(map(str, ages))]))
             self._update_state_ap({"id": 1, "name": "p1", "age": 20})
             self._update_state_ap({"id": 2, "name": "p2", "age": 30})
             print("Warning: _generate_ln failed, generated minimal fallback ln.")
@@ -2724,8 +3027,55 @@ class DataGenerator:
             if outcome != expected_exc_name:
                 pass  # print(f"Warning: Gen for {target_key} produced '{outcome}' vs map '{expected_exc_name}'", file=sys.stderr)
             if target_key: self.exceptions_attempted.add(target_key)
+        self._last_outcome = outcome
         return cmd_str
 
+    def _pruning_signature(self):
+        """O(1) summary of which command groups can currently run (None = no persons yet)."""
+        state = self.network_state
+        num_persons = len(state["persons"])
+        if not num_persons:
+            return None
+        has_tag_owner = len(state["tag_owners"]) > 0
+        # sm type 0 is still possible without tags, so keep it half of the time (same coin as before)
+        allow_sm = has_tag_owner or random.random() < 0.5
+        return (num_persons >= 2, bool(state["relations"]), has_tag_owner, allow_sm,
+                bool(state["person_tags"]), bool(state["accounts"]), bool(state["articles_map"]),
+                state["accounts_with_followers"] > 0, bool(state["messages_map"]), bool(state["emoji_id_list"]))
+
+    @staticmethod
+    def _build_weight_vector(signature):
+        (two_persons, has_relations, has_tag_owner, allow_sm, has_tag_instance, has_accounts,
+         has_articles, has_followers, has_messages, has_emojis) = signature
+        pruned = set()
+        if not has_messages: pruned.add('sm')
+        if not has_emojis: pruned.update(['aem', 'qp', 'dce'])  # aem needs stored emoji for normal, qp, dce operate on stored
+        if not has_articles: pruned.update(['afm', 'da'])  # afm needs article to forward, da needs one to delete
+        if not two_persons:
+            pruned.update(['ar', 'mr', 'qv', 'qci', 'att', 'dft', 'qsp', 'qtvs', 'qtav', 'qcs', 'qba'])
+        if not has_relations: pruned.update(['mr', 'qv', 'att', 'qba'])
+        if not has_tag_owner: pruned.update(['dt', 'qtvs', 'qtav', 'att', 'dft'])
+        if not allow_sm: pruned.add('sm')  # sm type 1 needs tag
+        if not has_tag_instance: pruned.update(['dft', 'qtav', 'qtvs'])  # Empty tags still count: qtav/qtvs print 0
+        if not has_accounts: pruned.update(['doa', 'ca', 'da', 'foa', 'qbc', 'qra'])
+        if not has_followers: pruned.add('ca')
+
+        runnable_cmds = [cmd for cmd in sorted(COMMANDS) if cmd not in pruned and COMMAND_WEIGHTS.get(cmd, 0) > 0]
+        cum_weights = list(itertools.accumulate(COMMAND_WEIGHTS[cmd] for cmd in runnable_cmds))
+        return runnable_cmds, cum_weights
+
+    def _choose_weighted_command(self):
+        signature = self._pruning_signature()
+        if signature is None:
+            return 'ap'
+        vector = self._weight_vector_cache.get(signature)
+        if vector is None:
+            vector = self._weight_vector_cache[signature] = self._build_weight_vector(signature)
+        runnable_cmds, cum_weights = vector
+        if not runnable_cmds:
+            return 'ap'
+        return random.choices(runnable_cmds, cum_weights=cum_weights, k=1)[0]
+
     def generate_instruction(self):  # Logic for command selection, weights, guarantees largely unchanged
         selected_cmd_alias = None
         force_valid = False
@@ -2751,65 +3101,7 @@ class DataGenerator:
                     self.exceptions_attempted.add(target_key)
 
         if not action_taken:
-            # Adjusted weights for HW11 commands might be needed here based on testing goals
-            COMMAND_WEIGHTS = {
-                "ap": 10, "ar": 10, "mr": 8, "at": 7, "dt": 4, "att": 7, "dft": 4,
-                "qv": 5, "qci": 5, "qts": 2, "qtav": 5, "qtvs": 5, "qba": 5, "qcs": 3,
-                "coa": 7, "doa": 4, "ca": 8, "da": 5, "foa": 6, "qsp": 7, "qbc": 4, "qra": 4,
-                # HW11 weights - adjust these based on importance/complexity
-                "am": 10, "sm": 12, "qsv": 5, "qrm": 5, "arem": 9, "afm": 9, "aem": 9,
-                "sei": 6, "qp": 5, "dce": 3, "qm": 5,
-            }
-            temp_weights = defaultdict(float, COMMAND_WEIGHTS)
-            state = self.network_state
-            # Pruning logic (ensure it considers new state elements like messages_map, emoji_id_list)
-            if not state["persons"]:
-                runnable_cmds = ['ap']; cmd_weights = [1.0]
-            else:
-                # Pruning conditions for new commands:
-                if not state["messages_map"]:  # No messages exist
-                    for cmd in ['sm']: temp_weights[cmd] = 0
-                if not state["emoji_id_list"]:  # No emojis stored
-                    for cmd in ['aem', 'qp', 'dce']: temp_weights[
-                        cmd] = 0  # aem needs stored emoji for normal, qp, dce operate on stored
-                if not state["articles_map"]:  # No articles exist in network
-                    for cmd in ['afm']: temp_weights[cmd] = 0  # afm needs article to forward
-
-                # Existing pruning...
-                num_persons = len(state["persons"])
-                if num_persons < 2:
-                    for cmd_p in ['ar', 'mr', 'qv', 'qci', 'att', 'dft', 'qsp', 'qtvs', 'qtav', 'qcs', 'qba']:
-                        temp_weights[cmd_p] = 0
-                if not state["relations"]:
-                    for cmd_r in ['mr', 'qv', 'att', 'qba']: temp_weights[cmd_r] = 0
-                if not any(p_data.get("tags") for p_data in state["persons"].values()):  # No person owns any tag
-                    for cmd_t in ['dt', 'qtvs', 'qtav', 'att', 'dft', 'sm']:  # sm type 1 needs tag
-                        if cmd_t == 'sm' and random.random() < 0.5:
-                            pass  # Allow sm type 0
-                        else:
-                            temp_weights[cmd_t] = 0
-                if not state["person_tags"]:  # No tag has any members
-                    for cmd_tm in ['dft', 'qtav', 'qtvs']: temp_weights[cmd_tm] = 0
-                if not state["accounts"]:
-                    for cmd_acc in ['doa', 'ca', 'da', 'foa', 'qbc', 'qra']: temp_weights[cmd_acc] = 0
-                if not state["articles_map"]:
-                    if not any(acc_data.get("articles") for acc_data in state["accounts"].values()): temp_weights[
-                        'da'] = 0
-                if not any(acc_data.get("followers") for acc_data in state["accounts"].values()): temp_weights['ca'] = 0
-
-                runnable_cmds_final = []
-                cmd_weights_final = []
-                for cmd_alias_iter in COMMANDS:  # Iterate over all possible command aliases
-                    w = temp_weights.get(cmd_alias_iter, 0)
-                    if w > 0:
-                        runnable_cmds_final.append(cmd_alias_iter)
-                        cmd_weights_final.append(w)
-                if not runnable_cmds_final:
-                    selected_cmd_alias = 'ap'
-                elif sum(cmd_weights_final) > 0:
-                    selected_cmd_alias = random.choices(runnable_cmds_final, cmd_weights_final, k=1)[0]
-                else:
-                    selected_cmd_alias = random.choice(runnable_cmds_final) if runnable_cmds_final else 'ap'
+            selected_cmd_alias = self._choose_weighted_command()
 
         if selected_cmd_alias:
             return self._generate_arguments(selected_cmd_alias, force_valid=force_valid,
@@ -2817,7 +3109,22 @@ class DataGenerator:
         else:  # Should ideally not happen if 'ap' is ultimate fallback
             return self._generate_arguments('ap', force_valid=True)
 
+    def written_lines(self):
+        """Input lines capped at max_instr_limit, plus the expected output of the commands that still fit."""
+        input_lines = [line for chunk in self.generated_lines for line in str(chunk).split('\n')]
+        del input_lines[self.max_instr_limit:]
+        # Only commands that were fully written get an answer line (truncation happens between commands).
+        answers = [answer for line_mark, answer in self.answer_marks if line_mark <= len(input_lines)]
+        return input_lines, answers
+
+    def written_index(self, line_count):
+        """Sidecar index records (see INDEX_RECORD_FORMAT) for the commands within the first line_count lines."""
+        return [INDEX_RECORD_FORMAT.format(line=first_line, alias=alias, outcome=outcome)
+                for line_mark, first_line, alias, outcome in self.command_marks if line_mark <= line_count]
+
     def generate(self):  # Main loop unchanged structurally
+        if self.stress_profile:
+            return self.generate_stress()
         self._initialize_state()
         self.instructions_generated += self.generate_load_network()
         self._update_phase()
@@ -2831,7 +3138,7 @@ class DataGenerator:
         while self.instructions_generated < self.target_instructions and attempts < max_total_attempts:
             instr_str = self.generate_instruction()
             if instr_str:
-                self.generated_lines.append(instr_str)
+                self._emit(instr_str, self._last_outcome)
                 self.instructions_generated += 1
                 self._update_phase()
                 stuck_counter = 0
@@ -2850,7 +3157,7 @@ class DataGenerator:
             cmd_to_add = missing_success_cmds[0]
             instr_str = self._generate_arguments(cmd_to_add, force_valid=True)
             if instr_str:
-                self.generated_lines.append(instr_str)
+                self._emit(instr_str, self._last_outcome)
                 if cmd_to_add in self.commands_successfully_generated:
                     missing_success_cmds.pop(0)
                 else:
@@ -2871,7 +3178,7 @@ class DataGenerator:
                 instr_str = self._generate_arguments(cmd_alias, force_exception_name=exc_name)
                 if target_key in self.exceptions_attempted:
                     missing_exception_keys.pop(0)
-                    if instr_str: self.generated_lines.append(instr_str)
+                    if instr_str: self._emit(instr_str, self._last_outcome)
                 else:
                     missing_exception_keys.append(missing_exception_keys.pop(0))
             else:
@@ -2884,36 +3191,59 @@ class DataGenerator:
         return final_lines
 
 
+STRESS_PROFILES = sorted(DataGenerator._STRESS_PROFILE_METHODS)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate HW11 Test Data.")
     parser.add_argument("-m", "--mode", choices=['P', 'M'], default='P', help="Test mode")
     parser.add_argument("-n", "--num_instructions", type=int, default=1000,
                         help="Target logical instructions")  # Reduced default for quicker test
-    parser.add_argument("-o", "--output", type=str, default="generated_hw11_data.txt", help="Output file")
+    parser.add_argument("-o", "--output", type=str, default="generated_hw11_data.txt",
+                        help="Output file (gzip-compressed if the name ends in .gz)")
+    parser.add_argument("-a", "--answer-output", type=str, default=None,
+                        help="Also write the expected output (co-generated via oracle11) to this file")
+    parser.add_argument("-x", "--index-output", type=str, default=None,
+                        help="Also write the output-line -> input-command index (fixed-width records) to this file")
+    parser.add_argument("--ln-size", type=int, default=None,
+                        help="Persons in the initial ln block (capped by the mode's limit; default: random)")
+    parser.add_argument("--stress", choices=STRESS_PROFILES, default=None,
+                        help="Worst-case input for one hot path instead of the phased random mix: qsp_chain (qsp/qci on "
+                             "a long path), tag_full (qtvs/qtav near TAG_PERSONS_LIMIT), mr_churn (qcs/qba under mr "
+                             "churn), emoji_flood (dce over thousands of emojis), sm_fanout (sm to a huge tag)")
+    parser.add_argument("--ln-topology", choices=LN_TOPOLOGIES, default="random",
+                        help="Graph shape of the initial ln block: random (near-complete), chain, star, grid, cliques "
+                             "(ring of ~sqrt(N)-cliques), er (each pair with --ln-density), components (many small ones)")
+    parser.add_argument("--ln-density", type=float, default=LN_ER_DENSITY,
+                        help="Edge probability for --ln-topology er (default: %(default)s)")
     args = parser.parse_args()
 
     start_time = time.time()
-    generator = DataGenerator(mode=args.mode, num_logical_instructions=args.num_instructions)
+    generator = DataGenerator(mode=args.mode, num_logical_instructions=args.num_instructions,
+                              emit_answers=bool(args.answer_output), ln_size=args.ln_size,
+                              stress_profile=args.stress, ln_topology=args.ln_topology, ln_density=args.ln_density)
     generated_instruction_lines = generator.generate()
     end_time = time.time()
     print(f"\nGeneration took {end_time - start_time:.2f} seconds.")
 
     try:
-        with open(args.output, "w", encoding="utf-8") as f:
-            current_line_count = 0
-            for line_content in generated_instruction_lines:
-                lines_to_write = str(line_content).split('\n')
-                for single_line in lines_to_write:
-                    if current_line_count < generator.max_instr_limit:
-                        f.write(single_line + "\n")
-                        current_line_count += 1
-                    else:
-                        break
-                if current_line_count >= generator.max_instr_limit: break
-        print(f"Successfully wrote {current_line_count} lines to {args.output}")
+        input_lines, answer_lines = generator.written_lines()
+        with open_text(args.output, "w") as f:
+            f.writelines(line + "\n" for line in input_lines)
+        print(f"Successfully wrote {len(input_lines)} lines to {args.output}")
+        if args.index_output:
+            with open_text(args.index_output, "w", newline="\n") as f_idx:
+                f_idx.writelines(generator.written_index(len(input_lines)))
+        if args.answer_output:
+            with open_text(args.answer_output, "w") as f_ans:
+                f_ans.writelines(answer + "\n" for answer in answer_lines)
+            print(f"Successfully wrote {len(answer_lines)} expected output lines to {args.answer_output}")
+            if generator.intent_mismatches:
+                print(f"Note: {len(generator.intent_mismatches)} command(s) had an oracle outcome different from the "
+                      f"generator's intent, e.g. {generator.intent_mismatches[:3]}")
         # Final report print statements from original generator
-        missing_success_final = list(COMMANDS - generator.commands_successfully_generated)
-        missing_exceptions_final = list(generator.all_exceptions_to_attempt - generator.exceptions_attempted)
+        # Stress profiles do not aim for command/exception coverage
+        missing_success_final = [] if args.stress else list(COMMANDS - generator.commands_successfully_generated)
+        missing_exceptions_final = [] if args.stress else list(generator.all_exceptions_to_attempt - generator.exceptions_attempted)
         if missing_success_final: print(
             f"Warning: Could not guarantee successful generation for: {sorted(list(missing_success_final))}")
         if missing_exceptions_final: print(
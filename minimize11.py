@@ -0,0 +1,437 @@
+"""Delta-debugging minimizer for failing HW11 inputs.
+
+Usage: python minimize11.py errors/<jar>/set_N [more case dirs...] [--jar path] [--answer-source oracle|jar]
+       python minimize11.py --prefix errors/<jar>/set_N   (shortest failing prefix -> input_min_prefix.txt)
+
+Shrinks input.txt while the JAR keeps failing the same way (same first failing command alias, RE or
+timeout) and writes input_min.txt, expected_min.txt, output_min.txt and minimize.json next to it.
+Candidates are executed in parallel, the `ln N` block is reduced person by person, and commands are
+only ever removed together with the later commands that depend on them (persons, relations, tags,
+accounts, articles, messages, emojis).
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import subprocess
+import time
+
+import oracle11
+from checker11 import ERROR_FOLDER, JARS_DIR, JAR_TIMEOUT, STANDARD_JAR_PATH, case_artifact_path, promote_to_corpus
+
+MINIMIZE_TIME_BUDGET_MINUTES = 30
+LN_ALIAS = "ln"
+
+# Argument roles per alias: which entities a command needs and which one it creates.
+# P = person, R = relation, T = tag, TM = tag membership, A = official account, F = follower, AR = article,
+# M = message, E = emoji. Positions index the command's arguments.
+ENTITY_NEEDS = {
+    "ar": lambda a: [("P", a[0]), ("P", a[1])],
+    "mr": lambda a: [("P", a[0]), ("P", a[1]), ("R", a[0], a[1])],
+    "at": lambda a: [("P", a[0])],
+    "dt": lambda a: [("T", a[0], a[1])],
+    "att": lambda a: [("P", a[0]), ("R", a[0], a[1]), ("T", a[1], a[2])],
+    "dft": lambda a: [("P", a[0]), ("TM", a[1], a[2], a[0])],
+    "qv": lambda a: [("P", a[0]), ("P", a[1]), ("R", a[0], a[1])],
+    "qci": lambda a: [("P", a[0]), ("P", a[1])],
+    "qsp": lambda a: [("P", a[0]), ("P", a[1])],
+    "qtav": lambda a: [("T", a[0], a[1])],
+    "qtvs": lambda a: [("T", a[0], a[1])],
+    "qba": lambda a: [("P", a[0])],
+    "coa": lambda a: [("P", a[0])],
+    "doa": lambda a: [("P", a[0]), ("A", a[1])],
+    "ca": lambda a: [("P", a[0]), ("A", a[1]), ("F", a[0], a[1])],
+    "da": lambda a: [("P", a[0]), ("A", a[1]), ("AR", a[2])],
+    "foa": lambda a: [("P", a[0]), ("A", a[1])],
+    "qbc": lambda a: [("A", a[0])],
+    "qra": lambda a: [("P", a[0])],
+    "sm": lambda a: [("M", a[0])],
+    "qsv": lambda a: [("P", a[0])],
+    "qrm": lambda a: [("P", a[0])],
+    "qp": lambda a: [("E", a[0])],
+    "qm": lambda a: [("P", a[0])],
+}
+ENTITY_CREATES = {
+    "ap": lambda a: ("P", a[0]),
+    "ar": lambda a: ("R", a[0], a[1]),
+    "at": lambda a: ("T", a[0], a[1]),
+    "att": lambda a: ("TM", a[1], a[2], a[0]),
+    "coa": lambda a: ("A", a[1]),
+    "foa": lambda a: ("F", a[0], a[1]),
+    "ca": lambda a: ("AR", a[2]),
+    "am": lambda a: ("M", a[0]),
+    "arem": lambda a: ("M", a[0]),
+    "afm": lambda a: ("M", a[0]),
+    "aem": lambda a: ("M", a[0]),
+    "sei": lambda a: ("E", a[0]),
+}
+MESSAGE_ALIASES = {"am", "arem", "afm", "aem"}
+
+
+def _entity_key(entity):
+    # Relations are undirected.
+    if entity[0] == "R":
+        return ("R", min(entity[1], entity[2]), max(entity[1], entity[2]))
+    return entity
+
+
+def _message_needs(alias, args):
+    # id value type person1 person2|tag
+    needs = [("P", args[3])]
+    needs.append(("P", args[4]) if args[2] == "0" else ("T", args[3], args[4]))
+    if alias == "afm":
+        needs.append(("AR", args[1]))
+    elif alias == "aem":
+        needs.append(("E", args[1]))
+    return needs
+
+
+class Case:
+    """An input split into units: one per `ln` person and one per command, with dependency edges."""
+
+    def __init__(self, lines):
+        self.ln_people = [] # (id, name, age) in ln order
+        self.ln_values = {} # (row person index, column person index) -> value, row > column
+        self.commands = [] # (text, alias)
+        self.command_lines = [] # 1-based line of each command in the original input
+        self.units = [] # ("person", k) | ("cmd", k)
+        self.deps = [] # unit index -> unit indices it needs
+        self._parse(lines)
+        self._build_dependencies()
+
+    def _parse(self, lines):
+        lines = [line.rstrip('\n\r') for line in lines]
+        i = 0
+        while i < len(lines):
+            parts = lines[i].split()
+            if not parts:
+                i += 1
+                continue
+            alias = oracle11.FULL_NAME_TO_ALIAS.get(parts[0], parts[0])
+            if alias == LN_ALIAS and not self.commands and not self.ln_people and len(parts) > 1:
+                n = int(parts[1])
+                ids, names, ages = (lines[i + k].split() for k in (1, 2, 3))
+                self.ln_people = list(zip(ids, names, ages))[:n]
+                for row in range(1, n):
+                    for col, value in enumerate(lines[i + 3 + row].split()):
+                        if int(value) > 0:
+                            self.ln_values[(row, col)] = value
+                i += max(n, 1) + 3
+                continue
+            self.commands.append((lines[i].strip(), alias))
+            self.command_lines.append(i + 1)
+            i += 1
+        self.units = [("person", k) for k in range(len(self.ln_people))] + \
+                     [("cmd", k) for k in range(len(self.commands))]
+
+    def _build_dependencies(self):
+        creators = {} # entity -> [unit indices]; ln relations are created by both endpoint persons
+        for unit, (_, person_k) in enumerate(self.units[:len(self.ln_people)]):
+            creators[("P", self.ln_people[person_k][0])] = [unit]
+        for (row, col) in self.ln_values:
+            a, b = self.ln_people[row][0], self.ln_people[col][0]
+            creators[_entity_key(("R", a, b))] = [row, col]
+        self.deps = [[] for _ in self.units]
+        for unit in range(len(self.ln_people), len(self.units)):
+            text, alias = self.commands[self.units[unit][1]]
+            args = text.split()[1:]
+            try:
+                if alias in MESSAGE_ALIASES:
+                    needs = _message_needs(alias, args)
+                else:
+                    needs = ENTITY_NEEDS[alias](args) if alias in ENTITY_NEEDS else []
+                created = ENTITY_CREATES[alias](args) if alias in ENTITY_CREATES else None
+            except IndexError: # Malformed command: no dependency information, the predicate decides
+                needs, created = [], None
+            for entity in needs:
+                self.deps[unit].extend(creators.get(_entity_key(entity), ()))
+            if created is not None:
+                key = _entity_key(created)
+                if key[0] != "P" or key not in creators: # Persons are never deleted: a repeated ap is just an EPI
+                    creators[key] = [unit]
+
+    def close_removal(self, kept, removed):
+        """Kept units left after removing `removed` and everything that (transitively) depends on it."""
+        gone = set(removed)
+        result = []
+        for unit in kept:
+            if unit in gone or any(dep in gone for dep in self.deps[unit]):
+                gone.add(unit)
+            else:
+                result.append(unit)
+        return tuple(result)
+
+    def commands_after(self, kept, output_index):
+        """Kept command units whose output comes after output line `output_index` (0-based)."""
+        commands = [u for u in kept if self.units[u][0] == "cmd"]
+        has_ln = len(commands) < len(kept)
+        return commands[max(output_index + 1 - has_ln, 0):]
+
+    def render(self, kept):
+        """Input lines for the kept units, plus the alias behind each expected output line."""
+        people = [self.units[u][1] for u in kept if self.units[u][0] == "person"]
+        lines, aliases = [], []
+        if people:
+            lines.append(f"{LN_ALIAS} {len(people)}")
+            for field in range(3):
+                lines.append(" ".join(self.ln_people[k][field] for k in people))
+            for r in range(1, len(people)):
+                lines.append(" ".join(self.ln_values.get((people[r], people[c]), "0") for c in range(r)))
+            aliases.append(LN_ALIAS)
+        for unit in kept:
+            if self.units[unit][0] == "cmd":
+                text, alias = self.commands[self.units[unit][1]]
+                lines.append(text)
+                aliases.append(alias)
+        return lines, aliases
+
+
+def run_jar(jar_path, input_text):
+    # Returns (kind, stdout, elapsed seconds): kind is "ok", "re" or "timeout".
+    start_time = time.time()
+    try:
+        process = subprocess.run(['java', '-jar', jar_path], input=input_text, capture_output=True, text=True,
+                                 encoding='utf-8', errors='replace', timeout=JAR_TIMEOUT)
+    except subprocess.TimeoutExpired as e:
+        partial = e.stdout or ""
+        partial = partial.decode('utf-8', errors='replace') if isinstance(partial, bytes) else partial
+        return "timeout", partial, time.time() - start_time
+    elapsed = time.time() - start_time
+    stderr = process.stderr or ""
+    if process.returncode != 0 or (stderr.strip() and not re.match(r"Picked up _JAVA_OPTIONS:", stderr.strip(), re.IGNORECASE)):
+        return "re", process.stdout, elapsed
+    return "ok", process.stdout, elapsed
+
+
+def expected_output(lines, answer_source):
+    if answer_source == "oracle":
+        return oracle11.run_lines(lines)
+    kind, stdout, _ = run_jar(STANDARD_JAR_PATH, "".join(line + "\n" for line in lines))
+    if kind != "ok":
+        raise RuntimeError(f"standard.jar {kind} on a candidate")
+    return stdout.splitlines()
+
+
+def failure_signature(lines, aliases, jar_path, answer_source):
+    """(signature, expected, stdout, JAR seconds); signature is None when the JAR agrees with the answer
+    source, else ("re",), ("timeout",) or ("mismatch", alias of the first differing line)."""
+    input_text = "".join(line + "\n" for line in lines)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pair:
+        jar_future = pair.submit(run_jar, jar_path, input_text)
+        expected = expected_output(lines, answer_source)
+        kind, stdout, elapsed = jar_future.result()
+    if kind != "ok":
+        return (kind,), expected, stdout, elapsed
+    actual = [line.rstrip('\r') for line in stdout.splitlines()]
+    if actual == expected:
+        return None, expected, stdout, elapsed
+    first = next((i for i, (e, a) in enumerate(zip(expected, actual)) if e != a), min(len(expected), len(actual)))
+    return ("mismatch", aliases[first] if first < len(aliases) else "?"), expected, stdout, elapsed
+
+
+def read_case_input(case_dir):
+    # input.txt (.gz with --compress), or the data file artifacts.json points to
+    with oracle11.open_text(case_artifact_path(case_dir, "input.txt")) as f:
+        return [line.rstrip('\n\r') for line in f]
+
+
+def minimize_case(case_dir, jar_path, answer_source, workers, any_failure, time_budget_minutes):
+    original_lines = read_case_input(case_dir)
+    case = Case(original_lines)
+    start_time = time.time()
+    deadline = start_time + time_budget_minutes * 60
+    cache = {} # kept units -> signature
+    evaluations = 0
+
+    def evaluate(kept):
+        lines, aliases = case.render(kept)
+        return failure_signature(lines, aliases, jar_path, answer_source)[0]
+
+    kept = tuple(range(len(case.units)))
+    lines, aliases = case.render(kept)
+    target, expected, stdout, _ = failure_signature(lines, aliases, jar_path, answer_source)
+    evaluations += 1
+    if target is None:
+        print(f"{case_dir}: the JAR passes on this input, nothing to minimize.")
+        return None
+    print(f"{case_dir}: {len(original_lines)} lines, {len(case.units)} units, failure {target}")
+
+    def still_fails(signature):
+        return signature is not None and (any_failure or signature == target)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # For a mismatch nothing after the first failing command matters; try cutting there first.
+        if target[0] == "mismatch":
+            actual = [line.rstrip('\r') for line in stdout.splitlines()]
+            first = next((i for i, (e, a) in enumerate(zip(expected, actual)) if e != a), None)
+            if first is not None:
+                cut = case.close_removal(kept, case.commands_after(kept, first))
+                if cut != kept:
+                    evaluations += 1
+                    if still_fails(evaluate(cut)):
+                        kept = cut
+
+        granularity = 2
+        while len(kept) >= 2 and time.time() < deadline:
+            chunk = max(1, len(kept) // granularity)
+            candidates = []
+            for begin in range(0, len(kept), chunk):
+                candidate = case.close_removal(kept, kept[begin:begin + chunk])
+                if candidate != kept and candidate not in cache and candidate not in candidates:
+                    candidates.append(candidate)
+            futures = {executor.submit(evaluate, candidate): candidate for candidate in candidates}
+            for future in concurrent.futures.as_completed(futures):
+                cache[futures[future]] = future.result()
+            evaluations += len(candidates)
+            successes = [candidate for candidate in candidates if still_fails(cache[candidate])]
+            if successes:
+                kept = min(successes, key=len)
+                granularity = max(granularity - 1, 2)
+                print(f"  {len(kept)} units left ({time.time() - start_time:.0f}s, {evaluations} runs)")
+            elif chunk == 1:
+                break # 1-minimal: no single unit (with its dependents) can go
+            else:
+                granularity = min(granularity * 2, len(kept))
+
+    lines, aliases = case.render(kept)
+    signature, expected, stdout, _ = failure_signature(lines, aliases, jar_path, answer_source)
+    elapsed = time.time() - start_time
+    ratio = len(lines) / len(original_lines) if original_lines else 1.0
+    with open(os.path.join(case_dir, "input_min.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(line + "\n" for line in lines)
+    with open(os.path.join(case_dir, "expected_min.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(line + "\n" for line in expected)
+    with open(os.path.join(case_dir, "output_min.txt"), 'w', encoding='utf-8') as f:
+        f.write(stdout)
+    report = {
+        "jar": os.path.basename(jar_path), "answer_source": answer_source, "failure": list(target),
+        "final_failure": list(signature) if signature else None,
+        "original_lines": len(original_lines), "minimized_lines": len(lines), "reduction_ratio": round(ratio, 4),
+        "elapsed_seconds": round(elapsed, 2), "jar_runs": evaluations,
+        "timed_out": time.time() >= deadline,
+    }
+    if signature is not None:
+        report["corpus_hash"] = promote_minimized(case_dir, jar_path, signature)
+    with open(os.path.join(case_dir, "minimize.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"{case_dir}: {len(original_lines)} -> {len(lines)} lines ({ratio:.1%}) in {elapsed:.1f}s, "
+          f"{evaluations} JAR runs -> input_min.txt")
+    return report
+
+
+def promote_minimized(case_dir, jar_path, signature):
+    # Adds input_min.txt to the strong/ corpus under the checker's cluster signature when the case has one.
+    try:
+        with open(os.path.join(case_dir, "cluster.txt"), 'r', encoding='utf-8') as f:
+            cluster = f.read().strip()
+    except FileNotFoundError:
+        cluster = " ".join(signature)
+    try:
+        entry = promote_to_corpus(os.path.join(case_dir, "input_min.txt"), os.path.basename(jar_path), cluster, "minimized")
+    except OSError as e:
+        print(f"{case_dir}: could not add input_min.txt to the regression corpus: {e}")
+        return None
+    if entry is None:
+        print(f"{case_dir}: input_min.txt is already in the regression corpus")
+        return None
+    print(f"{case_dir}: input_min.txt added to the regression corpus as {entry['file']}")
+    return entry["hash"]
+
+
+def bisect_prefix(case_dir, jar_path, answer_source, workers, any_failure):
+    """Shortest command prefix (the ln block always kept) that still fails, via parallel k-ary search.
+
+    For timeouts this is the prefix at which the JAR's runtime crosses JAR_TIMEOUT, so the last
+    command of the prefix is the one that tips it over.
+    """
+    original_lines = read_case_input(case_dir)
+    case = Case(original_lines)
+    people = tuple(range(len(case.ln_people)))
+    command_units = tuple(range(len(case.ln_people), len(case.units)))
+    start_time = time.time()
+    results = {} # prefix length (commands) -> (signature, JAR seconds)
+
+    def evaluate(k):
+        lines, aliases = case.render(people + command_units[:k])
+        signature, _, _, elapsed = failure_signature(lines, aliases, jar_path, answer_source)
+        return k, signature, elapsed
+
+    _, target, elapsed = evaluate(len(command_units))
+    results[len(command_units)] = (target, elapsed)
+    if target is None:
+        print(f"{case_dir}: the JAR passes on this input, nothing to bisect.")
+        return None
+    print(f"{case_dir}: {len(command_units)} commands, failure {target}; bisecting prefixes with {workers} worker(s)")
+
+    def fails(k):
+        signature = results[k][0]
+        return signature is not None and (any_failure or signature == target)
+
+    low, high = 0, len(command_units) # Prefix `low` is assumed to pass, `high` fails
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while high - low > 1:
+            step = (high - low) / (min(workers, high - low - 1) + 1)
+            probes = sorted({low + max(1, round(step * i)) for i in range(1, min(workers, high - low - 1) + 1)} - {high})
+            for k, signature, elapsed in executor.map(evaluate, probes):
+                results[k] = (signature, elapsed)
+            failing = [k for k in probes if fails(k)]
+            if failing:
+                high = failing[0]
+            passing = [k for k in probes if k < high and not fails(k)]
+            if passing:
+                low = passing[-1]
+            print(f"  prefix in ({low}, {high}] commands ({time.time() - start_time:.0f}s, {len(results)} runs)")
+
+    lines, _ = case.render(people + command_units[:high])
+    with open(os.path.join(case_dir, "input_min_prefix.txt"), 'w', encoding='utf-8') as f:
+        f.writelines(line + "\n" for line in lines)
+    last_command = case.commands[high - 1][0] if high else None
+    last_line = case.command_lines[high - 1] if high else None
+    report = {
+        "jar": os.path.basename(jar_path), "answer_source": answer_source, "failure": list(target),
+        "prefix_commands": high, "total_commands": len(command_units), "prefix_lines": len(lines),
+        "last_command": last_command, "last_command_input_line": last_line,
+        "seconds_before": round(results[low][1], 3) if low in results else None,
+        "seconds_at": round(results[high][1], 3), "elapsed_seconds": round(time.time() - start_time, 2),
+        "jar_runs": len(results),
+    }
+    with open(os.path.join(case_dir, "prefix.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"{case_dir}: fails from prefix {high}/{len(command_units)} -> input_min_prefix.txt; "
+          f"last command (input line {last_line}): {last_command}")
+    if target == ("timeout",):
+        before = f"{results[low][1]:.2f}s" if low in results else "not measured"
+        print(f"  runtime crosses {JAR_TIMEOUT}s between prefix {low} ({before}) and {high}")
+    return report
+
+
+def jar_for_case(case_dir):
+    # errors/<jar name without .jar>/set_N
+    jar_name = os.path.basename(os.path.dirname(os.path.abspath(case_dir))) + ".jar"
+    return os.path.join(JARS_DIR, jar_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minimize failing HW11 inputs (delta debugging, parallel).")
+    parser.add_argument("cases", nargs="+", help=f"Error case directories, e.g. {os.path.join(ERROR_FOLDER, '<jar>', 'set_1')}")
+    parser.add_argument("--jar", default=None, help="JAR to test (default: jars/<jar>.jar from the case path)")
+    parser.add_argument("--answer-source", choices=("oracle", "jar"), default="oracle",
+                        help="Expected output per candidate: oracle11 in-process or standard.jar (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--any-failure", action="store_true",
+                        help="Accept any failure, not only the original one (RE/timeout/first failing alias)")
+    parser.add_argument("--minutes", type=float, default=MINIMIZE_TIME_BUDGET_MINUTES, help="Time budget per case")
+    parser.add_argument("--prefix", action="store_true",
+                        help="Only bisect for the shortest failing prefix (input_min_prefix.txt, prefix.json)")
+    args = parser.parse_args()
+
+    for case_dir in args.cases:
+        jar_path = args.jar or jar_for_case(case_dir)
+        if not os.path.exists(jar_path):
+            print(f"{case_dir}: JAR not found at {jar_path}, use --jar")
+            continue
+        if args.prefix:
+            bisect_prefix(case_dir, jar_path, args.answer_source, args.workers, args.any_failure)
+        else:
+            minimize_case(case_dir, jar_path, args.answer_source, args.workers, args.any_failure, args.minutes)
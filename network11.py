@@ -0,0 +1,360 @@
+"""Shared HW11 network model pieces used by generator11 (and anything simulating its state)."""
+import heapq
+import random
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+
+class IndexedSet:
+    """Set with O(1) add/discard and O(1) uniform random choice (swap-with-last removal)."""
+    __slots__ = ("_items", "_pos")
+
+    def __init__(self, iterable=()):
+        self._items = []
+        self._pos = {}
+        for item in iterable:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self._pos:
+            self._pos[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item):
+        pos = self._pos.pop(item, None)
+        if pos is None:
+            return
+        last = self._items.pop()
+        if pos < len(self._items):
+            self._items[pos] = last
+            self._pos[last] = pos
+
+    def choice(self):
+        return random.choice(self._items)  # IndexError when empty, like random.choice
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class BestAcquaintanceIndex:
+    """Best acquaintance of every person (highest value, then smallest id) and the qcs couple count.
+
+    Each person keeps a heap of (-value, acquaintance_id); entries whose value no longer matches
+    `acquaintances` are dropped lazily when they reach the top. The owner calls relation_changed
+    after an ar/mr touched a pair, and only those two endpoints are re-evaluated: a couple can only
+    appear or disappear where one of its members changed its best acquaintance.
+    """
+    __slots__ = ("persons", "_heaps", "_best", "couple_count", "linked")
+
+    def __init__(self, persons):
+        self.persons = persons  # id -> Person, shared with the owner
+        self._heaps = {}  # person_id -> heap of (-value, acquaintance_id), may hold stale entries
+        self._best = {}  # person_id -> best acquaintance id, only for persons with acquaintances
+        self.couple_count = 0  # Pairs that are each other's best acquaintance (qcs)
+        self.linked = IndexedSet()  # Persons with at least one acquaintance
+
+    def best(self, person_id):
+        return self._best.get(person_id)
+
+    def best_value(self, person_id):
+        best_id = self._best.get(person_id)
+        return None if best_id is None else self.persons[person_id].acquaintances[best_id]
+
+    def rebuild(self):
+        """Recomputes everything from `persons`; for bulk loads that bypass relation_changed."""
+        self._heaps.clear()
+        self._best.clear()
+        self.linked = IndexedSet()
+        for person_id, person in self.persons.items():
+            if person.acquaintances:
+                heap = [(-value, other_id) for other_id, value in person.acquaintances.items()]
+                heapq.heapify(heap)
+                self._heaps[person_id] = heap
+                self._best[person_id] = heap[0][1]
+                self.linked.add(person_id)
+        self.couple_count = sum(1 for person_id, best_id in self._best.items()
+                                if person_id < best_id and self._best.get(best_id) == person_id)
+
+    def relation_changed(self, id1, id2):
+        """Call after the id1-id2 relation was added, revalued or removed in both acquaintance maps."""
+        self.couple_count -= self._couples_at(id1, id2)
+        for person_id, other_id in ((id1, id2), (id2, id1)):
+            acquaintances = self.persons[person_id].acquaintances
+            heap = self._heaps.setdefault(person_id, [])
+            if other_id in acquaintances:
+                heapq.heappush(heap, (-acquaintances[other_id], other_id))
+            self._refresh(person_id, acquaintances, heap)
+        self.couple_count += self._couples_at(id1, id2)
+
+    def _refresh(self, person_id, acquaintances, heap):
+        if not acquaintances:
+            del self._heaps[person_id]
+            self._best.pop(person_id, None)
+            self.linked.discard(person_id)
+            return
+        if len(heap) > 2 * len(acquaintances) + 16:  # Mostly stale after many mr; start over
+            heap[:] = [(-value, other_id) for other_id, value in acquaintances.items()]
+            heapq.heapify(heap)
+        while acquaintances.get(heap[0][1]) != -heap[0][0]:
+            heapq.heappop(heap)
+        self._best[person_id] = heap[0][1]
+        self.linked.add(person_id)
+
+    def _couples_at(self, id1, id2):
+        couples = set()
+        for person_id in (id1, id2):
+            best_id = self._best.get(person_id)
+            if best_id is not None and self._best.get(best_id) == person_id:
+                couples.add((min(person_id, best_id), max(person_id, best_id)))
+        return len(couples)
+
+
+class ShortestPathIndex:
+    """Unweighted shortest paths over `Person.acquaintances`, with cached per-source BFS trees.
+
+    The owner calls edge_added/edge_removed after changing an acquaintance pair. A cached
+    tree is only dropped when the change can actually alter its distances, so edges inside
+    other components (or between two persons on the same BFS level) never cost a rebuild.
+    Trees a removal invalidates are parked rather than dropped: if the very next change
+    re-adds the same pair (mr to <= 0 followed by ar), the graph is what it was and they
+    come back as they were.
+
+    A source without a tree is answered by bidirectional BFS and only gets a full tree once
+    those searches have scanned as many adjacency entries as building the tree would (ski
+    rental). When a tree is dropped before its hits saved that much, its source's bar
+    doubles, so sources in a component that keeps changing stay on bidirectional BFS; a
+    tree that paid off is rebuilt on its source's next query.
+    """
+    __slots__ = ("persons", "max_trees", "_trees", "_stats", "_rent", "_backoff", "_parked")
+
+    MAX_BACKOFF = 64
+
+    def __init__(self, persons, max_trees=64):
+        self.persons = persons  # id -> Person, shared with the owner
+        self.max_trees = max_trees
+        self._trees = OrderedDict()  # source -> {person_id: distance}, least recently used first
+        self._stats = {}  # source -> [queries its tree answered, build cost, search cost per query it replaced]
+        self._rent = {}  # source -> [adjacency entries scanned, queries] answered without a tree since the last one
+        self._backoff = {}  # source -> multiplier on the tree cost its rent must reach (1 when absent)
+        self._parked = None  # (pair, {source: (tree, stats)}) invalidated by the last change, a removal
+
+    def clear(self):
+        self._trees.clear()
+        self._stats.clear()
+        self._rent.clear()
+        self._backoff.clear()
+        self._parked = None
+
+    def tree(self, source):
+        """Distances from `source` to every person in its component (source included)."""
+        dist = self._trees.get(source)
+        if dist is not None:
+            self._trees.move_to_end(source)
+            return dist
+        dist = {source: 0}
+        frontier = [source]
+        persons = self.persons
+        depth = 0
+        cost = 0
+        while frontier:
+            depth += 1
+            nxt = []
+            for u in frontier:
+                acquaintances = persons[u].acquaintances
+                cost += len(acquaintances)
+                for v in acquaintances:
+                    if v not in dist:
+                        dist[v] = depth
+                        nxt.append(v)
+            frontier = nxt
+        scanned, queries = self._rent.pop(source, (0, 0))
+        self._store(source, dist, [0, cost, scanned / queries if queries else None])
+        return dist
+
+    def _store(self, source, dist, stats):
+        self._trees[source] = dist
+        self._trees.move_to_end(source)
+        self._stats[source] = stats
+        if len(self._trees) > self.max_trees:
+            evicted, _ = self._trees.popitem(last=False)
+            del self._stats[evicted]
+
+    def distance(self, source, target):
+        """Number of edges on a shortest source-target path, or -1 when unreachable."""
+        if source == target:
+            return 0
+        for root, other in ((source, target), (target, source)):
+            dist = self._trees.get(root)
+            if dist is not None:
+                self._trees.move_to_end(root)
+                self._stats[root][0] += 1
+                return dist.get(other, -1)
+        rent = self._rent.get(source)
+        # A source without a tree has no stats either; N stands in for the cost of building one.
+        if (rent[0] if rent else 0) >= self._backoff.get(source, 1) * len(self.persons):
+            return self.tree(source).get(target, -1)
+        length, scanned = self._bidirectional(source, target)
+        if rent:
+            rent[0] += scanned
+            rent[1] += 1
+        else:
+            self._rent[source] = [scanned, 1]
+        return length
+
+    def _bidirectional(self, source, target):
+        """(distance or -1, adjacency entries scanned)."""
+        persons = self.persons
+        seen_a, seen_b = {source: 0}, {target: 0}
+        front_a, front_b = [source], [target]
+        scanned = 0
+        while front_a and front_b:
+            if len(front_a) > len(front_b):
+                seen_a, seen_b, front_a, front_b = seen_b, seen_a, front_b, front_a
+            # Expand one whole level; the best meeting point of that level is the answer.
+            best = -1
+            nxt = []
+            for u in front_a:
+                du = seen_a[u] + 1
+                acquaintances = persons[u].acquaintances
+                scanned += len(acquaintances)
+                for v in acquaintances:
+                    if v in seen_a:
+                        continue
+                    seen_a[v] = du
+                    nxt.append(v)
+                    dv = seen_b.get(v)
+                    if dv is not None and (best < 0 or du + dv < best):
+                        best = du + dv
+            if best >= 0:
+                return best, scanned
+            front_a = nxt
+        return -1, scanned
+
+    def _retire(self, source, stats):
+        hits, cost, saved_per_hit = stats
+        if saved_per_hit is None:
+            return  # Built by an explicit tree() call, not bought with rent
+        if hits * saved_per_hit >= cost:
+            self._backoff[source] = 0  # Paid off: rebuild on its next query
+        else:
+            self._backoff[source] = min(max(1, self._backoff.get(source, 1) * 2), self.MAX_BACKOFF)
+
+    def _retire_parked(self, parked):
+        if parked is not None:
+            for source, (_, stats) in parked[1].items():
+                self._retire(source, stats)
+
+    def edge_added(self, id1, id2):
+        parked = self._parked
+        self._parked = None
+        stale = []
+        for root, dist in self._trees.items():
+            d1, d2 = dist.get(id1), dist.get(id2)
+            if d1 is None and d2 is None:
+                continue  # Another component
+            if d1 is None or d2 is None or abs(d1 - d2) > 1:
+                stale.append(root)  # Components merged or a shortcut appeared
+        for root in stale:
+            del self._trees[root]
+            self._retire(root, self._stats.pop(root))
+        if parked is not None:
+            if parked[0] == (min(id1, id2), max(id1, id2)):
+                for source, (dist, stats) in parked[1].items():  # Graph is back to what these trees describe
+                    if source in self._trees:
+                        del self._trees[source]
+                        del self._stats[source]
+                    self._store(source, dist, stats)
+            else:
+                self._retire_parked(parked)
+
+    def edge_removed(self, id1, id2):
+        """Call after the pair has been removed from both acquaintance maps."""
+        self._retire_parked(self._parked)
+        self._parked = None
+        stale = []
+        for root, dist in self._trees.items():
+            d1, d2 = dist.get(id1), dist.get(id2)
+            if d1 is None or d1 == d2:
+                continue  # Another component, or a same-level edge no shortest path uses
+            upper, lower = (id1, id2) if d1 < d2 else (id2, id1)
+            parent_depth = dist[upper]
+            # Distances survive if the deeper endpoint still has another parent one level up.
+            if not any(dist.get(v) == parent_depth for v in self.persons[lower].acquaintances):
+                stale.append(root)
+        if stale:
+            self._parked = ((min(id1, id2), max(id1, id2)),
+                            {root: (self._trees.pop(root), self._stats.pop(root)) for root in stale})
+
+
+@dataclass(slots=True, eq=False)
+class Person:
+    name: str
+    age: int
+    acquaintances: dict = field(default_factory=dict)  # id -> value
+    tags: set = field(default_factory=set)  # Tag ids owned by this person
+    money: int = 0
+    socialValue: int = 0
+    messages_received_obj: deque = field(default_factory=deque)  # Newest first
+    articles_received_ids: deque = field(default_factory=deque)  # Newest first
+
+
+@dataclass(slots=True, eq=False)
+class OfficialAccount:
+    owner_id: int
+    name: str
+    followers: dict = field(default_factory=dict)  # person_id -> contribution count
+    articles: set = field(default_factory=set)
+
+
+@dataclass(slots=True, eq=False)
+class Message:
+    id: int
+    type: int  # 0 for person-to-person, 1 for group
+    socialValue: int
+    person1_id: int  # Sender
+    person2_id: int = None  # Receiver (if type 0)
+    tag_id: int = None  # Tag ID (if type 1)
+    msg_kind: str = "ordinary"  # "ordinary", "emoji", "red_envelope", "forward"
+    emojiId: int = None
+    lucky_money: int = None
+    articleId: int = None
+
+
+@dataclass(slots=True, eq=False)
+class TagStats:
+    """Members of one tag instance plus the running sums behind qtav/qtvs."""
+    members: dict = field(default_factory=dict)  # member_id -> age
+    age_sum: int = 0
+    age_square_sum: int = 0
+    value_sum: int = 0  # Sum of value(i, j) over ordered member pairs, as qtvs counts it
+
+    def add(self, member_id, age, acquaintances):
+        """`acquaintances` is the new member's own map; relations to current members join value_sum."""
+        members = self.members
+        self.value_sum += 2 * sum(value for other_id, value in acquaintances.items() if other_id in members)
+        members[member_id] = age
+        self.age_sum += age
+        self.age_square_sum += age * age
+
+    def remove(self, member_id, acquaintances):
+        members = self.members
+        age = members.pop(member_id)
+        self.age_sum -= age
+        self.age_square_sum -= age * age
+        self.value_sum -= 2 * sum(value for other_id, value in acquaintances.items() if other_id in members)
+
+    def age_var(self):
+        """Integer variance with Java's truncating division, from the sums alone."""
+        size = len(self.members)
+        if size == 0:
+            return 0
+        mean = abs(self.age_sum) // size
+        if self.age_sum < 0:
+            mean = -mean
+        return (self.age_square_sum - 2 * mean * self.age_sum + size * mean * mean) // size
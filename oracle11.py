@@ -0,0 +1,568 @@
+"""Pure-Python reference implementation of the HW11 network (answer source alternative to standard.jar).
+
+Usage: python oracle11.py input.txt [-o answer.txt]
+"""
+import argparse
+import gzip
+import os
+import sys
+from collections import defaultdict, deque
+
+from network11 import BestAcquaintanceIndex, Person, OfficialAccount, Message, ShortestPathIndex, TagStats
+
+TAG_PERSONS_LIMIT = 999  # Tag.addPerson only succeeds while the tag holds fewer persons than this
+ARTICLE_RECEIVED_LIMIT = 5
+MESSAGES_RECEIVED_LIMIT = 5
+
+# Lines printed by the official Runner when an add-message command references a missing person/tag.
+# The command never reaches Network.addMessage in that case.
+RUNNER_PERSON_MISSING = "The person with this number does not exist"
+RUNNER_TAG_MISSING = "The person with this number does not have the tag with this number"
+
+FULL_NAME_TO_ALIAS = {
+    "add_person": "ap", "add_relation": "ar", "modify_relation": "mr", "add_tag": "at", "del_tag": "dt",
+    "add_to_tag": "att", "del_from_tag": "dft", "query_value": "qv", "query_circle": "qci",
+    "query_triple_sum": "qts", "query_tag_age_var": "qtav", "query_best_acquaintance": "qba",
+    "load_network": "ln", "create_official_account": "coa", "delete_official_account": "doa",
+    "contribute_article": "ca", "delete_article": "da", "follow_official_account": "foa",
+    "query_shortest_path": "qsp", "query_best_contributor": "qbc", "query_received_articles": "qra",
+    "query_tag_value_sum": "qtvs", "query_couple_sum": "qcs", "add_message": "am", "send_message": "sm",
+    "query_social_value": "qsv", "query_received_messages": "qrm", "add_red_envelope_message": "arem",
+    "add_forward_message": "afm", "add_emoji_message": "aem", "store_emoji_id": "sei",
+    "query_popularity": "qp", "delete_cold_emoji": "dce", "query_money": "qm",
+}
+
+# Official exception class -> abbreviation used in its printed line
+EXCEPTION_ABBREVIATIONS = {
+    "EqualPersonIdException": "epi", "PersonIdNotFoundException": "pinf", "EqualRelationException": "er",
+    "RelationNotFoundException": "rnf", "EqualTagIdException": "eti", "TagIdNotFoundException": "tinf",
+    "AcquaintanceNotFoundException": "anf", "PathNotFoundException": "pnf",
+    "EqualOfficialAccountIdException": "eoai", "OfficialAccountIdNotFoundException": "oainf",
+    "DeleteOfficialAccountPermissionDeniedException": "doapd", "EqualArticleIdException": "eai",
+    "ArticleIdNotFoundException": "ainf", "ContributePermissionDeniedException": "cpd",
+    "DeleteArticlePermissionDeniedException": "dapd", "EqualMessageIdException": "emi",
+    "MessageIdNotFoundException": "minf", "EqualEmojiIdException": "eei", "EmojiIdNotFoundException": "einf",
+}
+_ABBREVIATION_SET = frozenset(EXCEPTION_ABBREVIATIONS.values())
+
+
+def exception_abbreviation(output_line):
+    """Returns the abbreviation if output_line is an exception line ("abbr-N, ..."), else None."""
+    head, sep, _ = output_line.partition("-")
+    if sep and head in _ABBREVIATION_SET and output_line[len(head) + 1:len(head) + 2].isdigit():
+        return head
+    return None
+
+
+class OracleException(Exception):
+    """Raised by a command handler; str(e) is the exact line the official exception prints."""
+
+
+class ExceptionCounters:
+    """Global/per-id counters shared by every instance of an official exception class."""
+
+    def __init__(self):
+        self.totals = defaultdict(int)  # abbr -> count
+        self.per_id = defaultdict(lambda: defaultdict(int))  # abbr -> id -> count
+
+    def single(self, abbr, _id):
+        self.totals[abbr] += 1
+        self.per_id[abbr][_id] += 1
+        return OracleException(f"{abbr}-{self.totals[abbr]}, {_id}-{self.per_id[abbr][_id]}")
+
+    def pair(self, abbr, id1, id2):
+        # Two-id exceptions print the smaller id first; an id appearing twice is only counted once.
+        self.totals[abbr] += 1
+        counts = self.per_id[abbr]
+        counts[id1] += 1
+        if id2 != id1:
+            counts[id2] += 1
+        lo, hi = min(id1, id2), max(id1, id2)
+        return OracleException(f"{abbr}-{self.totals[abbr]}, {lo}-{counts[lo]}, {hi}-{counts[hi]}")
+
+
+def _java_div(a, b):
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b > 0) else -q
+
+
+def _format_message(msg):
+    if msg.msg_kind == "emoji":
+        return f"Emoji: {msg.emojiId}"
+    if msg.msg_kind == "red_envelope":
+        return f"RedEnvelope: {msg.lucky_money}"
+    if msg.msg_kind == "forward":
+        return f"Forward: {msg.articleId}"
+    return f"Ordinary message: {msg.id}"
+
+
+class OracleNetwork:
+    def __init__(self):
+        self.exc = ExceptionCounters()
+        self.persons = {}  # id -> Person (tags holds owned tag ids)
+        self.paths = ShortestPathIndex(self.persons)  # qci/qsp distances, told about every edge change
+        self.tags = {}  # (owner_id, tag_id) -> TagStats; a fresh one per at, so stale messages keep their members
+        self.member_tags = defaultdict(set)  # member_id -> {(owner_id, tag_id)} the person currently belongs to
+        self.triple_sum = 0
+        self.person_bit = {}  # person_id -> bit position in the adjacency masks
+        self.adj_mask = {}  # person_id -> int bitmask of acquaintances; (m1 & m2).bit_count() = common neighbours
+        self.best = BestAcquaintanceIndex(self.persons)  # qba/qcs, updated for the two endpoints of every ar/mr
+        self.accounts = {}  # account_id -> OfficialAccount
+        self.articles = set()  # Every article ever contributed (deleteArticle only touches the account)
+        self.article_contributors = {}  # article_id -> contributor person id
+        self.messages = {}  # message_id -> Message
+        self.message_tags = {}  # message_id -> member dict of the tag instance the message was built with
+        self.emoji_heat = {}  # emoji_id -> heat (insertion ordered like emojiIdList)
+
+    # --- helpers ---
+    def _person(self, _id):
+        person = self.persons.get(_id)
+        if person is None:
+            raise self.exc.single("pinf", _id)
+        return person
+
+    def _account(self, account_id):
+        account = self.accounts.get(account_id)
+        if account is None:
+            raise self.exc.single("oainf", account_id)
+        return account
+
+    def _owned_tag(self, person_id, person, tag_id):
+        if tag_id not in person.tags:
+            raise self.exc.single("tinf", tag_id)
+        return self.tags[(person_id, tag_id)]
+
+    def _linked(self, id1, id2):
+        return id1 == id2 or id2 in self.persons[id1].acquaintances
+
+    def _remove_relation_tags(self, owner_id, member_id):
+        acquaintances = self.persons[member_id].acquaintances
+        for tag_id in self.persons[owner_id].tags:
+            tag = self.tags[(owner_id, tag_id)]
+            if member_id in tag.members:
+                tag.remove(member_id, acquaintances)
+                self.member_tags[member_id].discard((owner_id, tag_id))
+
+    def _shift_tag_values(self, id1, id2, delta):
+        # Every tag holding both endpoints sees the relation twice (i->j and j->i).
+        for tag_key in self.member_tags[id1] & self.member_tags[id2]:
+            self.tags[tag_key].value_sum += 2 * delta
+
+    # --- HW9 commands ---
+    def ap(self, _id, name, age):
+        if _id in self.persons:
+            raise self.exc.single("epi", _id)
+        self.persons[_id] = Person(name, int(age))
+        self.person_bit[_id] = len(self.person_bit)
+        self.adj_mask[_id] = 0
+        return "Ok"
+
+    def ar(self, id1, id2, value):
+        p1, p2 = self._person(id1), self._person(id2)
+        if self._linked(id1, id2):
+            raise self.exc.pair("er", id1, id2)
+        self.triple_sum += (self.adj_mask[id1] & self.adj_mask[id2]).bit_count()
+        self.adj_mask[id1] |= 1 << self.person_bit[id2]
+        self.adj_mask[id2] |= 1 << self.person_bit[id1]
+        p1.acquaintances[id2] = value
+        p2.acquaintances[id1] = value
+        self._shift_tag_values(id1, id2, value)
+        self.paths.edge_added(id1, id2)
+        self.best.relation_changed(id1, id2)
+        return "Ok"
+
+    def mr(self, id1, id2, m_val):
+        p1, p2 = self._person(id1), self._person(id2)
+        if id1 == id2:
+            raise self.exc.single("epi", id1)
+        if id2 not in p1.acquaintances:
+            raise self.exc.pair("rnf", id1, id2)
+        old_value = p1.acquaintances[id2]
+        new_value = old_value + m_val
+        if new_value > 0:
+            p1.acquaintances[id2] = new_value
+            p2.acquaintances[id1] = new_value
+            self._shift_tag_values(id1, id2, m_val)
+        else:
+            self._shift_tag_values(id1, id2, -old_value)
+            del p1.acquaintances[id2]
+            del p2.acquaintances[id1]
+            self.paths.edge_removed(id1, id2)
+            self.adj_mask[id1] &= ~(1 << self.person_bit[id2])
+            self.adj_mask[id2] &= ~(1 << self.person_bit[id1])
+            self.triple_sum -= (self.adj_mask[id1] & self.adj_mask[id2]).bit_count()
+            self._remove_relation_tags(id1, id2)
+            self._remove_relation_tags(id2, id1)
+        self.best.relation_changed(id1, id2)
+        return "Ok"
+
+    def at(self, person_id, tag_id):
+        person = self._person(person_id)
+        if tag_id in person.tags:
+            raise self.exc.single("eti", tag_id)
+        person.tags.add(tag_id)
+        self.tags[(person_id, tag_id)] = TagStats()
+        return "Ok"
+
+    def dt(self, person_id, tag_id):
+        person = self._person(person_id)
+        tag = self._owned_tag(person_id, person, tag_id)
+        person.tags.discard(tag_id)
+        for member_id in tag.members:
+            self.member_tags[member_id].discard((person_id, tag_id))
+        del self.tags[(person_id, tag_id)]
+        return "Ok"
+
+    def att(self, id1, id2, tag_id):
+        p1 = self._person(id1)
+        p2 = self._person(id2)
+        if id1 == id2:
+            raise self.exc.single("epi", id1)
+        if id1 not in p2.acquaintances:
+            raise self.exc.pair("rnf", id1, id2)
+        tag = self._owned_tag(id2, p2, tag_id)
+        if id1 in tag.members:
+            raise self.exc.single("epi", id1)
+        if len(tag.members) < TAG_PERSONS_LIMIT:
+            tag.add(id1, p1.age, p1.acquaintances)
+            self.member_tags[id1].add((id2, tag_id))
+        return "Ok"
+
+    def dft(self, id1, id2, tag_id):
+        p1 = self._person(id1)
+        p2 = self._person(id2)
+        tag = self._owned_tag(id2, p2, tag_id)
+        if id1 not in tag.members:
+            raise self.exc.single("pinf", id1)
+        tag.remove(id1, p1.acquaintances)
+        self.member_tags[id1].discard((id2, tag_id))
+        return "Ok"
+
+    def qv(self, id1, id2):
+        p1 = self._person(id1)
+        self._person(id2)
+        if not self._linked(id1, id2):
+            raise self.exc.pair("rnf", id1, id2)
+        return str(p1.acquaintances.get(id2, 0))
+
+    def qci(self, id1, id2):
+        self._person(id1)
+        self._person(id2)
+        return "true" if self.paths.distance(id1, id2) >= 0 else "false"
+
+    def qts(self):
+        return str(self.triple_sum)
+
+    def qtav(self, person_id, tag_id):
+        return str(self._owned_tag(person_id, self._person(person_id), tag_id).age_var())
+
+    def qba(self, _id):
+        person = self._person(_id)
+        if not person.acquaintances:
+            raise self.exc.single("anf", _id)
+        return str(self.best.best(_id))
+
+    # --- HW10 commands ---
+    def coa(self, person_id, account_id, name):
+        self._person(person_id)
+        if account_id in self.accounts:
+            raise self.exc.single("eoai", account_id)
+        self.accounts[account_id] = OfficialAccount(person_id, name, followers={person_id: 0})
+        return "Ok"
+
+    def doa(self, person_id, account_id):
+        self._person(person_id)
+        account = self._account(account_id)
+        if account.owner_id != person_id:
+            raise self.exc.pair("doapd", person_id, account_id)
+        del self.accounts[account_id]
+        return "Ok"
+
+    def ca(self, person_id, account_id, article_id):
+        self._person(person_id)
+        account = self._account(account_id)
+        if article_id in self.articles:
+            raise self.exc.single("eai", article_id)
+        if person_id not in account.followers:
+            raise self.exc.pair("cpd", person_id, article_id)
+        self.articles.add(article_id)
+        self.article_contributors[article_id] = person_id
+        account.articles.add(article_id)
+        account.followers[person_id] += 1
+        for follower_id in account.followers:
+            self.persons[follower_id].articles_received_ids.appendleft(article_id)
+        return "Ok"
+
+    def da(self, person_id, account_id, article_id):
+        self._person(person_id)
+        account = self._account(account_id)
+        if article_id not in account.articles:
+            raise self.exc.single("ainf", article_id)
+        if account.owner_id != person_id:
+            raise self.exc.pair("dapd", person_id, article_id)
+        account.articles.discard(article_id)
+        contributor = self.article_contributors.get(article_id)
+        if contributor in account.followers:
+            account.followers[contributor] -= 1
+        for follower_id in account.followers:
+            follower = self.persons[follower_id]
+            if article_id in follower.articles_received_ids:
+                follower.articles_received_ids = deque(a for a in follower.articles_received_ids if a != article_id)
+        return "Ok"
+
+    def foa(self, person_id, account_id):
+        self._person(person_id)
+        account = self._account(account_id)
+        if person_id in account.followers:
+            raise self.exc.single("epi", person_id)
+        account.followers[person_id] = 0
+        return "Ok"
+
+    def qsp(self, id1, id2):
+        self._person(id1)
+        self._person(id2)
+        length = self.paths.distance(id1, id2)
+        if length < 0:
+            raise self.exc.pair("pnf", id1, id2)
+        return str(length)
+
+    def qbc(self, account_id):
+        account = self._account(account_id)
+        best_id, best_count = None, None
+        for follower_id, count in account.followers.items():
+            if best_count is None or count > best_count or (count == best_count and follower_id < best_id):
+                best_id, best_count = follower_id, count
+        return str(best_id)
+
+    def qra(self, person_id):
+        received = self._person(person_id).articles_received_ids
+        if not received:
+            return "None"
+        return "".join(f"{a} " for a in list(received)[:ARTICLE_RECEIVED_LIMIT])
+
+    def qtvs(self, person_id, tag_id):
+        return str(self._owned_tag(person_id, self._person(person_id), tag_id).value_sum)
+
+    def qcs(self):
+        return str(self.best.couple_count)
+
+    # --- HW11 commands ---
+    def _add_message(self, msg, tag_members):
+        if msg.id in self.messages:
+            raise self.exc.single("emi", msg.id)
+        if msg.msg_kind == "emoji" and msg.emojiId not in self.emoji_heat:
+            raise self.exc.single("einf", msg.emojiId)
+        if msg.msg_kind == "forward":
+            if msg.articleId not in self.articles:
+                raise self.exc.single("ainf", msg.articleId)
+            if msg.articleId not in self.persons[msg.person1_id].articles_received_ids:
+                raise self.exc.single("ainf", msg.articleId)
+        if msg.type == 0 and msg.person1_id == msg.person2_id:
+            raise self.exc.single("epi", msg.person1_id)
+        self.messages[msg.id] = msg
+        if tag_members is not None:
+            self.message_tags[msg.id] = tag_members
+        return "Ok"
+
+    def _add_message_command(self, args, kind):
+        msg_id, value, msg_type, p1_id, target = (int(x) for x in args[:5])
+        # Runner-level masking: the message object cannot be built without its persons/tag.
+        if p1_id not in self.persons:
+            return RUNNER_PERSON_MISSING
+        tag_members = None
+        if msg_type == 0:
+            if target not in self.persons:
+                return RUNNER_PERSON_MISSING
+            p2_id, tag_id = target, None
+        else:
+            if target not in self.persons[p1_id].tags:
+                return RUNNER_TAG_MISSING
+            p2_id, tag_id = None, target
+            tag_members = self.tags[(p1_id, tag_id)].members
+        if kind == "emoji":
+            msg = Message(msg_id, msg_type, value, p1_id, p2_id, tag_id, kind, emojiId=value)
+        elif kind == "red_envelope":
+            msg = Message(msg_id, msg_type, value * 5, p1_id, p2_id, tag_id, kind, lucky_money=value)
+        elif kind == "forward":
+            msg = Message(msg_id, msg_type, abs(value) % 200, p1_id, p2_id, tag_id, kind, articleId=value)
+        else:
+            msg = Message(msg_id, msg_type, value, p1_id, p2_id, tag_id, kind)
+        return self._add_message(msg, tag_members)
+
+    def sm(self, msg_id):
+        msg = self.messages.get(msg_id)
+        if msg is None:
+            raise self.exc.single("minf", msg_id)
+        persons = self.persons
+        sender = persons[msg.person1_id]
+        if msg.type == 0:
+            if not self._linked(msg.person1_id, msg.person2_id):
+                raise self.exc.pair("rnf", msg.person1_id, msg.person2_id)
+            receivers = [persons[msg.person2_id]]
+        else:
+            if msg.tag_id not in sender.tags:
+                raise self.exc.single("tinf", msg.tag_id)
+            receivers = [persons[pid] for pid in self.message_tags.pop(msg_id)]
+        del self.messages[msg_id]
+
+        sender.socialValue += msg.socialValue
+        for receiver in receivers:
+            receiver.socialValue += msg.socialValue
+            receiver.messages_received_obj.appendleft(msg)
+        if msg.msg_kind == "red_envelope":
+            if msg.type == 0:
+                share = msg.lucky_money
+            else:
+                share = _java_div(msg.lucky_money, len(receivers)) if receivers else 0
+            sender.money -= share * len(receivers)
+            for receiver in receivers:
+                receiver.money += share
+        elif msg.msg_kind == "forward":
+            for receiver in receivers:
+                receiver.articles_received_ids.appendleft(msg.articleId)
+        elif msg.msg_kind == "emoji" and msg.emojiId in self.emoji_heat:
+            self.emoji_heat[msg.emojiId] += 1
+        return "Ok"
+
+    def qsv(self, _id):
+        return str(self._person(_id).socialValue)
+
+    def qrm(self, _id):
+        received = self._person(_id).messages_received_obj
+        if not received:
+            return "None"
+        return "; ".join(_format_message(m) for m in list(received)[:MESSAGES_RECEIVED_LIMIT])
+
+    def sei(self, emoji_id):
+        if emoji_id in self.emoji_heat:
+            raise self.exc.single("eei", emoji_id)
+        self.emoji_heat[emoji_id] = 0
+        return "Ok"
+
+    def qp(self, emoji_id):
+        if emoji_id not in self.emoji_heat:
+            raise self.exc.single("einf", emoji_id)
+        return str(self.emoji_heat[emoji_id])
+
+    def dce(self, limit):
+        self.emoji_heat = {e: h for e, h in self.emoji_heat.items() if h >= limit}
+        stale = [mid for mid, m in self.messages.items() if m.msg_kind == "emoji" and m.emojiId not in self.emoji_heat]
+        for mid in stale:
+            del self.messages[mid]
+            self.message_tags.pop(mid, None)
+        return str(len(self.emoji_heat))
+
+    def qm(self, _id):
+        return str(self._person(_id).money)
+
+    # --- dispatch ---
+    def execute(self, alias, args):
+        handler = _HANDLERS.get(alias)
+        if handler is None:
+            return None
+        try:
+            return handler(self, args)
+        except OracleException as e:
+            return str(e)
+
+
+def _ints(fn, count):
+    return lambda net, args: fn(net, *(int(a) for a in args[:count]))
+
+
+_HANDLERS = {
+    "ap": lambda net, a: net.ap(int(a[0]), a[1], a[2]),
+    "ar": _ints(OracleNetwork.ar, 3), "mr": _ints(OracleNetwork.mr, 3),
+    "at": _ints(OracleNetwork.at, 2), "dt": _ints(OracleNetwork.dt, 2),
+    "att": _ints(OracleNetwork.att, 3), "dft": _ints(OracleNetwork.dft, 3),
+    "qv": _ints(OracleNetwork.qv, 2), "qci": _ints(OracleNetwork.qci, 2),
+    "qts": _ints(OracleNetwork.qts, 0), "qtav": _ints(OracleNetwork.qtav, 2),
+    "qba": _ints(OracleNetwork.qba, 1),
+    "coa": lambda net, a: net.coa(int(a[0]), int(a[1]), a[2]),
+    "doa": _ints(OracleNetwork.doa, 2),
+    "ca": _ints(OracleNetwork.ca, 3),  # A trailing article name, if present, is ignored
+    "da": _ints(OracleNetwork.da, 3), "foa": _ints(OracleNetwork.foa, 2),
+    "qsp": _ints(OracleNetwork.qsp, 2), "qbc": _ints(OracleNetwork.qbc, 1),
+    "qra": _ints(OracleNetwork.qra, 1), "qtvs": _ints(OracleNetwork.qtvs, 2),
+    "qcs": _ints(OracleNetwork.qcs, 0),
+    "am": lambda net, a: net._add_message_command(a, "ordinary"),
+    "aem": lambda net, a: net._add_message_command(a, "emoji"),
+    "arem": lambda net, a: net._add_message_command(a, "red_envelope"),
+    "afm": lambda net, a: net._add_message_command(a, "forward"),
+    "sm": _ints(OracleNetwork.sm, 1), "qsv": _ints(OracleNetwork.qsv, 1),
+    "qrm": _ints(OracleNetwork.qrm, 1), "sei": _ints(OracleNetwork.sei, 1),
+    "qp": _ints(OracleNetwork.qp, 1), "dce": _ints(OracleNetwork.dce, 1),
+    "qm": _ints(OracleNetwork.qm, 1),
+}
+
+
+def _load_network(net, n, lines_iter):
+    ids = [int(x) for x in next(lines_iter).split()]
+    names = next(lines_iter).split()
+    ages = next(lines_iter).split()
+    for i in range(n):
+        net.ap(ids[i], names[i], ages[i])
+    for i in range(1, n):
+        values = next(lines_iter).split()
+        for j, value in enumerate(values):
+            if int(value) > 0:
+                net.ar(ids[i], ids[j], int(value))
+
+
+def run_lines(lines, net=None):
+    """Executes input lines (iterable of str) and returns the list of output lines."""
+    net = net or OracleNetwork()
+    output = []
+    lines_iter = iter(lines)
+    for line in lines_iter:
+        parts = line.split()
+        if not parts:
+            continue
+        alias = FULL_NAME_TO_ALIAS.get(parts[0], parts[0])
+        if alias == "ln":
+            _load_network(net, int(parts[1]), lines_iter)
+            output.append("Ok")
+            continue
+        result = net.execute(alias, parts[1:])
+        if result is not None:
+            output.append(result)
+    return output
+
+
+GZIP_LEVEL = 3 # Data/answer files shrink ~10x even at a fast level
+
+
+def open_text(path, mode='r', newline=None):
+    """open() for data, answer and output files; a name ending in ".gz" is read/written as gzip.
+
+    Writing replaces the file rather than truncating it, so hardlinks to the old content
+    (the checker's error-case captures) keep that content.
+    """
+    if 'w' in mode:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + 't', encoding='utf-8', errors='replace', newline=newline, compresslevel=GZIP_LEVEL)
+    return open(path, mode, encoding='utf-8', errors='replace', newline=newline)
+
+
+def run_file(input_path, output_path=None):
+    with open_text(input_path) as f_in:
+        output = run_lines(f_in)
+    text = "".join(line + "\n" for line in output)
+    if output_path:
+        with open_text(output_path, 'w') as f_out:
+            f_out.write(text)
+    else:
+        sys.stdout.write(text)
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HW11 reference oracle: executes an input file and prints the expected output.")
+    parser.add_argument("input", help="Input data file")
+    parser.add_argument("-o", "--output", default=None, help="Answer file (default: stdout)")
+    args = parser.parse_args()
+    run_file(args.input, args.output)
@@ -0,0 +1,237 @@
+"""Per-command latency profiler for HW11 JARs.
+
+Usage: python profile11.py [input files...] [--jar alice.jar ...] [--generate P 3000] [--json profile.json]
+
+Feeds the input to each JAR one command at a time, timestamps the output line that answers it and
+attributes the latency to the command's alias (the whole `ln` block counts as one command, and its
+time includes JVM start-up). Every command is also run through oracle11, which supplies the state
+size the command saw (persons + relations + tag members + messages + emojis). Per JAR the report
+shows a latency histogram per alias and flags aliases whose median latency grows with state size:
+the log-log slope is ~1 for an O(n) query and ~2 for an O(n^2) one, and those are the commands that
+time out in the stress tests. JARs run one after another so they do not disturb each other's timing.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import oracle11
+from checker11 import JARS_DIR, JAR_TIMEOUT, PUBLIC_MAX_INSTRUCTIONS, generate_data_task, get_jar_files, loglog_slope
+
+LN_ALIAS = "ln"
+PROFILE_COMMAND_TIMEOUT = JAR_TIMEOUT # A single command slower than this ends the profile of that input
+PROFILE_FIRST_REPLY_WAIT = 5 # No reply to `ln` within this many seconds: the JAR buffers stdout until exit
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 50, 200) # Histogram upper bounds; one more bucket above
+HISTOGRAM_BARS = " ▁▂▃▄▅▆▇█"
+STATE_GROUPS = 6 # Samples of one alias are split into this many groups by state size for the growth fit
+MIN_GROUP_SAMPLES = 5
+GROWTH_FLAG_SLOPE = 0.5 # Flag an alias when median latency grows at least like state^0.5 ...
+GROWTH_MIN_LATENCY_MS = 0.2 # ... and its largest-state group is above the pipe round-trip noise
+
+
+def split_commands(lines):
+    """(alias, input text) per command of an input; the `ln N` header and its N + 2 data lines form one unit."""
+    units = []
+    i = 0
+    while i < len(lines):
+        parts = lines[i].split()
+        if not parts:
+            i += 1
+            continue
+        alias = oracle11.FULL_NAME_TO_ALIAS.get(parts[0], parts[0])
+        size = max(int(parts[1]), 1) + 3 if alias == LN_ALIAS and len(parts) > 1 else 1
+        units.append((alias, "".join(line + "\n" for line in lines[i:i + size])))
+        i += size
+    return units
+
+
+def state_size(net):
+    relations = sum(len(person.acquaintances) for person in net.persons.values()) // 2
+    tag_members = sum(len(tag.members) for tag in net.tags.values())
+    return len(net.persons) + relations + tag_members + len(net.messages) + len(net.emoji_heat)
+
+
+def annotate(units):
+    # (alias, text, state size before the command, expected reply lines) per unit, from one oracle pass
+    net = oracle11.OracleNetwork()
+    annotated = []
+    for alias, text in units:
+        state = state_size(net)
+        replies = len(oracle11.run_lines(text.splitlines(), net))
+        annotated.append((alias, text, state, replies))
+    return annotated
+
+
+def _read_replies(stream, replies):
+    for raw in iter(stream.readline, b""):
+        replies.put((time.perf_counter(), raw))
+    replies.put((time.perf_counter(), None)) # EOF
+
+
+def profile_input(jar_path, annotated):
+    """Runs one input through the JAR in lock-step. Returns (samples, status, extra lines): samples are
+    (alias, state, latency seconds); status is "ok", "buffered", "re" or "timeout at <alias>"."""
+    process = subprocess.Popen(['java', '-jar', jar_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, bufsize=0)
+    replies = queue.Queue()
+    threading.Thread(target=_read_replies, args=(process.stdout, replies), daemon=True).start()
+    samples, status, extra = [], "ok", 0
+    try:
+        for k, (alias, text, state, expected) in enumerate(annotated):
+            while not replies.empty(): # More lines than commands so far: attribution would drift
+                if replies.get_nowait()[1] is None:
+                    return samples, "re", extra
+                extra += 1
+            sent = time.perf_counter()
+            process.stdin.write(text.encode('utf-8'))
+            for _ in range(expected):
+                wait = PROFILE_FIRST_REPLY_WAIT if k == 0 else PROFILE_COMMAND_TIMEOUT
+                try:
+                    arrived, raw = replies.get(timeout=wait)
+                except queue.Empty:
+                    return samples, "buffered" if k == 0 else f"timeout at {alias}", extra
+                if raw is None:
+                    return samples, "re", extra
+            if expected:
+                samples.append((alias, state, arrived - sent))
+        process.stdin.close()
+        process.wait(timeout=PROFILE_COMMAND_TIMEOUT)
+        if process.returncode != 0:
+            status = "re"
+    except (BrokenPipeError, subprocess.TimeoutExpired):
+        status = "re"
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return samples, status, extra
+
+
+def histogram(latencies_ms):
+    counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    for latency in latencies_ms:
+        counts[next((b for b, bound in enumerate(LATENCY_BUCKETS_MS) if latency <= bound), len(LATENCY_BUCKETS_MS))] += 1
+    return counts
+
+
+def sparkline(counts):
+    top = max(counts) or 1
+    return "".join(HISTOGRAM_BARS[math.ceil(c / top * (len(HISTOGRAM_BARS) - 1))] for c in counts)
+
+
+def growth(samples):
+    """Least-squares log-log slope of median latency against median state size over STATE_GROUPS groups,
+    plus the (state, median ms) points; None when the alias never saw enough distinct state sizes."""
+    samples = sorted((state, latency) for state, latency in samples if state > 0)
+    group_size = max(len(samples) // STATE_GROUPS, MIN_GROUP_SAMPLES)
+    points = []
+    for start in range(0, len(samples) - group_size + 1, group_size):
+        group = samples[start:start + group_size]
+        points.append((statistics.median(s for s, _ in group), statistics.median(l for _, l in group) * 1000))
+    if len(points) < 3 or points[-1][0] <= points[0][0] * 2:
+        return None
+    return loglog_slope(points), points
+
+
+def summarize(samples):
+    # alias -> report dict (count, total, percentiles, histogram, growth) for the pooled samples of one JAR
+    by_alias = defaultdict(list)
+    for alias, state, latency in samples:
+        by_alias[alias].append((state, latency))
+    report = {}
+    for alias, entries in by_alias.items():
+        latencies_ms = sorted(latency * 1000 for _, latency in entries)
+        fit = growth(entries) if alias != LN_ALIAS else None
+        report[alias] = {
+            "count": len(entries),
+            "total_s": sum(latencies_ms) / 1000,
+            "p50_ms": latencies_ms[len(latencies_ms) // 2],
+            "p90_ms": latencies_ms[int(len(latencies_ms) * 0.9)],
+            "max_ms": latencies_ms[-1],
+            "histogram": histogram(latencies_ms),
+            "slope": fit[0] if fit else None,
+            "points": fit[1] if fit else [],
+            "grows": bool(fit and fit[0] >= GROWTH_FLAG_SLOPE and fit[1][-1][1] >= GROWTH_MIN_LATENCY_MS),
+        }
+    return report
+
+
+def print_report(jar_name, report, statuses):
+    total = sum(entry["total_s"] for entry in report.values()) or 1
+    print(f"\n=== {jar_name}: {sum(e['count'] for e in report.values())} command(s), "
+          f"{total:.2f}s in commands | inputs: {', '.join(statuses)} ===")
+    bounds = "/".join(f"{b:g}" for b in LATENCY_BUCKETS_MS)
+    print(f"  {'cmd':<6} {'count':>6} {'total s':>8} {'share':>6} {'p50 ms':>8} {'p90 ms':>8} {'max ms':>8}  "
+          f"{'hist':<{len(LATENCY_BUCKETS_MS) + 1}}  growth")
+    for alias, entry in sorted(report.items(), key=lambda item: -item[1]["total_s"]):
+        slope = f"slope {entry['slope']:.2f}" if entry["slope"] is not None else ""
+        flag = "  <-- grows with state" if entry["grows"] else ""
+        print(f"  {alias:<6} {entry['count']:>6} {entry['total_s']:>8.3f} {entry['total_s'] / total:>6.1%} "
+              f"{entry['p50_ms']:>8.3f} {entry['p90_ms']:>8.3f} {entry['max_ms']:>8.2f}  "
+              f"{sparkline(entry['histogram'])}  {slope}{flag}")
+    print(f"  (hist buckets: <= {bounds} ms, then above)")
+    for alias, entry in report.items():
+        if entry["grows"]:
+            (first_state, first_ms), (last_state, last_ms) = entry["points"][0], entry["points"][-1]
+            order = "~O(n^2) or worse" if entry["slope"] >= 1.5 else "~O(n)" if entry["slope"] >= 0.8 else "sub-linear"
+            print(f"  ⚠️ {alias}: median {first_ms:.3f} ms at state {first_state:.0f} -> {last_ms:.3f} ms at state "
+                  f"{last_state:.0f} (slope {entry['slope']:.2f}, {order}); likely to time out under stress data")
+
+
+def load_inputs(paths, generate):
+    inputs = []
+    for path in paths:
+        with oracle11.open_text(path) as f:
+            inputs.append((path, [line.rstrip('\n\r') for line in f]))
+    if generate:
+        mode, count = generate
+        folder = tempfile.mkdtemp(prefix="profile11-")
+        _, data_path, status, message = generate_data_task(1, mode, int(count), folder)
+        if status != "Success":
+            raise SystemExit(message)
+        with oracle11.open_text(data_path) as f:
+            inputs.append((f"generated {mode} x{count}", [line.rstrip('\n\r') for line in f]))
+    return inputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-command latency profile of HW11 JARs (lock-step feeding).")
+    parser.add_argument("inputs", nargs="*", help="Input files (plain or .gz)")
+    parser.add_argument("--jar", action="append", default=None, help=f"JAR to profile (repeatable; default: all in {JARS_DIR})")
+    parser.add_argument("--generate", nargs=2, metavar=("MODE", "N"), default=None,
+                        help="Also profile one freshly generated input (generator11 mode P/M, N instructions)")
+    parser.add_argument("--json", default=None, help="Write the per-JAR reports to this JSON file")
+    args = parser.parse_args()
+    if not args.inputs and not args.generate:
+        args.generate = ("P", str(PUBLIC_MAX_INSTRUCTIONS))
+
+    inputs = [(label, annotate(split_commands(lines))) for label, lines in load_inputs(args.inputs, args.generate)]
+    jar_paths = [jar if os.path.sep in jar else os.path.join(JARS_DIR, jar) for jar in (args.jar or get_jar_files())]
+    reports = {}
+    for jar_path in jar_paths:
+        jar_name = os.path.basename(jar_path)
+        samples, statuses = [], []
+        for label, annotated in inputs:
+            start_time = time.time()
+            input_samples, status, extra = profile_input(jar_path, annotated)
+            samples += input_samples
+            statuses.append(f"{os.path.basename(label)} {status} ({time.time() - start_time:.1f}s"
+                            + (f", {extra} unexpected line(s)" if extra else "") + ")")
+        if not samples:
+            print(f"\n=== {jar_name}: no per-command timings | inputs: {', '.join(statuses)} ===")
+            if any("buffered" in status for status in statuses):
+                print("  stdout is only flushed at exit, so replies cannot be matched to commands.")
+            continue
+        reports[jar_name] = summarize(samples)
+        print_report(jar_name, reports[jar_name], statuses)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"\nReports written to {args.json}")
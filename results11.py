@@ -0,0 +1,153 @@
+"""Queries over the checker11 results database (RESULTS_DB_PATH, written by every checker11 run).
+
+Usage: python results11.py runs [-n 10]
+       python results11.py slowest <jar> [-n 10] [--run ID]
+       python results11.py regressions [--run ID] [--base ID]
+       python results11.py signatures [<jar>] [--run ID]
+
+Nothing is re-run: every answer comes from the verdicts, timings and failure signatures already
+recorded. Data sets are matched across runs by content hash, so "regressions" compares a JAR only
+on inputs both runs actually saw (local/strong runs) and falls back to pass rates otherwise.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+from checker11 import RESULTS_DB_PATH
+
+SLOWDOWN_FACTOR = 1.5 # Mean wall time on shared data sets this much higher counts as a regression
+
+
+def _when(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp)) if timestamp else "-"
+
+
+def _latest_runs(connection, count):
+    return [row[0] for row in connection.execute(
+        "SELECT id FROM runs WHERE executions > 0 ORDER BY id DESC LIMIT ?", (count,))]
+
+
+def show_runs(connection, count):
+    rows = connection.execute("""
+        SELECT r.id, r.started, r.finished, r.mode, r.answer_source, COUNT(e.run_id), SUM(e.verdict = 'Pass')
+        FROM runs r LEFT JOIN executions e ON e.run_id = r.id
+        GROUP BY r.id ORDER BY r.id DESC LIMIT ?""", (count,)).fetchall()
+    print(f"{'run':>5}  {'started':<16}  {'min':>6}  {'executions':>10}  {'pass':>6}  mode / answers")
+    for run_id, started, finished, mode, answer_source, executions, passed in rows:
+        minutes = f"{(finished - started) / 60:.1f}" if finished else "-"
+        print(f"{run_id:>5}  {_when(started):<16}  {minutes:>6}  {executions:>10}  {passed or 0:>6}  {mode} / {answer_source}")
+
+
+def show_slowest(connection, jar_name, count, run_id):
+    rows = connection.execute("""
+        SELECT e.run_id, e.set_index, e.wall, e.cpu, e.rss_kb, e.verdict, d.hash, d.lines, d.first_path
+        FROM executions e JOIN jars j ON j.id = e.jar_id LEFT JOIN data_sets d ON d.id = e.data_set_id
+        WHERE j.name = ? AND (? IS NULL OR e.run_id = ?)
+        ORDER BY e.wall DESC LIMIT ?""", (jar_name, run_id, run_id, count)).fetchall()
+    if not rows:
+        print(f"No executions recorded for {jar_name}" + (f" in run {run_id}" if run_id else ""))
+        return
+    print(f"{'run':>5}  {'set':>5}  {'wall s':>7}  {'cpu s':>7}  {'rss MiB':>7}  {'verdict':<17}  {'lines':>6}  data set")
+    for run, set_index, wall, cpu, rss_kb, verdict, data_hash, lines, path in rows:
+        cpu_text = f"{cpu:.2f}" if cpu is not None else "-"
+        rss_text = f"{rss_kb / 1024:.0f}" if rss_kb is not None else "-"
+        data_text = f"{data_hash[:12]} {path}" if data_hash else "-"
+        print(f"{run:>5}  {set_index:>5}  {wall:>7.3f}  {cpu_text:>7}  {rss_text:>7}  {verdict:<17}  {lines or 0:>6}  {data_text}")
+
+
+def _pass_rates(connection, run_id):
+    # jar name -> (passed, executions, mean wall, jar hash)
+    return {name: (passed, executions, mean_wall, jar_hash) for name, passed, executions, mean_wall, jar_hash in connection.execute("""
+        SELECT j.name, SUM(e.verdict = 'Pass'), COUNT(*), AVG(e.wall), MAX(j.hash)
+        FROM executions e JOIN jars j ON j.id = e.jar_id WHERE e.run_id = ? GROUP BY j.name""", (run_id,))}
+
+
+def show_regressions(connection, run_id, base_id):
+    if run_id is None or base_id is None:
+        latest = _latest_runs(connection, 2)
+        run_id = run_id or (latest[0] if latest else None)
+        base_id = base_id or next((r for r in latest if r != run_id), None)
+    if run_id is None or base_id is None:
+        print("Need two recorded runs to compare.")
+        return
+    print(f"Run {run_id} against run {base_id}:")
+    current, base = _pass_rates(connection, run_id), _pass_rates(connection, base_id)
+    shared = connection.execute("""
+        SELECT jr.name, SUM(b.verdict = 'Pass' AND r.verdict != 'Pass'), SUM(b.verdict != 'Pass' AND r.verdict = 'Pass'),
+               COUNT(*), AVG(b.wall), AVG(r.wall), GROUP_CONCAT(CASE WHEN b.verdict = 'Pass' AND r.verdict != 'Pass'
+                                                                      THEN r.set_index END)
+        FROM executions r JOIN jars jr ON jr.id = r.jar_id
+        JOIN executions b ON b.run_id = ? AND b.data_set_id = r.data_set_id
+        JOIN jars jb ON jb.id = b.jar_id AND jb.name = jr.name
+        WHERE r.run_id = ? GROUP BY jr.name""", (base_id, run_id)).fetchall()
+    shared = {row[0]: row[1:] for row in shared}
+    regressed = 0
+    for jar_name in sorted(current.keys() & base.keys()):
+        passed, executions, _, jar_hash = current[jar_name]
+        base_passed, base_executions, _, base_hash = base[jar_name]
+        changed = " (JAR changed)" if jar_hash != base_hash else ""
+        reasons = []
+        if jar_name in shared:
+            newly_failing, newly_passing, common, base_wall, wall, failing_sets = shared[jar_name]
+            if newly_failing:
+                reasons.append(f"{newly_failing}/{common} shared set(s) now fail (sets {failing_sets})")
+            if base_wall and wall > base_wall * SLOWDOWN_FACTOR:
+                reasons.append(f"mean time on shared sets {base_wall:.3f}s -> {wall:.3f}s")
+            detail = f"{common} shared set(s), {newly_passing} fixed"
+        else:
+            if passed / executions < base_passed / base_executions:
+                reasons.append(f"pass rate {base_passed}/{base_executions} -> {passed}/{executions} (no shared sets)")
+            detail = "no shared sets"
+        if reasons:
+            regressed += 1
+            print(f"  REGRESSED {jar_name}{changed}: " + "; ".join(reasons))
+        else:
+            print(f"  ok        {jar_name}{changed}: {passed}/{executions} pass, {detail}")
+    for jar_name in sorted(current.keys() - base.keys()):
+        print(f"  new       {jar_name}: {current[jar_name][0]}/{current[jar_name][1]} pass")
+    print(f"{regressed} JAR(s) regressed.")
+
+
+def show_signatures(connection, jar_name, run_id):
+    rows = connection.execute("""
+        SELECT j.name, s.text, COUNT(*), COUNT(DISTINCT e.data_set_id), MIN(e.run_id), MAX(e.run_id)
+        FROM executions e JOIN jars j ON j.id = e.jar_id JOIN signatures s ON s.id = e.signature_id
+        WHERE (? IS NULL OR j.name = ?) AND (? IS NULL OR e.run_id = ?)
+        GROUP BY j.name, s.id ORDER BY j.name, COUNT(*) DESC""", (jar_name, jar_name, run_id, run_id)).fetchall()
+    if not rows:
+        print("No failures recorded.")
+    for name, signature, count, data_sets, first_run, last_run in rows:
+        print(f"  {name:<20} {count:>6} x {signature} ({data_sets} data set(s), runs {first_run}-{last_run})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the checker11 results database without re-running anything.")
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="Results database (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="query", required=True)
+    p_runs = subparsers.add_parser("runs", help="Recent runs with execution and pass counts")
+    p_runs.add_argument("-n", type=int, default=10)
+    p_slowest = subparsers.add_parser("slowest", help="Slowest executions of one JAR")
+    p_slowest.add_argument("jar", help="JAR file name, e.g. alice.jar")
+    p_slowest.add_argument("-n", type=int, default=10)
+    p_slowest.add_argument("--run", type=int, default=None, help="Only this run (default: all runs)")
+    p_regressions = subparsers.add_parser("regressions", help="JARs that got worse since an earlier run")
+    p_regressions.add_argument("--run", type=int, default=None, help="Run to check (default: latest)")
+    p_regressions.add_argument("--base", type=int, default=None, help="Run to compare with (default: the one before)")
+    p_signatures = subparsers.add_parser("signatures", help="Failure signatures and how often they occurred")
+    p_signatures.add_argument("jar", nargs="?", default=None)
+    p_signatures.add_argument("--run", type=int, default=None)
+    args = parser.parse_args()
+
+    if not args.db or not os.path.exists(args.db):
+        parser.error(f"results database not found: {args.db}")
+    connection = sqlite3.connect(args.db)
+    if args.query == "runs":
+        show_runs(connection, args.n)
+    elif args.query == "slowest":
+        show_slowest(connection, args.jar, args.n, args.run)
+    elif args.query == "regressions":
+        show_regressions(connection, args.run, args.base)
+    else:
+        show_signatures(connection, args.jar, args.run)
+    connection.close()